@@ -4,11 +4,17 @@ import os
 import subprocess
 import datetime
 import sqlite3
-from src.utils.db_utils import initialize_database, get_existing_urls, store_analyzed_data, store_iocs, store_kql_queries
-from src.core.fetcher import fetch_and_scrape_articles_sequential, fetch_single_article, fetch_and_scrape_articles_parallel
+from src.utils.db_utils import initialize_database, store_analyzed_data, RawArticleBatchWriter, store_iocs, store_kql_queries, get_feed_health, get_llm_output_stats
+from src.core.fetcher import (
+    fetch_and_scrape_articles_sequential, fetch_single_article, fetch_and_scrape_articles_parallel, FeedCacheUpdate,
+)
+from src.core.async_fetcher import fetch_and_scrape_articles_async
 from src.core.filtering import filter_articles_sequential, filter_articles_parallel
 from src.core.analysis import analyze_articles_sequential, analyze_articles_parallel
+from src.core.pipeline import run_streaming_pipeline
+from src.core.near_duplicates import NearDuplicateDetector
 from src.core.report import generate_weekly_report, get_last_full_week_dates
+from src.utils import ollama_client
 from src.utils.logging_utils import log_step, log_warn, log_info, log_success, log_error, BColors
 from src.config import (
     ENABLE_KQL_GENERATION,
@@ -21,8 +27,13 @@ from src.config import (
     KQL_MIN_EVENT_SEVERITY,
     KQL_RESULT_LIMIT,
     ENABLE_PHASED_MULTITHREADING,
+    FETCH_ENGINE,
+    STREAMING_PIPELINE,
+    RSS_FEEDS,
+    OLLAMA_WARM_UP,
 )
 from src.core.kql_generator_llm import LLMKQLGenerator
+from src.core.structured_output import log_structured_output_summary
 from src.core.kql_generator import save_queries_to_file, IOCExtractor as RegexIOCExtractor
 from src import config as app_config
 
@@ -34,6 +45,38 @@ def get_rolling_date_range(days_back=14):
     return start_date, end_date
 
 
+def get_fetch_engine():
+    """Resolve the fetch engine: --engine <sequential|threads|async> overrides config."""
+    engine = FETCH_ENGINE if ENABLE_PHASED_MULTITHREADING else 'sequential'
+    if "--engine" in sys.argv:
+        idx = sys.argv.index("--engine")
+        if idx + 1 < len(sys.argv):
+            engine = sys.argv[idx + 1].lower()
+    if engine not in ('sequential', 'threads', 'async'):
+        log_warn(f"Unknown fetch engine '{engine}'. Using 'threads'.")
+        engine = 'threads'
+    return engine
+
+
+def fetch_new_articles(start_date, end_date, on_article=None, feed_cache_update=None):
+    """Run the fetch phase with the configured engine.
+
+    Stored articles are skipped by canonical URL with an indexed lookup per
+    feed (existing_urls=None), so the articles table is never loaded whole.
+    Feed cache rows are collected in feed_cache_update; the caller saves them
+    once the fetched articles are stored.
+    """
+    engine = get_fetch_engine()
+    if engine == 'async':
+        return fetch_and_scrape_articles_async(None, start_date, end_date, on_article=on_article,
+                                               feed_cache_update=feed_cache_update)
+    if engine == 'threads':
+        return fetch_and_scrape_articles_parallel(None, start_date, end_date, on_article=on_article,
+                                                  feed_cache_update=feed_cache_update)
+    return fetch_and_scrape_articles_sequential(None, start_date, end_date, on_article=on_article,
+                                                feed_cache_update=feed_cache_update)
+
+
 # Legacy options removed: LLMKQLGenerator no longer accepts external options; using defaults
 
 def generate_kql_for_articles(article_ids):
@@ -310,6 +353,142 @@ def process_single_article(url, use_kql=False):
     log_success("Single article processing complete!")
 
 
+def auto_extract_iocs(article_ids):
+    """Phase 4.5: extract IOCs from stored articles (AUTO_EXTRACT_IOCS, EXTRACT_IOCS_FOR_RISK_LEVELS)"""
+    from src.config import AUTO_EXTRACT_IOCS, EXTRACT_IOCS_FOR_RISK_LEVELS
+    if not (AUTO_EXTRACT_IOCS and article_ids):
+        return
+    log_step("4.5", "Auto-Extracting IOCs from Analyzed Articles")
+    llm_generator = LLMKQLGenerator()
+    total_iocs_extracted = 0
+    articles_with_iocs = 0
+    
+    if ENABLE_PHASED_MULTITHREADING:
+        # Parallel IOC extraction per article
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        from src.config import THREADS_IOC
+        def extract_for(item):
+            aid, adata = item
+            risk = adata.get('threat_risk', 'LOW')
+            if EXTRACT_IOCS_FOR_RISK_LEVELS and risk not in EXTRACT_IOCS_FOR_RISK_LEVELS:
+                return 0
+            try:
+                iocs = llm_generator.extract_iocs_with_llm(adata)
+                ioc_count = sum(len(iocs.get(key, [])) for key in iocs)
+                if ioc_count > 0:
+                    stored = store_iocs(aid, iocs)
+                    log_info(f"Extracted {stored} IOCs from '{adata['title']}'")
+                    return stored
+            except Exception as e:
+                log_warn(f"Failed to extract IOCs from article {aid}: {e}")
+            return 0
+        with ThreadPoolExecutor(max_workers=THREADS_IOC) as ex:
+            for fut in as_completed([ex.submit(extract_for, it) for it in article_ids]):
+                try:
+                    stored = fut.result()
+                    if stored > 0:
+                        total_iocs_extracted += stored
+                        articles_with_iocs += 1
+                except Exception:
+                    pass
+    else:
+        for article_id, article_data in article_ids:
+            # Check if we should extract IOCs for this risk level
+            article_risk = article_data.get('threat_risk', 'LOW')
+            if EXTRACT_IOCS_FOR_RISK_LEVELS and article_risk not in EXTRACT_IOCS_FOR_RISK_LEVELS:
+                continue
+            try:
+                iocs = llm_generator.extract_iocs_with_llm(article_data)
+                ioc_count = sum(len(iocs.get(key, [])) for key in iocs)
+                if ioc_count > 0:
+                    stored_iocs = store_iocs(article_id, iocs)
+                    total_iocs_extracted += stored_iocs
+                    articles_with_iocs += 1
+                    log_info(f"Extracted {stored_iocs} IOCs from '{article_data['title']}'")
+            except Exception as e:
+                log_warn(f"Failed to extract IOCs from article {article_id}: {e}")
+                continue
+    
+    if total_iocs_extracted > 0:
+        log_success(f"Auto-extracted {total_iocs_extracted} IOCs from {articles_with_iocs} articles")
+    else:
+        log_info("No IOCs found in analyzed articles")
+
+
+def run_ingest_cycle(fetch_start_date, fetch_end_date, article_limit=None, streaming=False):
+    """Phases 1-4.5: fetch new articles, filter, analyze, store and extract IOCs.
+
+    Returns the (article_id, article) list of the newly analyzed articles.
+    Shared by the one-shot pipeline and daemon mode. The feed cache is
+    updated at the end, only for feeds whose entries were all stored or
+    judged not relevant, so anything this cycle missed is fetched again.
+    """
+    near_duplicates = NearDuplicateDetector()
+    feed_cache_update = FeedCacheUpdate()
+    not_relevant = []
+    
+    if streaming:
+        # Phases 1-3 overlap: articles flow to filtering and analysis as soon as they are scraped
+        log_step("1-3", "Fetching, Filtering and Analyzing New Articles (streaming)")
+        relevant_articles, analyzed_data_list = run_streaming_pipeline(
+            lambda on_article: fetch_new_articles(fetch_start_date, fetch_end_date, on_article=on_article,
+                                                  feed_cache_update=feed_cache_update),
+            article_limit=article_limit,
+            near_duplicates=near_duplicates,
+            not_relevant=not_relevant,
+        )
+    else:
+        # Phase 1: Fetch and Scrape all new articles using 2-week rolling window
+        log_step(1, "Fetching and Scraping New Articles")
+        new_articles = fetch_new_articles(fetch_start_date, fetch_end_date, feed_cache_update=feed_cache_update)
+        
+        # Apply article limit if specified
+        if article_limit and len(new_articles) > article_limit:
+            new_articles = new_articles[:article_limit]
+            log_info(f"Limited to {article_limit} articles as requested.")
+        
+        # Copies of the same story are filtered and analyzed once (see src/core/near_duplicates.py)
+        new_articles = near_duplicates.remove_duplicates(new_articles)
+        
+        # Phase 2: Filter for relevant articles
+        log_step(2, "Filtering New Articles for Cybersecurity Relevance")
+        relevant_articles = (filter_articles_parallel(new_articles)
+                             if ENABLE_PHASED_MULTITHREADING else
+                             filter_articles_sequential(new_articles))
+        relevant_urls = {a['url'] for a in relevant_articles}
+        not_relevant = [a for a in new_articles if a.get('content') and a['url'] not in relevant_urls]
+        
+        analyzed_data_list = []
+        if relevant_articles:
+            # Phase 3: Analyze relevant articles
+            log_step(3, "Analyzing New Relevant Articles with LLM")
+            analyzed_data_list = (analyze_articles_parallel(relevant_articles)
+                                  if ENABLE_PHASED_MULTITHREADING else
+                                  analyze_articles_sequential(relevant_articles))
+    
+    article_ids = []
+    if relevant_articles:
+        if analyzed_data_list:
+            # Phase 4: Store results in the database
+            log_step(4, "Storing New Data in Database")
+            article_ids = store_analyzed_data(analyzed_data_list)
+            
+            # Phase 4.5: Auto-extract IOCs if enabled
+            auto_extract_iocs(article_ids)
+        else:
+            log_warn("No new articles were successfully analyzed.")
+    else:
+        log_info("No new relevant articles to process.")
+    
+    # Copies held back by near-duplicate detection reuse their story's analysis
+    if near_duplicates.duplicates:
+        # Copies of stories judged not relevant are settled for the feed cache like their story
+        not_relevant += near_duplicates.store_duplicates(article_ids, not_relevant)
+    
+    feed_cache_update.save(settled_urls=[a['url'] for a in not_relevant])
+    return article_ids
+
+
 def main_pipeline():
     # Parse the -n parameter if provided
     article_limit = None
@@ -336,107 +515,20 @@ def main_pipeline():
     if "--auto-kql" in sys.argv or "--kql" in sys.argv:
         auto_kql = True
 
+    streaming = STREAMING_PIPELINE or "--stream" in sys.argv
+
     initialize_database()
-    existing_urls = get_existing_urls()
     
     # Use rolling window for FETCHING (not for reports)
     fetch_start_date, fetch_end_date = get_rolling_date_range(days_back=days_back)
     
     log_info(f"Fetch window: {fetch_start_date} to {fetch_end_date} ({days_back} days)")
     
-    # Phase 1: Fetch and Scrape all new articles using 2-week rolling window
-    log_step(1, "Fetching and Scraping New Articles")
-    if ENABLE_PHASED_MULTITHREADING:
-        new_articles = fetch_and_scrape_articles_parallel(existing_urls, fetch_start_date, fetch_end_date)
-    else:
-        new_articles = fetch_and_scrape_articles_sequential(existing_urls, fetch_start_date, fetch_end_date)
+    if OLLAMA_WARM_UP:
+        # The model loads while feeds are fetched, so the first relevance check does not wait for it
+        ollama_client.warm_up()
     
-    # Apply article limit if specified
-    if article_limit and len(new_articles) > article_limit:
-        new_articles = new_articles[:article_limit]
-        log_info(f"Limited to {article_limit} articles as requested.")
-    
-    # Phase 2: Filter for relevant articles
-    log_step(2, "Filtering New Articles for Cybersecurity Relevance")
-    relevant_articles = (filter_articles_parallel(new_articles)
-                         if ENABLE_PHASED_MULTITHREADING else
-                         filter_articles_sequential(new_articles))
-    
-    article_ids = []
-    if relevant_articles:
-        # Phase 3: Analyze relevant articles
-        log_step(3, "Analyzing New Relevant Articles with LLM")
-        analyzed_data_list = (analyze_articles_parallel(relevant_articles)
-                              if ENABLE_PHASED_MULTITHREADING else
-                              analyze_articles_sequential(relevant_articles))
-
-        if analyzed_data_list:
-            # Phase 4: Store results in the database
-            log_step(4, "Storing New Data in Database")
-            article_ids = store_analyzed_data(analyzed_data_list)
-            
-            # Phase 4.5: Auto-extract IOCs if enabled
-            from src.config import AUTO_EXTRACT_IOCS, EXTRACT_IOCS_FOR_RISK_LEVELS
-            if AUTO_EXTRACT_IOCS and article_ids:
-                log_step("4.5", "Auto-Extracting IOCs from Analyzed Articles")
-                llm_generator = LLMKQLGenerator()
-                total_iocs_extracted = 0
-                articles_with_iocs = 0
-                
-                if ENABLE_PHASED_MULTITHREADING:
-                    # Parallel IOC extraction per article
-                    from concurrent.futures import ThreadPoolExecutor, as_completed
-                    from src.config import THREADS_IOC
-                    def extract_for(item):
-                        aid, adata = item
-                        risk = adata.get('threat_risk', 'LOW')
-                        if EXTRACT_IOCS_FOR_RISK_LEVELS and risk not in EXTRACT_IOCS_FOR_RISK_LEVELS:
-                            return 0
-                        try:
-                            iocs = llm_generator.extract_iocs_with_llm(adata)
-                            ioc_count = sum(len(iocs.get(key, [])) for key in iocs)
-                            if ioc_count > 0:
-                                stored = store_iocs(aid, iocs)
-                                log_info(f"Extracted {stored} IOCs from '{adata['title']}'")
-                                return stored
-                        except Exception as e:
-                            log_warn(f"Failed to extract IOCs from article {aid}: {e}")
-                        return 0
-                    with ThreadPoolExecutor(max_workers=THREADS_IOC) as ex:
-                        for fut in as_completed([ex.submit(extract_for, it) for it in article_ids]):
-                            try:
-                                stored = fut.result()
-                                if stored > 0:
-                                    total_iocs_extracted += stored
-                                    articles_with_iocs += 1
-                            except Exception:
-                                pass
-                else:
-                    for article_id, article_data in article_ids:
-                        # Check if we should extract IOCs for this risk level
-                        article_risk = article_data.get('threat_risk', 'LOW')
-                        if EXTRACT_IOCS_FOR_RISK_LEVELS and article_risk not in EXTRACT_IOCS_FOR_RISK_LEVELS:
-                            continue
-                        try:
-                            iocs = llm_generator.extract_iocs_with_llm(article_data)
-                            ioc_count = sum(len(iocs.get(key, [])) for key in iocs)
-                            if ioc_count > 0:
-                                stored_iocs = store_iocs(article_id, iocs)
-                                total_iocs_extracted += stored_iocs
-                                articles_with_iocs += 1
-                                log_info(f"Extracted {stored_iocs} IOCs from '{article_data['title']}'")
-                        except Exception as e:
-                            log_warn(f"Failed to extract IOCs from article {article_id}: {e}")
-                            continue
-                
-                if total_iocs_extracted > 0:
-                    log_success(f"Auto-extracted {total_iocs_extracted} IOCs from {articles_with_iocs} articles")
-                else:
-                    log_info("No IOCs found in analyzed articles")
-        else:
-            log_warn("No new articles were successfully analyzed.")
-    else:
-        log_info("No new relevant articles to process.")
+    article_ids = run_ingest_cycle(fetch_start_date, fetch_end_date, article_limit=article_limit, streaming=streaming)
     
     # Phase 5: Generate the weekly report
     log_step(5, "Generating Weekly Report")
@@ -452,6 +544,133 @@ def main_pipeline():
             log_info("KQL generation skipped by user.")
     elif not article_ids:
         log_info("No new articles to generate KQL queries for.")
+    log_structured_output_summary()
+    ollama_client.log_ollama_summary()
+
+
+# ============================================================================
+# DAEMON MODE
+# ============================================================================
+
+def get_daemon_fetch_days():
+    """Fetch window for the next daemon cycle, widened to cover downtime since the last completed cycle"""
+    from src.utils.db_utils import get_daemon_state
+    from src.config import DAEMON_FETCH_DAYS_BACK
+    last_completed = get_daemon_state('last_cycle_completed')
+    if not last_completed:
+        # First daemon run on this database: catch up on the full window
+        return FETCH_DAYS_BACK
+    try:
+        last_date = datetime.datetime.fromisoformat(last_completed).date()
+    except ValueError:
+        return FETCH_DAYS_BACK
+    days_since = (datetime.date.today() - last_date).days
+    return min(FETCH_DAYS_BACK, max(DAEMON_FETCH_DAYS_BACK, days_since + 1))
+
+
+def send_risk_alerts(article_ids):
+    """Raise an alert for each new article at one of DAEMON_ALERT_RISK_LEVELS; returns the alert count"""
+    import json
+    import requests
+    from src.config import DAEMON_ALERT_RISK_LEVELS, DAEMON_ALERTS_FILE, DAEMON_ALERT_WEBHOOK_URL
+
+    alerts = []
+    for article_id, article_data in article_ids:
+        risk = article_data.get('threat_risk', 'LOW')
+        if risk not in DAEMON_ALERT_RISK_LEVELS:
+            continue
+        alerts.append({
+            'article_id': article_id,
+            'title': article_data.get('title'),
+            'url': article_data.get('url'),
+            'threat_risk': risk,
+            'category': article_data.get('category'),
+            'summary': article_data.get('summary'),
+            'published_date': str(article_data.get('published_date') or ''),
+            'alerted_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        })
+
+    for alert in alerts:
+        print(f"{BColors.FAIL}{BColors.BOLD}[ALERT] {alert['threat_risk']}{BColors.ENDC} "
+              f"#{alert['article_id']} {alert['title']}\n        {alert['url']}")
+        if DAEMON_ALERT_WEBHOOK_URL:
+            try:
+                requests.post(DAEMON_ALERT_WEBHOOK_URL, json=alert, timeout=10).raise_for_status()
+            except requests.RequestException as e:
+                log_warn(f"Alert webhook failed for article {alert['article_id']}: {e}")
+
+    if alerts and DAEMON_ALERTS_FILE:
+        try:
+            with open(DAEMON_ALERTS_FILE, 'a', encoding='utf-8') as f:
+                for alert in alerts:
+                    f.write(json.dumps(alert) + "\n")
+        except OSError as e:
+            log_warn(f"Could not write alerts to {DAEMON_ALERTS_FILE}: {e}")
+    return len(alerts)
+
+
+def cmd_daemon(interval_minutes=None, max_cycles=None):
+    """Poll feeds continuously and push only new entries through filtering, analysis and IOC extraction.
+
+    Every cycle reuses the incremental state kept in the database (feed
+    conditional-GET cache, feed health, stored URLs and fingerprints), so it
+    only fetches and analyzes entries it has not seen. SIGINT/SIGTERM finish
+    the running cycle and exit; a second Ctrl+C aborts immediately. A restart
+    resumes from the database, widening the first fetch window to cover the
+    downtime.
+    """
+    import signal
+    import threading
+    import time
+    from src.utils.db_utils import set_daemon_state
+    from src.config import DAEMON_POLL_INTERVAL_MINUTES, DAEMON_WARM_OLLAMA
+
+    interval_minutes = interval_minutes or DAEMON_POLL_INTERVAL_MINUTES
+    stop_requested = threading.Event()
+
+    def request_stop(signum, frame):
+        log_warn("Shutdown requested: finishing the current cycle (Ctrl+C again to abort)")
+        stop_requested.set()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    initialize_database()
+    log_success(f"Daemon started: polling every {interval_minutes} minutes (Ctrl+C to stop)")
+
+    cycle = 0
+    while not stop_requested.is_set():
+        cycle += 1
+        cycle_started = time.monotonic()
+        days_back = get_daemon_fetch_days()
+        fetch_start_date, fetch_end_date = get_rolling_date_range(days_back=days_back)
+        log_info(f"Daemon cycle {cycle}: fetch window {fetch_start_date} to {fetch_end_date} ({days_back} days)")
+
+        if DAEMON_WARM_OLLAMA:
+            # Loads while feeds are fetched; stays resident until shortly after the next cycle starts
+            ollama_client.warm_up(f"{interval_minutes + 5}m")
+
+        try:
+            article_ids = run_ingest_cycle(fetch_start_date, fetch_end_date, streaming=STREAMING_PIPELINE)
+            alert_count = send_risk_alerts(article_ids)
+            set_daemon_state('last_cycle_completed', datetime.datetime.now().isoformat(timespec='seconds'))
+            log_success(f"Daemon cycle {cycle} done in {time.monotonic() - cycle_started:.0f}s: "
+                        f"{len(article_ids)} new articles analyzed, {alert_count} alerts")
+            log_structured_output_summary()
+            ollama_client.log_ollama_summary()
+        except Exception as e:
+            # Keep polling; the next cycle retries whatever this one missed
+            log_error(f"Daemon cycle {cycle} failed: {e}")
+
+        if max_cycles and cycle >= max_cycles:
+            break
+        wait_seconds = max(0, interval_minutes * 60 - (time.monotonic() - cycle_started))
+        if not stop_requested.is_set():
+            log_info(f"Next poll in {wait_seconds / 60:.1f} minutes")
+        stop_requested.wait(wait_seconds)
+
+    log_success("Daemon stopped")
 
 
 # ============================================================================
@@ -639,6 +858,82 @@ def cmd_show_stats():
     conn.close()
 
 
+def cmd_feed_health(limit=10):
+    """Report the slowest, least productive and failing RSS sources"""
+    print(f"\n{BColors.BOLD}{'='*70}{BColors.ENDC}")
+    print(f"{BColors.BOLD}📡 RSS Feed Health{BColors.ENDC}")
+    print(f"{BColors.BOLD}{'='*70}{BColors.ENDC}\n")
+
+    health = get_feed_health()
+    rows = [health[url] for url in RSS_FEEDS if url in health]
+    never_polled = [url for url in RSS_FEEDS if url not in health]
+    if not rows:
+        log_warn("No feed health data yet. Run the pipeline or --fetch first.")
+        return
+
+    now = datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+    total_polls = sum(r['total_polls'] or 0 for r in rows)
+    total_failures = sum(r['total_failures'] or 0 for r in rows)
+    skipped = [r for r in rows if r['next_poll_at'] and r['next_poll_at'] > now]
+    print(f"{BColors.BOLD}Tracked Feeds:{BColors.ENDC} {len(rows)} of {len(RSS_FEEDS)} "
+          f"({total_polls} polls, {total_failures} failed) | currently skipped: {len(skipped)}")
+
+    def source(row):
+        return row['feed_url'].split('://', 1)[-1][:45]
+
+    print(f"\n{BColors.BOLD}Slowest Sources (average poll latency):{BColors.ENDC}")
+    for row in sorted(rows, key=lambda r: r['avg_latency_ms'] or 0, reverse=True)[:limit]:
+        print(f"  {BColors.OKCYAN}{source(row):45}{BColors.ENDC} {row['avg_latency_ms'] or 0:7.0f} ms "
+              f"(last {row['last_latency_ms'] or 0} ms, status {row['last_status'] or '-'})")
+
+    print(f"\n{BColors.BOLD}Least Productive Sources (average new entries per hour):{BColors.ENDC}")
+    productive = [r for r in rows if r['avg_new_per_hour'] is not None]
+    for row in sorted(productive, key=lambda r: r['avg_new_per_hour'])[:limit]:
+        due = f" | next poll {row['next_poll_at']} UTC" if row['next_poll_at'] and row['next_poll_at'] > now else ""
+        print(f"  {BColors.OKCYAN}{source(row):45}{BColors.ENDC} {row['avg_new_per_hour']:6.3f} new/hour "
+              f"({row['avg_new_entries'] or 0:.2f} new/poll, {row['last_entry_count'] or 0} entries in feed){due}")
+
+    failing = [r for r in rows if r['consecutive_failures']]
+    print(f"\n{BColors.BOLD}Failing Sources:{BColors.ENDC}")
+    if failing:
+        for row in sorted(failing, key=lambda r: r['consecutive_failures'], reverse=True)[:limit]:
+            skip = f" | skipped until {row['next_poll_at']} UTC" if row['next_poll_at'] else ""
+            print(f"  {BColors.FAIL}{source(row):45}{BColors.ENDC} {row['consecutive_failures']} failures in a row "
+                  f"(status {row['last_status'] or '-'}){skip}")
+            if row['last_error']:
+                print(f"      {row['last_error'][:90]}")
+    else:
+        print("  None")
+
+    if never_polled:
+        print(f"\n{BColors.BOLD}Never Polled:{BColors.ENDC} {len(never_polled)} feeds")
+
+    print(f"\n{BColors.BOLD}{'='*70}{BColors.ENDC}\n")
+
+
+def cmd_llm_stats():
+    """Report JSON answer quality per model and purpose (valid, invalid, schema mismatches, retries)"""
+    print(f"\n{BColors.BOLD}{'='*70}{BColors.ENDC}")
+    print(f"{BColors.BOLD}🧩 LLM JSON Output Quality{BColors.ENDC}")
+    print(f"{BColors.BOLD}{'='*70}{BColors.ENDC}\n")
+
+    rows = get_llm_output_stats()
+    if not rows:
+        log_warn("No LLM output stats yet. Run the pipeline or --analyze first.")
+        return
+
+    print(f"{BColors.BOLD}{'Model':28}{'Purpose':22}{'Mode':8}{'Calls':>7}{'Valid':>8}{'Failed':>8}{'Retries':>9}{BColors.ENDC}")
+    for row in rows:
+        failed = row['invalid_json'] + row['schema_mismatch']
+        calls = row['calls'] or 1
+        color = BColors.FAIL if failed / calls > 0.1 else BColors.OKGREEN
+        print(f"{row['model'][:27]:28}{row['purpose'][:21]:22}{row['mode']:8}{row['calls']:>7}"
+              f"{color}{row['valid'] / calls:>7.0%}{BColors.ENDC}{failed / calls:>8.0%}{row['retries'] / calls:>9.0%}")
+    print(f"\n  Failed = invalid JSON + schema mismatches; retries are repeated calls after a failed answer.")
+    print(f"  Modes: schema = JSON schema format, json = plain JSON format, free = prompt only (LLM_STRUCTURED_OUTPUT off)")
+    print(f"\n{BColors.BOLD}{'='*70}{BColors.ENDC}\n")
+
+
 def cmd_show_article(article_id):
     """Display detailed information about a specific article"""
     conn = sqlite3.connect(DATABASE_PATH)
@@ -923,6 +1218,8 @@ def cmd_analyze_unanalyzed():
         return
     
     log_success(f"Found {len(unanalyzed_rows)} unanalyzed articles")
+    if OLLAMA_WARM_UP:
+        ollama_client.warm_up()
     
     # Convert DB rows to article format
     articles_to_analyze = []
@@ -1140,6 +1437,8 @@ def cmd_analyze_unanalyzed():
         else:
             log_info("KQL generation skipped by user.")
     
+    log_structured_output_summary()
+    ollama_client.log_ollama_summary()
     log_success("Analysis complete!")
 
 
@@ -1161,56 +1460,26 @@ def cmd_fetch_only():
             log_warn(f"Invalid -t parameter. Using default {FETCH_DAYS_BACK} days.")
     
     initialize_database()
-    existing_urls = get_existing_urls()
     
     # Use rolling window for fetching
     fetch_start_date, fetch_end_date = get_rolling_date_range(days_back=days_back)
     
     log_info(f"Fetch window: {fetch_start_date} to {fetch_end_date} ({days_back} days)")
     
-    # Fetch articles
-    log_step(1, "Fetching Articles from RSS Feeds")
-    if ENABLE_PHASED_MULTITHREADING:
-        new_articles = fetch_and_scrape_articles_parallel(existing_urls, fetch_start_date, fetch_end_date)
-    else:
-        new_articles = fetch_and_scrape_articles_sequential(existing_urls, fetch_start_date, fetch_end_date)
+    # Fetch articles, storing them in batches as they are scraped (memory stays bounded on long backfills)
+    log_step(1, "Fetching Articles from RSS Feeds and Storing Them in Batches")
+    writer = RawArticleBatchWriter()
+    feed_cache_update = FeedCacheUpdate()
+    try:
+        fetch_new_articles(fetch_start_date, fetch_end_date, on_article=writer.add, feed_cache_update=feed_cache_update)
+    finally:
+        stored_count = writer.close()
+    feed_cache_update.save()
     
-    if not new_articles:
+    if not writer.received:
         log_warn("No new articles found.")
         return
     
-    # Store raw articles in database without analysis
-    log_step(2, "Storing Raw Articles in Database")
-    
-    stored_count = 0
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    for article in new_articles:
-        try:
-            cursor.execute("""
-                INSERT INTO articles (title, url, published_date, content, summary, threat_risk, category, recommendations)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                article['title'],
-                article['url'],
-                article.get('published_date', datetime.date.today().isoformat()),
-                article.get('content', ''),
-                'Not analyzed - fetched only',
-                'UNANALYZED',
-                'Pending Analysis',
-                '[]'
-            ))
-            stored_count += 1
-        except sqlite3.IntegrityError:
-            # Skip duplicates
-            continue
-        except Exception as e:
-            log_error(f"Failed to store article '{article['title']}': {e}")
-    
-    conn.commit()
-    conn.close()
-    
     log_success(f"Successfully stored {stored_count} raw articles in database")
     log_info(f"Use 'python main.py --analyze' to analyze these articles later")
     
@@ -1220,6 +1489,40 @@ def cmd_fetch_only():
     print(f"{BColors.BOLD}{'='*70}{BColors.ENDC}\n")
 
 
+def cmd_train_relevance_model():
+    """Train the local relevance classifier from judged articles in the database"""
+    from src.core.relevance_model import train_from_examples
+    from src.utils.db_utils import get_relevance_training_examples
+    from src.config import RELEVANCE_MODEL_PATH, RELEVANCE_MODEL_THRESHOLD
+
+    print(f"\n{BColors.BOLD}{'='*70}{BColors.ENDC}")
+    print(f"{BColors.BOLD}🧠 Train Relevance Classifier{BColors.ENDC}")
+    print(f"{BColors.BOLD}{'='*70}{BColors.ENDC}\n")
+
+    initialize_database()
+    examples = get_relevance_training_examples()
+    relevant = sum(1 for _, _, label in examples if label)
+    log_info(f"Loaded {len(examples)} judged articles ({relevant} relevant, {len(examples) - relevant} not relevant)")
+    try:
+        model, metrics = train_from_examples(examples)
+    except ValueError as e:
+        log_error(f"Cannot train relevance model: {e}")
+        return
+
+    print(f"\n{BColors.BOLD}Hold-out evaluation ({metrics['examples']} articles, accuracy "
+          f"{metrics['accuracy']:.1%} at p=0.5):{BColors.ENDC}")
+    print(f"  {'Threshold':>10} {'Decided w/o LLM':>16} {'Agreement':>10} {'Relevant dropped':>17}")
+    for row in metrics['thresholds']:
+        marker = f" {BColors.OKGREEN}← configured{BColors.ENDC}" if row['threshold'] == RELEVANCE_MODEL_THRESHOLD else ""
+        agreement = f"{row['agreement']:.1%}" if row['agreement'] is not None else "-"
+        print(f"  {row['threshold']:>10.2f} {row['coverage']:>16.1%} {agreement:>10} {row['missed']:>17}{marker}")
+
+    model.save()
+    log_success(f"Relevance model saved to {RELEVANCE_MODEL_PATH} ({len(model.weights)} weights)")
+    print(f"{BColors.OKCYAN}Tip:{BColors.ENDC} Set RELEVANCE_MODEL_THRESHOLD in src/config.py to trade LLM calls against agreement")
+    print(f"{BColors.BOLD}{'='*70}{BColors.ENDC}\n")
+
+
 def cmd_show_help():
     """Display help message with all available commands"""
     help_text = f"""
@@ -1244,6 +1547,15 @@ def cmd_show_help():
       Analyze-only mode: Process articles in database that are not yet analyzed
       (useful after using --fetch, or when analysis previously failed)
 
+  {BColors.OKGREEN}python main.py --train-relevance{BColors.ENDC}
+      Train the local relevance classifier from judged articles (NOT_RELEVANT vs
+      analyzed) and save it; confident articles then skip the LLM filter call
+
+  {BColors.OKGREEN}python main.py --daemon [--interval <minutes>] [--cycles <N>]{BColors.ENDC}
+      Daemon mode: poll feeds every DAEMON_POLL_INTERVAL_MINUTES (or --interval)
+      and analyze only new entries; HIGH risk articles are alerted immediately
+      (console, alerts.jsonl, optional webhook). Ctrl+C finishes the cycle and exits
+
   {BColors.OKGREEN}python main.py -n <N>{BColors.ENDC}
       Limit processing to N articles (useful for testing)
       Example: python main.py -n 20
@@ -1254,6 +1566,23 @@ def cmd_show_help():
       Example: python main.py -t 30 (fetch from last 30 days)
       Works with: main pipeline, --fetch
 
+  {BColors.OKGREEN}python main.py --engine <sequential|threads|async>{BColors.ENDC}
+      Choose the fetch engine (default: FETCH_ENGINE in config.py)
+      'async' fetches feeds and pages on one asyncio event loop (requires aiohttp)
+      Example: python main.py --fetch -t 60 --engine async
+      Works with: main pipeline, --fetch
+
+  {BColors.OKGREEN}python main.py --all-feeds{BColors.ENDC}
+      Poll every RSS feed this run, including failing feeds in backoff and
+      low-yield feeds that are not yet due (see --feed-health)
+      Works with: main pipeline, --fetch
+
+  {BColors.OKGREEN}python main.py --stream{BColors.ENDC}
+      Streaming mode: fetch, filter and analysis run at the same time, linked by
+      bounded queues, so articles are analyzed while others are still downloading
+      (default: STREAMING_PIPELINE in config.py; queue depth: STREAM_QUEUE_SIZE)
+      Example: python main.py --stream --engine async
+
   {BColors.OKGREEN}python main.py --kql{BColors.ENDC} or {BColors.OKGREEN}--auto-kql{BColors.ENDC}
       Run pipeline and automatically generate KQL queries
       Works with: main pipeline, --analyze, single article mode
@@ -1300,6 +1629,13 @@ def cmd_show_help():
   {BColors.OKCYAN}--stats{BColors.ENDC}
       Show database statistics and threat insights
 
+  {BColors.OKCYAN}--feed-health{BColors.ENDC}
+      Report the slowest, least productive and failing RSS sources (--limit <N>)
+      Example: python main.py --feed-health --limit 15
+
+  {BColors.OKCYAN}--llm-stats{BColors.ENDC}
+      Show per-model JSON answer quality (invalid JSON, schema mismatches, retry rate)
+
   {BColors.OKCYAN}--kql-list{BColors.ENDC}
       List stored KQL queries (filters: --article <ID>, --platform <name>, --type <ioc_type>, --limit <N>)
       Example: python main.py --kql-list --article 42 --limit 20
@@ -1368,7 +1704,7 @@ def cmd_show_help():
   FETCH_DAYS_BACK = 14              Fetch articles from last 14 days (rolling window)
   MIN_ARTICLE_LENGTH = 100          Minimum content length in characters
   FETCH_TIMEOUT = 30                Request timeout in seconds
-  SOCKET_TIMEOUT = 30               Socket timeout for RSS feeds
+  SOCKET_TIMEOUT = 30               Per-request timeout for RSS feeds
   ENABLE_KQL_GENERATION = True      Enable/disable KQL generation feature
   KQL_USE_LLM = True                Use LLM for IOC extraction (recommended)
 
@@ -1426,6 +1762,10 @@ if __name__ == "__main__":
         except Exception:
             pass
     
+    # Poll every feed this run, ignoring feed health skip/backoff
+    if "--all-feeds" in sys.argv:
+        app_config.FEED_HEALTH_POLL_ALL = True
+    
     # Helper function to get argument value
     def get_arg_value(arg_name, default=None):
         """Get value for an argument"""
@@ -1447,14 +1787,34 @@ if __name__ == "__main__":
         cmd_fetch_only()
         sys.exit(0)
     
+    elif "--train-relevance" in sys.argv:
+        cmd_train_relevance_model()
+        sys.exit(0)
+    
     elif "--analyze" in sys.argv:
         cmd_analyze_unanalyzed()
         sys.exit(0)
     
+    elif "--daemon" in sys.argv:
+        interval = get_arg_value("--interval")
+        cycles = get_arg_value("--cycles")
+        cmd_daemon(interval_minutes=int(interval) if interval else None,
+                   max_cycles=int(cycles) if cycles else None)
+        sys.exit(0)
+    
     elif "--stats" in sys.argv:
         cmd_show_stats()
         sys.exit(0)
     
+    elif "--llm-stats" in sys.argv:
+        cmd_llm_stats()
+        sys.exit(0)
+    
+    elif "--feed-health" in sys.argv:
+        limit = int(get_arg_value("--limit", 10))
+        cmd_feed_health(limit=limit)
+        sys.exit(0)
+    
     elif "--list" in sys.argv:
         limit = int(get_arg_value("--limit", 20))
         risk_filter = get_arg_value("--risk")
@@ -0,0 +1,153 @@
+"""
+HTML Extraction Benchmark
+
+Compares the article text extractor in src/core/extraction.py (lxml engine and
+SoupStrainer/html.parser engine) against the original full-BeautifulSoup
+extractor over a corpus of saved pages, reporting throughput and how many pages
+produce identical text.
+
+The corpus defaults to the local HTML store (html_store/, filled by the fetcher);
+any directory of .html / .html.gz files can be used instead.
+
+Usage:
+    python benchmark_extraction.py                        # All pages in the HTML store
+    python benchmark_extraction.py --dir saved_pages/     # A directory of saved pages
+    python benchmark_extraction.py --limit 500 --repeat 3 # Subset, best of 3 runs
+    python benchmark_extraction.py --show-diffs 5         # Print the first mismatching pages
+"""
+
+import argparse
+import difflib
+import gzip
+import os
+import sys
+import time
+
+# Add repository root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from bs4 import BeautifulSoup
+
+from src.config import HTML_STORE_DIR, MIN_ARTICLE_LENGTH
+import src.core.extraction as extraction
+from src.utils.logging_utils import log_info, log_warn, BColors
+
+
+# ---------------------------------------------------------------------------
+# Original extractor (as in fetcher.py before the extraction engine), the baseline
+# ---------------------------------------------------------------------------
+
+def legacy_extract_page_body(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    body = soup.find('article') or soup.find('div', class_='article-body') or soup.find('div', class_='article-content') or soup.find('main')
+    if body:
+        return body.get_text(separator='\n', strip=True)
+    return None
+
+
+def legacy_extract_article(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    title = None
+    if soup.find('h1'):
+        title = soup.find('h1').get_text(strip=True)
+    elif soup.find('title'):
+        title = soup.find('title').get_text(strip=True)
+    content = ""
+    article_selectors = [
+        soup.find('article'),
+        soup.find('div', class_='article-body'),
+        soup.find('div', class_='article-content'),
+        soup.find('div', class_='post-content'),
+        soup.find('div', class_='entry-content'),
+        soup.find('div', {'id': 'article-body'}),
+        soup.find('main'),
+    ]
+    for selector in article_selectors:
+        if selector:
+            content = selector.get_text(separator='\n', strip=True)
+            if len(content) > MIN_ARTICLE_LENGTH:
+                break
+    if len(content) < MIN_ARTICLE_LENGTH:
+        paragraphs = soup.find_all('p')
+        content = '\n'.join([p.get_text(strip=True) for p in paragraphs])
+    return title, content
+
+
+def load_corpus(directory, limit=None):
+    """Read saved pages (.html or gzip-compressed .html.gz) from directory, recursively."""
+    pages = []
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            if name.endswith('.html.gz'):
+                with gzip.open(path, 'rb') as f:
+                    pages.append((path, f.read()))
+            elif name.endswith(('.html', '.htm')):
+                with open(path, 'rb') as f:
+                    pages.append((path, f.read()))
+            if limit and len(pages) >= limit:
+                return pages
+    return pages
+
+
+def run(fn, pages, repeat):
+    """Best-of-repeat wall time for fn over all pages, and the outputs of the last run."""
+    best = None
+    outputs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        outputs = [fn(html) for _, html in pages]
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark article text extraction engines')
+    parser.add_argument('--dir', default=HTML_STORE_DIR, help=f'Corpus directory (default: {HTML_STORE_DIR})')
+    parser.add_argument('--limit', type=int, help='Maximum number of pages to load')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per engine; the fastest is reported')
+    parser.add_argument('--show-diffs', type=int, default=0, help='Print this many mismatching pages per engine')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.dir):
+        log_warn(f"Corpus directory not found: {args.dir}")
+        return
+    pages = load_corpus(args.dir, args.limit)
+    if not pages:
+        log_warn(f"No .html/.html.gz pages found in {args.dir}")
+        return
+    total_mb = sum(len(html) for _, html in pages) / (1024 * 1024)
+    log_info(f"Loaded {len(pages)} pages ({total_mb:.1f} MB) from {args.dir}")
+
+    engines = ['html.parser']
+    if extraction.lxml is not None:
+        engines.insert(0, 'lxml')
+    else:
+        log_warn("lxml is not installed; only the html.parser engine is benchmarked (pip install lxml)")
+
+    modes = [
+        ('page body', legacy_extract_page_body, extraction.extract_page_body),
+        ('full article', legacy_extract_article, extraction.extract_article),
+    ]
+    print(f"\n{BColors.HEADER}{'Mode':<14}{'Engine':<22}{'Pages/s':>10}{'MB/s':>9}{'Speedup':>9}{'Identical':>12}{BColors.ENDC}")
+    for mode, legacy_fn, new_fn in modes:
+        legacy_time, legacy_out = run(legacy_fn, pages, args.repeat)
+        print(f"{mode:<14}{'original (bs4)':<22}{len(pages) / legacy_time:>10.0f}{total_mb / legacy_time:>9.1f}{'1.0x':>9}{'-':>12}")
+        for engine in engines:
+            extraction.HTML_PARSER = engine
+            elapsed, out = run(new_fn, pages, args.repeat)
+            mismatches = [i for i, (a, b) in enumerate(zip(legacy_out, out)) if a != b]
+            identical = 100.0 * (len(pages) - len(mismatches)) / len(pages)
+            label = 'lxml' if engine == 'lxml' else 'html.parser+strainer'
+            print(f"{'':<14}{label:<22}{len(pages) / elapsed:>10.0f}{total_mb / elapsed:>9.1f}"
+                  f"{legacy_time / elapsed:>8.1f}x{identical:>11.1f}%")
+            for i in mismatches[:args.show_diffs]:
+                expected, actual = str(legacy_out[i]), str(out[i])
+                ratio = difflib.SequenceMatcher(None, expected, actual).ratio()
+                print(f"    {BColors.WARNING}differs ({ratio:.1%} similar): {pages[i][0]}{BColors.ENDC}")
+    print()
+
+
+if __name__ == '__main__':
+    main()
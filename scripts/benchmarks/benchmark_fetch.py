@@ -0,0 +1,190 @@
+"""
+Fetch Throughput Benchmark
+
+Runs the fetch engines (sequential, threads, async) against the local replay
+server (replay_server.py) and reports, per engine:
+
+- articles/s over the whole fetch phase (feed polling + page scraping)
+- p50/p99 per-request latency as the fetcher sees it (including waits for
+  the per-host politeness scheduler and retries)
+- peak memory: process RSS high-water mark and peak Python allocations
+
+Every engine runs in its own subprocess with a fresh database and HTML store
+in a temporary directory, so runs are independent and comparable. Pass several
+--threads values to tune THREADS_FETCH with evidence.
+
+Usage:
+    python benchmark_fetch.py                                   # Synthetic corpus, 'typical' profile
+    python benchmark_fetch.py --corpus corpus/ --profile slow   # Recorded corpus (replay_server.py record)
+    python benchmark_fetch.py --engines threads --threads 5,10,20,40
+    python benchmark_fetch.py --no-politeness                   # Lift per-host rate limits to measure raw engine speed
+"""
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+# Add repository root to path
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from replay_server import Corpus, ReplayServer, PROFILES, synthesize_corpus
+from src.utils.logging_utils import log_info, log_warn, BColors
+
+ENGINES = ['sequential', 'threads', 'async']
+
+
+def _percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_worker(args):
+    """Run one engine against the given feed URLs and print a JSON result line."""
+    import src.core.fetcher as fetcher
+    import src.core.async_fetcher as async_fetcher
+    from src.config import MIN_ARTICLE_LENGTH, RSS_FEEDS
+    from src.core import politeness
+    from src.utils.db_utils import initialize_database
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        initialize_database()
+    RSS_FEEDS[:] = json.loads(args.feed_urls)
+    if args.no_politeness:
+        politeness._scheduler = politeness.HostScheduler(rate=1e6, burst=1e6)
+
+    latencies = []
+    polite_get = fetcher.polite_get
+    async_get = async_fetcher._get
+
+    def timed_polite_get(url, **kwargs):
+        started = time.perf_counter()
+        try:
+            return polite_get(url, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - started)
+
+    async def timed_async_get(*get_args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await async_get(*get_args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - started)
+
+    fetcher.polite_get = timed_polite_get
+    async_fetcher._get = timed_async_get
+
+    # Recorded feeds can be old; accept every entry
+    start_date, end_date = datetime.date(2000, 1, 1), datetime.date.today() + datetime.timedelta(days=1)
+    tracemalloc.start()
+    started = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        if args.engine == 'sequential':
+            articles = fetcher.fetch_and_scrape_articles_sequential(None, start_date, end_date)
+        elif args.engine == 'threads':
+            articles = fetcher.fetch_and_scrape_articles_parallel(None, start_date, end_date, max_workers=args.threads)
+        else:
+            articles = async_fetcher.fetch_and_scrape_articles_async(None, start_date, end_date)
+    elapsed = time.perf_counter() - started
+    _, peak_alloc = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    try:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak_rss = rss if sys.platform == 'darwin' else rss * 1024  # bytes on macOS, KB elsewhere
+    except ImportError:  # Windows
+        peak_rss = None
+
+    print(json.dumps({
+        'articles': len(articles),
+        'with_content': sum(1 for a in articles if len(a.get('content') or '') >= MIN_ARTICLE_LENGTH),
+        'seconds': elapsed,
+        'requests': len(latencies),
+        'p50': _percentile(latencies, 0.50),
+        'p99': _percentile(latencies, 0.99),
+        'peak_rss': peak_rss,
+        'peak_alloc': peak_alloc,
+    }))
+
+
+def run_engine(engine, threads, feed_urls, no_politeness):
+    """Run one engine configuration in a fresh subprocess and working directory."""
+    command = [
+        sys.executable, os.path.abspath(__file__), '--worker', '--engine', engine,
+        '--feed-urls', json.dumps(feed_urls),
+    ]
+    if threads:
+        command += ['--threads', str(threads)]
+    if no_politeness:
+        command.append('--no-politeness')
+    with tempfile.TemporaryDirectory(prefix='fetch-bench-') as workdir:
+        result = subprocess.run(command, cwd=workdir, capture_output=True, text=True)
+    if result.returncode != 0:
+        log_warn(f"{engine} run failed:\n{result.stderr[-2000:]}")
+        return None
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark fetch engines against the local replay server')
+    parser.add_argument('--corpus', help='Recorded corpus directory (default: synthetic corpus)')
+    parser.add_argument('--feeds', type=int, default=20, help='Synthetic corpus: number of feeds/sites')
+    parser.add_argument('--entries', type=int, default=10, help='Synthetic corpus: pages per feed')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='typical')
+    parser.add_argument('--engines', default=','.join(ENGINES), help='Comma-separated engines to run')
+    parser.add_argument('--threads', default='', help='Comma-separated THREADS_FETCH values for the threads engine')
+    parser.add_argument('--no-politeness', action='store_true', help='Disable per-host rate limiting')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--engine', help=argparse.SUPPRESS)
+    parser.add_argument('--feed-urls', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        args.threads = int(args.threads) if args.threads else None
+        return run_worker(args)
+
+    corpus = Corpus.load(args.corpus) if args.corpus else synthesize_corpus(args.feeds, args.entries)
+    server = ReplayServer(corpus, args.profile)
+    feed_urls = server.start()
+    log_info(f"Replaying {len(corpus.feeds)} feeds / {len(corpus.pages)} pages with profile "
+             f"'{args.profile}' {server.settings}")
+
+    runs = []
+    for engine in [e.strip() for e in args.engines.split(',') if e.strip()]:
+        if engine not in ENGINES:
+            log_warn(f"Unknown engine '{engine}' (choose from {', '.join(ENGINES)})")
+            continue
+        thread_counts = [int(t) for t in args.threads.split(',') if t.strip()] if engine == 'threads' else []
+        for threads in thread_counts or [None]:
+            log_info(f"Running {engine}" + (f" with {threads} threads" if threads else "") + "...")
+            runs.append((engine, threads, run_engine(engine, threads, feed_urls, args.no_politeness)))
+    server.stop()
+
+    print(f"\n{BColors.HEADER}{'Engine':<12}{'Threads':>8}{'Articles':>10}{'Seconds':>9}{'Art/s':>8}"
+          f"{'p50 ms':>9}{'p99 ms':>9}{'RSS MB':>9}{'Alloc MB':>10}{BColors.ENDC}")
+    for engine, threads, result in runs:
+        if result is None:
+            print(f"{engine:<12}{threads or '-':>8}  failed")
+            continue
+        rate = result['articles'] / result['seconds'] if result['seconds'] else 0
+        p50 = f"{result['p50'] * 1000:.0f}" if result['p50'] is not None else '-'
+        p99 = f"{result['p99'] * 1000:.0f}" if result['p99'] is not None else '-'
+        rss = f"{result['peak_rss'] / 1048576:.0f}" if result['peak_rss'] else '-'
+        print(f"{engine:<12}{threads or '-':>8}{result['articles']:>10}{result['seconds']:>9.1f}{rate:>8.1f}"
+              f"{p50:>9}{p99:>9}{rss:>9}{result['peak_alloc'] / 1048576:>10.1f}")
+    print(f"\nServer responses by status: {server.status_counts}\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+JSON Repair Benchmark
+
+Compares the single-pass repairer in src/utils/json_repair.py (used by
+repair_and_parse_json and the IOC parser) against the original multi-pass
+repair from analysis.py:
+
+- regression corpus (json_repair_corpus.json): damaged LLM answers modelled
+  on archive/failed_json_debug.txt and on truncated IOC responses, each with
+  the object that must be recovered
+- throughput on synthetic IOC answers of increasing size (about 4 characters
+  per token), with raw newlines in string values so the repair path runs
+
+Usage:
+    python benchmark_json_repair.py                    # Corpus results and timings
+    python benchmark_json_repair.py --check            # Corpus only; exit code 1 on any regression
+    python benchmark_json_repair.py --tokens 4000,16000,64000 --repeat 5
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+# Add repository root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.utils.json_repair import loads_tolerant
+from src.utils.logging_utils import log_info, log_success, log_error, BColors
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'json_repair_corpus.json')
+
+
+# ---------------------------------------------------------------------------
+# Original repair (as in analysis.py before json_repair.py), the baseline
+# ---------------------------------------------------------------------------
+
+def legacy_repair(raw_text):
+    json_start = raw_text.find('{')
+    json_end = raw_text.rfind('}')
+    if json_start == -1 or json_end == -1:
+        return None
+    json_str = raw_text[json_start:json_end + 1]
+    json_str = re.sub(r'```json\s*', '', json_str)
+    json_str = re.sub(r'```\s*', '', json_str)
+    json_str = re.sub(r'}\s*{', '},{', json_str)
+    json_str = re.sub(r',\s*([}\]])', r'\1', json_str)
+    repaired_str = ""
+    in_string = False
+    escape_next = False
+    for i, char in enumerate(json_str):
+        if escape_next:
+            repaired_str += char
+            escape_next = False
+            continue
+        if char == '\\':
+            escape_next = True
+            repaired_str += char
+            continue
+        if char == '"' and (i == 0 or json_str[i-1] != '\\'):
+            in_string = not in_string
+            repaired_str += char
+        elif in_string and char == '\n':
+            repaired_str += '\\n'
+        elif in_string and char == '\r':
+            continue
+        elif in_string and char == '\t':
+            repaired_str += '\\t'
+        else:
+            repaired_str += char
+    try:
+        return json.loads(repaired_str)
+    except json.JSONDecodeError:
+        return None
+
+
+def run_corpus():
+    """Run both repairers over the corpus; returns the names of cases the new repairer gets wrong."""
+    with open(CORPUS_PATH, 'r', encoding='utf-8') as f:
+        cases = json.load(f)['cases']
+    failures = []
+    legacy_passed = 0
+    print(f"\n{BColors.HEADER}{'Case':40}{'Source':38}{'Legacy':>8}{'New':>6}{BColors.ENDC}")
+    for case in cases:
+        new_ok = loads_tolerant(case['input']) == case['expected']
+        legacy_ok = legacy_repair(case['input']) == case['expected']
+        legacy_passed += legacy_ok
+        if not new_ok:
+            failures.append(case['name'])
+        mark = lambda ok: f"{BColors.OKGREEN}pass{BColors.ENDC}" if ok else f"{BColors.FAIL}FAIL{BColors.ENDC}"
+        print(f"{case['name'][:39]:40}{case['source'][:37]:38}  {mark(legacy_ok)}  {mark(new_ok)}")
+    print(f"\nLegacy: {legacy_passed}/{len(cases)} recovered, new: {len(cases) - len(failures)}/{len(cases)}")
+    return failures
+
+
+def synthetic_ioc_answer(tokens):
+    """An IOC extraction answer of roughly tokens tokens with raw newlines inside descriptions."""
+    entries = []
+    size = 0
+    n = 0
+    while size < tokens * 4:
+        entry = (f'    {{"value": "c2-{n}.malicious-example.net", "context": "attacker", "confidence": "high", '
+                 f'"description": "Command and control domain listed in the advisory.\nSeen with beacon {n}."}}')
+        entries.append(entry)
+        size += len(entry) + 2
+        n += 1
+    return ('```json\n{\n  "ips": [],\n  "domains": [\n' + ',\n'.join(entries) + '\n  ],\n  "urls": [], "hashes": [], '
+            '"cves": [], "emails": [], "filenames": [], "registry_keys": [], "techniques": []\n}\n```'), n
+
+
+def best_time(function, text, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(text)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the JSON repairer against the original repair')
+    parser.add_argument('--check', action='store_true', help='Run the regression corpus only; fail on any regression')
+    parser.add_argument('--tokens', default='1000,4000,16000,64000', help='Comma-separated synthetic answer sizes')
+    parser.add_argument('--repeat', type=int, default=3, help='Best of N runs per size')
+    args = parser.parse_args()
+
+    failures = run_corpus()
+    if failures:
+        log_error(f"Regressions: {', '.join(failures)}")
+    else:
+        log_success("All corpus cases recovered")
+    if args.check:
+        sys.exit(1 if failures else 0)
+
+    print(f"\n{BColors.HEADER}{'Tokens':>8}{'Entries':>9}{'KB':>8}{'Legacy ms':>11}{'New ms':>9}{'Speedup':>9}{BColors.ENDC}")
+    for tokens in [int(t) for t in args.tokens.split(',') if t.strip()]:
+        text, entries = synthetic_ioc_answer(tokens)
+        expected = legacy_repair(text)
+        if loads_tolerant(text) != expected:
+            log_error(f"Repairers disagree on the {tokens}-token answer")
+        legacy = best_time(legacy_repair, text, args.repeat)
+        new = best_time(loads_tolerant, text, args.repeat)
+        print(f"{tokens:>8}{entries:>9}{len(text) / 1024:>8.0f}{legacy * 1000:>11.1f}{new * 1000:>9.1f}{legacy / new:>8.1f}x")
+    log_info("Timings are best-of-%d wall clock per answer" % args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,336 @@
+"""
+Recorded-Feed Replay Server
+
+Local stand-in for the RSS sources so fetcher performance can be measured
+without touching live sites. It serves recorded (or synthetic) RSS XML and
+article HTML. Each feed is served as its own "site" on a separate localhost
+port, so the per-host politeness limits and connection pools behave as they
+would against real sources.
+
+Profiles set the latency, error rate and throttling of every site:
+
+    fast       5 ms ± 2 ms, no errors
+    typical    150 ms ± 100 ms, 2% 503 errors
+    slow       800 ms ± 400 ms, 5% 503 errors
+    flaky      200 ms ± 100 ms, 20% 503 errors
+    throttled  100 ms ± 50 ms; more than 2 requests/s per site get 429 + Retry-After
+
+A corpus is a directory with manifest.json, feeds/<name>.xml and
+pages/<id>.html.gz. Article links inside the recorded feeds are rewritten to
+point at the replay site that serves them.
+
+Usage:
+    python replay_server.py record --out corpus/ --max-entries 10    # Record live RSS_FEEDS once
+    python replay_server.py synth --out corpus/ --feeds 20 --entries 10
+    python replay_server.py serve --corpus corpus/ --profile typical  # Prints the feed URLs
+"""
+
+import argparse
+import gzip
+import hashlib
+import http.server
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+# Add repository root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.utils.logging_utils import log_info, log_success, log_warn
+
+BASE_PLACEHOLDER = '__REPLAY_BASE__'
+
+PROFILES = {
+    'fast': {'latency_ms': 5, 'jitter_ms': 2, 'error_rate': 0.0, 'throttle_rps': None},
+    'typical': {'latency_ms': 150, 'jitter_ms': 100, 'error_rate': 0.02, 'throttle_rps': None},
+    'slow': {'latency_ms': 800, 'jitter_ms': 400, 'error_rate': 0.05, 'throttle_rps': None},
+    'flaky': {'latency_ms': 200, 'jitter_ms': 100, 'error_rate': 0.2, 'throttle_rps': None},
+    'throttled': {'latency_ms': 100, 'jitter_ms': 50, 'error_rate': 0.0, 'throttle_rps': 2.0},
+}
+
+
+# ---------------------------------------------------------------------------
+# Corpus
+# ---------------------------------------------------------------------------
+
+class Corpus:
+    """Feeds (name -> RSS XML with BASE_PLACEHOLDER links) and pages (id -> HTML bytes)."""
+
+    def __init__(self, feeds=None, pages=None):
+        self.feeds = feeds or {}
+        self.pages = pages or {}
+
+    @classmethod
+    def load(cls, directory):
+        with open(os.path.join(directory, 'manifest.json'), encoding='utf-8') as f:
+            manifest = json.load(f)
+        feeds = {}
+        for name in manifest['feeds']:
+            with open(os.path.join(directory, 'feeds', f'{name}.xml'), encoding='utf-8') as f:
+                feeds[name] = f.read()
+        pages = {}
+        for page_id in manifest['pages']:
+            with gzip.open(os.path.join(directory, 'pages', f'{page_id}.html.gz'), 'rb') as f:
+                pages[page_id] = f.read()
+        return cls(feeds, pages)
+
+    def save(self, directory, sources=None):
+        os.makedirs(os.path.join(directory, 'feeds'), exist_ok=True)
+        os.makedirs(os.path.join(directory, 'pages'), exist_ok=True)
+        for name, xml in self.feeds.items():
+            with open(os.path.join(directory, 'feeds', f'{name}.xml'), 'w', encoding='utf-8') as f:
+                f.write(xml)
+        for page_id, html in self.pages.items():
+            with gzip.open(os.path.join(directory, 'pages', f'{page_id}.html.gz'), 'wb') as f:
+                f.write(html)
+        manifest = {'feeds': sorted(self.feeds), 'pages': sorted(self.pages), 'sources': sources or {}}
+        with open(os.path.join(directory, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+
+def _xml_escape(text):
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def synthesize_corpus(feeds=20, entries=10, seed=0):
+    """Build a corpus of feeds with short summaries and realistic article pages (~40-80 KB)."""
+    rng = random.Random(seed)
+    words = ['threat', 'actors', 'exploited', 'vulnerability', 'ransomware', 'patch', 'network', 'servers',
+             'credentials', 'campaign', 'researchers', 'observed', 'malicious', 'payload', 'organizations',
+             'update', 'systems', 'attackers', 'remote', 'access', 'data', 'security', 'cloud', 'users']
+    boilerplate = (
+        '<nav>' + ''.join(f'<a href="/section/{i}">Section {i}</a>' for i in range(60)) + '</nav>'
+        + '<script>' + 'var analytics = {"id": 1234567890, "enabled": true};' * 200 + '</script>'
+        + '<aside>' + ''.join(f'<div class="related"><a href="/r/{i}">Related story {i}</a></div>' for i in range(40)) + '</aside>'
+    )
+    corpus = Corpus()
+    now = time.strftime('%a, %d %b %Y %H:%M:%S +0000', time.gmtime())
+    for f in range(feeds):
+        items = []
+        for e in range(entries):
+            page_id = f'f{f:03d}e{e:03d}'
+            paragraphs = ''.join(
+                '<p>' + ' '.join(rng.choice(words) for _ in range(rng.randint(40, 90))) + '.</p>'
+                for _ in range(rng.randint(8, 20))
+            )
+            corpus.pages[page_id] = (
+                f'<!DOCTYPE html><html><head><title>Story {page_id}</title></head><body>{boilerplate}'
+                f'<article><h1>Security story {page_id}</h1>{paragraphs}</article>'
+                f'<footer>{"<p>Copyright notice and legal text.</p>" * 30}</footer></body></html>'
+            ).encode('utf-8')
+            items.append(
+                f'<item><title>Security story {page_id}</title><link>{BASE_PLACEHOLDER}/page/{page_id}</link>'
+                f'<guid>{page_id}</guid><pubDate>{now}</pubDate><description>Short teaser.</description></item>'
+            )
+        corpus.feeds[f'feed{f:03d}'] = (
+            f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>Feed {f}</title>'
+            + ''.join(items) + '</channel></rss>'
+        )
+    return corpus
+
+
+def record_corpus(feed_urls, max_entries=10, timeout=30):
+    """Download feeds and their article pages once; returns (corpus, sources)."""
+    import feedparser
+    import requests
+    from src.core.fetcher import USER_AGENTS
+
+    session = requests.Session()
+    session.headers['User-Agent'] = USER_AGENTS[0]
+    corpus = Corpus()
+    sources = {}
+    for index, feed_url in enumerate(feed_urls):
+        name = f'feed{index:03d}'
+        try:
+            response = session.get(feed_url, timeout=timeout)
+            response.raise_for_status()
+        except Exception as e:
+            log_warn(f"Skipping feed {feed_url}: {e}")
+            continue
+        xml = response.content.decode(response.encoding or 'utf-8', errors='replace')
+        recorded = 0
+        for entry in feedparser.parse(response.content).entries[:max_entries]:
+            link = entry.get('link')
+            if not link:
+                continue
+            page_id = hashlib.sha1(link.encode('utf-8')).hexdigest()[:16]
+            try:
+                page = session.get(link, timeout=timeout)
+                page.raise_for_status()
+            except Exception as e:
+                log_warn(f"  Skipping page {link}: {e}")
+                continue
+            corpus.pages[page_id] = page.content
+            for form in {link, _xml_escape(link)}:
+                xml = xml.replace(form, f'{BASE_PLACEHOLDER}/page/{page_id}')
+            recorded += 1
+        corpus.feeds[name] = xml
+        sources[name] = feed_url
+        log_info(f"Recorded {feed_url}: {recorded} pages")
+    return corpus, sources
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+class _Site:
+    """Per-site request counters and throttle bucket."""
+
+    def __init__(self, throttle_rps):
+        self.throttle_rps = throttle_rps
+        self.tokens = throttle_rps or 0.0
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def allow(self):
+        if not self.throttle_rps:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.throttle_rps, self.tokens + (now - self.last) * self.throttle_rps)
+            self.last = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like real sites
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=b'', content_type='text/plain', headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        replay = self.server.replay
+        site = self.server.site
+        time.sleep(replay.sample_latency())
+        if not site.allow():
+            replay.count(429)
+            return self._send(429, b'Too Many Requests', headers={'Retry-After': '1'})
+        if replay.rng_error():
+            replay.count(503)
+            return self._send(503, b'Service Unavailable')
+        if self.path == f'/feed/{self.server.feed_name}':
+            base = f'http://{self.headers.get("Host") or "127.0.0.1"}'
+            body = replay.corpus.feeds[self.server.feed_name].replace(BASE_PLACEHOLDER, base).encode('utf-8')
+            replay.count(200)
+            return self._send(200, body, 'application/rss+xml; charset=utf-8')
+        if self.path.startswith('/page/'):
+            page = replay.corpus.pages.get(self.path[len('/page/'):])
+            if page is not None:
+                replay.count(200)
+                return self._send(200, page, 'text/html; charset=utf-8')
+        replay.count(404)
+        return self._send(404, b'Not Found')
+
+
+class ReplayServer:
+    """Serves a Corpus with one localhost port per feed ("site")."""
+
+    def __init__(self, corpus, profile='fast', seed=0, **overrides):
+        settings = dict(PROFILES[profile])
+        settings.update({key: value for key, value in overrides.items() if value is not None})
+        self.corpus = corpus
+        self.profile = profile
+        self.settings = settings
+        self.status_counts = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._servers = []
+
+    def sample_latency(self):
+        with self._lock:
+            jitter = self._rng.uniform(-1, 1) * self.settings['jitter_ms']
+        return max(0.0, self.settings['latency_ms'] + jitter) / 1000.0
+
+    def rng_error(self):
+        with self._lock:
+            return self._rng.random() < self.settings['error_rate']
+
+    def count(self, status):
+        with self._lock:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    def start(self):
+        """Start one server thread per feed; returns the feed URLs."""
+        urls = []
+        for name in sorted(self.corpus.feeds):
+            server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+            server.daemon_threads = True
+            server.replay = self
+            server.site = _Site(self.settings['throttle_rps'])
+            server.feed_name = name
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self._servers.append(server)
+            urls.append(f'http://127.0.0.1:{server.server_address[1]}/feed/{name}')
+        return urls
+
+    def stop(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers = []
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve recorded RSS feeds and article pages locally')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    record = sub.add_parser('record', help='Record the live RSS_FEEDS and their article pages')
+    record.add_argument('--out', required=True, help='Corpus directory to write')
+    record.add_argument('--max-entries', type=int, default=10, help='Pages recorded per feed')
+
+    synth = sub.add_parser('synth', help='Generate a synthetic corpus')
+    synth.add_argument('--out', required=True, help='Corpus directory to write')
+    synth.add_argument('--feeds', type=int, default=20)
+    synth.add_argument('--entries', type=int, default=10)
+
+    serve = sub.add_parser('serve', help='Serve a corpus until interrupted')
+    serve.add_argument('--corpus', required=True, help='Corpus directory')
+    serve.add_argument('--profile', choices=sorted(PROFILES), default='typical')
+    serve.add_argument('--latency-ms', type=float, help='Override the profile latency')
+    serve.add_argument('--jitter-ms', type=float, help='Override the profile jitter')
+    serve.add_argument('--error-rate', type=float, help='Override the profile 503 rate (0-1)')
+    serve.add_argument('--throttle-rps', type=float, help='Override the per-site request rate before 429s')
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        from src.config import RSS_FEEDS
+        corpus, sources = record_corpus(RSS_FEEDS, args.max_entries)
+        corpus.save(args.out, sources)
+        log_success(f"Recorded {len(corpus.feeds)} feeds and {len(corpus.pages)} pages to {args.out}")
+    elif args.command == 'synth':
+        synthesize_corpus(args.feeds, args.entries).save(args.out)
+        log_success(f"Wrote a synthetic corpus of {args.feeds} feeds x {args.entries} pages to {args.out}")
+    else:
+        server = ReplayServer(
+            Corpus.load(args.corpus), args.profile, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate, throttle_rps=args.throttle_rps,
+        )
+        for url in server.start():
+            print(url)
+        log_info(f"Serving with profile '{args.profile}' {server.settings}; Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.stop()
+            log_info(f"Responses by status: {server.status_counts}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+Re-extract Article Content from the Local HTML Store
+
+Rebuilds the `content` column of stored articles from the raw HTML saved by the
+fetcher (see src/utils/html_store.py), without touching the network. Use it after
+changing the extractor or when earlier scrapes produced short/empty content.
+Pages are read one at a time and streamed into the extraction processes, at
+most --in-flight at once, so memory stays flat however large the store is.
+
+Usage:
+    python reextract_content.py --dry-run              # Report what would change
+    python reextract_content.py                        # Update all articles with stored HTML
+    python reextract_content.py --ids 210 213 215      # Only these articles
+    python reextract_content.py --only-short           # Only articles with content below MIN_ARTICLE_LENGTH
+    python reextract_content.py --in-flight 16         # Fewer pages held in memory at once
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Add repository root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.config import DATABASE_PATH, MIN_ARTICLE_LENGTH
+from src.core.extraction import extract_page_body
+from src.utils.html_store import load_html
+from src.utils.logging_utils import log_info, log_success, log_warn, BColors
+
+UPDATE_BATCH_SIZE = 200  # Re-extracted articles written per transaction
+
+
+def _extract(item):
+    """Worker: (article_id, html_bytes) -> (article_id, text or None)."""
+    article_id, html_bytes = item
+    try:
+        return article_id, extract_page_body(html_bytes)
+    except Exception:
+        return article_id, None
+
+
+def _stored_pages(rows, conn, counts, touch=True):
+    """Yield (article_id, html_bytes) for rows with stored HTML, loading one page at a time."""
+    for article_id, url in rows:
+        html_bytes = load_html(url, conn=conn, touch=touch)
+        if html_bytes:
+            counts['pages'] += 1
+            yield article_id, html_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-extract article content from the local HTML store (offline)')
+    parser.add_argument('--ids', nargs='+', type=int, help='Specific article IDs to re-extract')
+    parser.add_argument('--only-short', action='store_true',
+                        help=f'Only articles whose content is shorter than MIN_ARTICLE_LENGTH ({MIN_ARTICLE_LENGTH})')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4, help='Extraction processes')
+    parser.add_argument('--in-flight', type=int, default=None,
+                        help='Pages loaded and queued for extraction at once (default: 8 per worker)')
+    parser.add_argument('--dry-run', action='store_true', help='Show what would change without updating the database')
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(DATABASE_PATH)
+    # Only ids and URLs are listed up front; HTML and content are read page by page
+    query = "SELECT id, url FROM articles"
+    conditions, params = [], []
+    if args.ids:
+        conditions.append(f"id IN ({','.join('?' * len(args.ids))})")
+        params += args.ids
+    if args.only_short:
+        conditions.append("length(COALESCE(content, '')) < ?")
+        params.append(MIN_ARTICLE_LENGTH)
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    rows = conn.execute(query, params).fetchall()
+
+    started = time.time()
+    in_flight = args.in_flight or args.workers * 8
+    counts = {'pages': 0, 'changed': 0}
+    samples = []
+    updates = []
+
+    def handle(article_id, text):
+        old = conn.execute("SELECT content FROM articles WHERE id = ?", (article_id,)).fetchone()[0] or ''
+        if not text or text == old:
+            return
+        counts['changed'] += 1
+        if args.dry_run:
+            if len(samples) < 20:
+                samples.append((article_id, len(old), len(text)))
+            return
+        updates.append((text, article_id))
+        if len(updates) >= UPDATE_BATCH_SIZE:
+            conn.executemany("UPDATE articles SET content = ? WHERE id = ?", updates)
+            conn.commit()
+            updates.clear()
+
+    # At most in_flight pages are held in memory, however large the store is
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        # A dry run leaves the database untouched, access times included
+        for item in _stored_pages(rows, conn, counts, touch=not args.dry_run):
+            pending.append(executor.submit(_extract, item))
+            if len(pending) >= in_flight:
+                handle(*pending.popleft().result())
+        while pending:
+            handle(*pending.popleft().result())
+    if not args.dry_run:
+        if updates:
+            conn.executemany("UPDATE articles SET content = ? WHERE id = ?", updates)
+        conn.commit()
+
+    elapsed = time.time() - started
+    log_info(f"{counts['pages']} of {len(rows)} articles have stored HTML")
+    if counts['pages']:
+        log_info(f"Extracted {counts['pages']} pages in {elapsed:.1f}s ({counts['pages'] / elapsed if elapsed else 0:.0f} pages/s)")
+
+    if args.dry_run:
+        print(f"\n{BColors.OKBLUE}DRY RUN - {counts['changed']} articles would get new content:{BColors.ENDC}")
+        for article_id, old_length, new_length in samples:
+            print(f"  [{article_id}] {old_length} -> {new_length} chars")
+        if counts['changed'] > len(samples):
+            print(f"  ... and {counts['changed'] - len(samples)} more")
+    elif counts['changed']:
+        log_success(f"Updated content for {counts['changed']} articles")
+    elif counts['pages']:
+        log_warn("No article content changed")
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
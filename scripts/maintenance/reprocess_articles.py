@@ -12,6 +12,7 @@ Usage:
     python reprocess_articles.py --risk NOT_RELEVANT      # All NOT_RELEVANT articles
     python reprocess_articles.py --category "Malware"     # All articles in category
     python reprocess_articles.py --all                    # Reprocess everything (use with caution)
+    python reprocess_articles.py --ids 210 --reextract    # Re-extract content from stored HTML first
 """
 
 import sqlite3
@@ -20,11 +21,13 @@ import os
 import json
 import argparse
 
-# Add parent directory to path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Add repository root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
 from src.core.analysis import analyze_article_with_llm
-from src.utils.logging_utils import log_info, log_success, log_warning, BColors
+from src.core.extraction import extract_page_body
+from src.utils.html_store import load_html
+from src.utils.logging_utils import log_info, log_success, log_warn, BColors
 
 DB_PATH = 'threat_intel.db'
 
@@ -71,12 +74,28 @@ def get_articles_to_reprocess(conn, ids=None, risk=None, category=None, reproces
     return cur.fetchall()
 
 
-def reprocess_article(conn, aid, title, url, content, published_date, show_progress=True):
+def reextract_content(conn, aid, url, content):
+    """Re-extract article content from the local HTML store, falling back to the stored content"""
+    html_bytes = load_html(url, conn=conn)
+    if not html_bytes:
+        return content
+    body_text = extract_page_body(html_bytes)
+    if body_text and body_text != content:
+        conn.execute("UPDATE articles SET content = ? WHERE id = ?", (body_text, aid))
+        conn.commit()
+        return body_text
+    return content
+
+
+def reprocess_article(conn, aid, title, url, content, published_date, show_progress=True, reextract=False):
     """Reprocess a single article"""
     if show_progress:
         print(f"  ID: {aid}")
         print(f"  Title: {title[:70]}...")
     
+    if reextract:
+        content = reextract_content(conn, aid, url, content)
+    
     # Create article dict for analysis
     article = {
         'title': title,
@@ -147,6 +166,8 @@ Examples:
     
     parser.add_argument('--dry-run', action='store_true', help='Show what would be reprocessed without doing it')
     parser.add_argument('--quiet', action='store_true', help='Minimal output')
+    parser.add_argument('--reextract', action='store_true',
+                        help='Re-extract content from the local HTML store before analysis (no refetch)')
     
     args = parser.parse_args()
     
@@ -210,7 +231,8 @@ Examples:
         
         success, result = reprocess_article(
             conn, aid, title, url, content, published_date,
-            show_progress=not args.quiet
+            show_progress=not args.quiet,
+            reextract=args.reextract
         )
         
         if success:
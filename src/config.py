@@ -66,14 +66,86 @@ RSS_FEEDS = [
 DATABASE_PATH = "threat_intel.db"
 OLLAMA_MODEL = "deepseek-coder-v2:16b"  # Better for strict classification and IOC extraction
 OLLAMA_HOST = "http://localhost:11434"
+OLLAMA_MAX_CONCURRENT_REQUESTS = 4  # Across all phases; match the server's OLLAMA_NUM_PARALLEL (extra requests only queue there)
+OLLAMA_RETRIES = 2  # Retries for connection errors, connect timeouts and 429/5xx responses (not read timeouts)
+OLLAMA_RETRY_BACKOFF_SECONDS = 2  # Base of the jittered exponential backoff between retries
+OLLAMA_UNAVAILABLE_COOLDOWN = 30  # Seconds LLM calls fail fast (and callers fall back) after Ollama proved unreachable
+OLLAMA_KEEP_ALIVE = "30m"  # How long Ollama keeps the model loaded after each request
+OLLAMA_WARM_UP = True  # Load the model in the background when the pipeline starts, while feeds are fetched
+LLM_STRUCTURED_OUTPUT = True  # Send JSON schemas as Ollama `format` for analysis, IOC and KQL answers (Ollama 0.5+)
 TEMPLATE_DOCX_PATH = "template.docx"
 OUTPUT_DOCX_PATH = f"Threat_Intelligence_Report_{datetime.date.today()}.docx"
 
 # Fetcher Settings
 FETCH_DAYS_BACK = 14  # How many days back to fetch articles (2 weeks rolling window)
 MIN_ARTICLE_LENGTH = 100  # Minimum content length in characters (lowered from 200)
+FETCH_ONLY_BATCH_SIZE = 50  # --fetch-only stores articles in transactions of this many as they are scraped
+RSS_PRESCREEN_ENABLED = True  # Drop entries whose title/summary is clearly off-topic (gift guides, quarterly results) before fetching the page
 FETCH_TIMEOUT = 30  # Request timeout in seconds for article fetching
-SOCKET_TIMEOUT = 30  # Socket timeout in seconds for RSS feed parsing
+FETCH_MAX_CONNECTIONS_PER_HOST = 4  # Keep-alive pool size per host; extra fetch threads wait for a free connection
+FETCH_MAX_PAGE_BYTES = 5 * 1024 * 1024  # Article pages are streamed and abandoned beyond this size (decoded bytes)
+FETCH_PAGE_CONTENT_TYPES = ['text/html', 'application/xhtml+xml', 'text/xml', 'application/xml']  # Other types (PDF, images, ...) are not downloaded
+HTML_PARSER = 'auto'  # 'auto' (lxml when installed, else html.parser), 'lxml' or 'html.parser'
+HTML_PARSE_PROCESSES = None  # Worker processes for page extraction in the threads/async engines (None = CPU count if >1, 0 = parse in fetch threads)
+DOMAIN_SELECTOR_CACHE_ENABLED = True  # Remember which content selector works per domain and try it first
+DOMAIN_SELECTOR_REVALIDATE_EVERY = 50  # Full selector scan every N pages per domain to catch layout changes
+DOMAIN_SELECTOR_REVALIDATE_DAYS = 7  # ...or when the learned selector was last validated this long ago
+
+# Raw HTML store (content-addressed, gzip-compressed pages for offline re-extraction)
+HTML_STORE_ENABLED = True
+HTML_STORE_DIR = "html_store"
+HTML_STORE_MAX_MB = 1024  # Least-recently-used pages are evicted beyond this size
+
+# Per-host politeness (token bucket + backoff + circuit breaker)
+HOST_REQUESTS_PER_SECOND = 2.0  # Sustained request rate allowed per host
+HOST_BURST = 4  # Requests a host may receive back-to-back before the rate applies
+FETCH_MAX_RETRIES = 2  # Retries after 429/5xx responses (honouring Retry-After)
+BACKOFF_BASE_SECONDS = 2  # First backoff after a 429/5xx; doubles per consecutive failure
+BACKOFF_MAX_SECONDS = 60  # Upper bound for backoff and Retry-After waits
+CIRCUIT_BREAKER_THRESHOLD = 5  # Consecutive failures before a host is skipped
+CIRCUIT_BREAKER_COOLDOWN = 300  # Seconds a failing host is skipped before one trial request
+SOCKET_TIMEOUT = 30  # Per-request timeout in seconds for RSS feed downloads
+FEED_CACHE_ENABLED = True  # Send ETag/Last-Modified on feed polls; unchanged (304) feeds are skipped
+FEED_CACHE_MAX_ENTRY_RETRIES = 3  # Runs an article page that fails to download (5xx, 403, host skipped) holds back its feed's cache
+
+# Feed health (per-feed latency, status, yield and failures recorded on every poll)
+FEED_HEALTH_ENABLED = True
+FEED_HEALTH_POLL_ALL = False  # Ignore skip/backoff and poll every feed (also --all-feeds)
+FEED_MAX_CONSECUTIVE_FAILURES = 3  # Failed polls in a row before a feed is skipped
+FEED_FAILURE_BACKOFF_HOURS = 6  # First skip period for a failing feed; doubles per further failure
+FEED_FAILURE_BACKOFF_MAX_HOURS = 168  # Failing feeds are still retried at least weekly
+FEED_LOW_YIELD_PER_HOUR = 0.02  # Average new entries per hour (about one every two days) below which a feed is polled less often
+FEED_LOW_YIELD_INTERVAL_HOURS = 24  # Polling interval for low-yield feeds
+FEED_HEALTH_MIN_POLLS = 5  # Polls returning the feed (not 304) before a feed can be classed as low-yield
+
+# Near-duplicate story detection (one LLM filter/analysis per story, copies reuse its results)
+NEAR_DUP_DETECTION_ENABLED = True
+NEAR_DUP_MAX_DISTANCE = 6  # Max differing SimHash bits (of 64) for two articles to count as the same story; unrelated texts differ in ~32
+NEAR_DUP_LOOKBACK_DAYS = 14  # Also match new articles against stored articles published this many days back
+
+# Daemon mode (python main.py --daemon): poll continuously, analyze only new entries
+DAEMON_POLL_INTERVAL_MINUTES = 15  # Time between the start of two polling cycles
+DAEMON_FETCH_DAYS_BACK = 2  # Fetch window per cycle; widened up to FETCH_DAYS_BACK after downtime
+DAEMON_ALERT_RISK_LEVELS = ['HIGH']  # New articles at these risk levels raise an alert
+DAEMON_ALERTS_FILE = "alerts.jsonl"  # Alerts are appended here as JSON lines (None to disable)
+DAEMON_ALERT_WEBHOOK_URL = None  # Optional URL that receives each alert as a JSON POST (e.g. a SOC chat webhook)
+DAEMON_WARM_OLLAMA = True  # Load the model at the start of each cycle and keep it resident until the next
+
+# Local relevance classifier in front of the LLM filter (train with python main.py --train-relevance)
+RELEVANCE_MODEL_ENABLED = True  # Used once a model has been trained; no model file means every article goes to the LLM
+RELEVANCE_MODEL_PATH = "models/relevance_model.json"
+RELEVANCE_MODEL_THRESHOLD = 0.9  # Model decides alone when P(relevant) >= this or <= 1 - this; the band between goes to the LLM
+RELEVANCE_MODEL_AUDIT_RATE = 0.05  # Share of confident decisions also sent to the LLM to track agreement
+RELEVANCE_MODEL_MIN_EXAMPLES = 20  # Minimum labeled articles per class before a model can be trained
+
+# Persistent cache of LLM relevance verdicts (keyed by model, prompt version, title and excerpt)
+RELEVANCE_CACHE_ENABLED = True
+RELEVANCE_CACHE_TTL_DAYS = 90  # Verdicts older than this are asked again
+RELEVANCE_CACHE_MAX_ENTRIES = 50000  # Least recently used verdicts are evicted beyond this
+# Batched relevance filtering: the parallel and streaming filters ask about this many articles per LLM request (1 = one per request)
+RELEVANCE_BATCH_SIZE = 5  # Per-request overhead dominates short YES/NO answers on CPU-only Ollama hosts
+RELEVANCE_BATCH_WAIT_SECONDS = 2  # Streaming mode: how long a filter worker waits for more articles before asking about a partial batch
+RELEVANCE_BATCH_EXCERPT_CHARS = 600  # Excerpt per article in a batch (keeps the prompt inside the model's context window)
 
 # KQL Generator Settings
 ENABLE_KQL_GENERATION = True
@@ -99,9 +171,18 @@ EXTRACT_IOCS_FOR_RISK_LEVELS = ['HIGH', 'MEDIUM']  # Only extract IOCs for these
 ENABLE_PHASED_MULTITHREADING = True  # When True, each phase runs concurrently across items
 # Default thread pool sizes per phase (tune based on your machine and Ollama throughput)
 THREADS_FETCH = 10
+THREADS_FEEDS = 10  # Concurrent RSS feed downloads during source discovery
+# Fetch engine used when ENABLE_PHASED_MULTITHREADING is True (override with --engine):
+#   'threads' - thread pool (THREADS_FETCH workers)
+#   'async'   - single asyncio event loop (requires aiohttp)
+FETCH_ENGINE = 'threads'
+ASYNC_FETCH_MAX_IN_FLIGHT = 200  # Max concurrent requests for the async engine
 THREADS_FILTER = 8
 THREADS_ANALYZE = 6
 THREADS_IOC = 6
+# Streaming pipeline: fetch, filter and analysis run concurrently, linked by bounded queues (also --stream)
+STREAMING_PIPELINE = False
+STREAM_QUEUE_SIZE = 20  # Articles buffered between stages before the upstream stage blocks
 
 # Verbose output (can be enabled at runtime with --verbose or -v)
 VERBOSE = False
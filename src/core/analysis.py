@@ -1,83 +1,34 @@
 # analysis.py
 import requests
-import json
-import re
 import sys
 from urllib.parse import urlparse
-from src.config import OLLAMA_MODEL, OLLAMA_HOST, THREADS_ANALYZE, ENABLE_PHASED_MULTITHREADING
+from src.config import THREADS_ANALYZE, ENABLE_PHASED_MULTITHREADING
+from src.core.structured_output import ANALYSIS_SCHEMA, generate_json
+from src.utils.json_repair import loads_tolerant, repair_json
 from src.utils.logging_utils import BColors, log_debug
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 def repair_and_parse_json(raw_text, debug_title=None):
-    """Enhanced JSON repair with multiple strategies"""
-    
-    # Strategy 1: Find JSON boundaries
-    json_start = raw_text.find('{')
-    json_end = raw_text.rfind('}')
-    if json_start == -1 or json_end == -1:
-        return None
-    
-    json_str = raw_text[json_start:json_end + 1]
-    
-    # Strategy 2: Remove markdown code blocks if present
-    json_str = re.sub(r'```json\s*', '', json_str)
-    json_str = re.sub(r'```\s*', '', json_str)
-    
-    # Strategy 3: Fix common JSON issues
-    json_str = re.sub(r'}\s*{', '},{', json_str)  # Multiple objects
-    json_str = re.sub(r',\s*([}\]])', r'\1', json_str)  # Trailing commas
-    
-    # Strategy 4: Handle newlines in strings
-    repaired_str = ""
-    in_string = False
-    escape_next = False
-    for i, char in enumerate(json_str):
-        if escape_next:
-            repaired_str += char
-            escape_next = False
-            continue
-        
-        if char == '\\':
-            escape_next = True
-            repaired_str += char
-            continue
-            
-        if char == '"' and (i == 0 or json_str[i-1] != '\\'):
-            in_string = not in_string
-            repaired_str += char
-        elif in_string and char == '\n':
-            repaired_str += '\\n'
-        elif in_string and char == '\r':
-            continue  # Skip carriage returns
-        elif in_string and char == '\t':
-            repaired_str += '\\t'
-        else:
-            repaired_str += char
-    
-    json_str = repaired_str
-    
-    # Strategy 5: Try to parse
-    try:
-        parsed = json.loads(json_str)
+    """Parse the analysis JSON in an LLM answer, repairing it in one pass (see src/utils/json_repair.py)"""
+    parsed = loads_tolerant(raw_text)
+    if isinstance(parsed, dict):
         # Validate structure
         required_keys = ['summary', 'threat_risk', 'category', 'recommendations']
         if all(key in parsed for key in required_keys):
             return parsed
-        else:
-            if debug_title:
-                print(f"\n[DEBUG] Missing required keys for '{debug_title}'. Found: {list(parsed.keys())}")
-            return None
-    except json.JSONDecodeError as e:
         if debug_title:
-            # Save failed JSON for debugging
-            try:
-                with open('failed_json_debug.txt', 'a', encoding='utf-8') as f:
-                    f.write(f"\n\n=== FAILED: {debug_title} ===\n")
-                    f.write(f"Error: {str(e)}\n")
-                    f.write(f"JSON attempt:\n{json_str[:500]}...\n")
-            except:
-                pass
+            print(f"\n[DEBUG] Missing required keys for '{debug_title}'. Found: {list(parsed.keys())}")
         return None
+    if debug_title:
+        # Save failed JSON for debugging
+        try:
+            with open('failed_json_debug.txt', 'a', encoding='utf-8') as f:
+                f.write(f"\n\n=== FAILED: {debug_title} ===\n")
+                f.write(f"Error: {'unrepairable JSON' if parsed is None else 'not a JSON object'}\n")
+                f.write(f"JSON attempt:\n{(repair_json(raw_text) or raw_text)[:500]}...\n")
+        except OSError:
+            pass
+    return None
 
 def analyze_article_with_llm(article, retry_callback=None):
     # Verbose: announce which article is being analyzed
@@ -220,25 +171,19 @@ RESPOND WITH JSON ONLY:"""
     max_retries = 2
     for attempt in range(max_retries + 1):
         try:
-            # Use lower temperature for more consistent output
-            response = requests.post(
-                f"{OLLAMA_HOST}/api/generate",
-                json={
-                    "model": OLLAMA_MODEL, 
-                    "prompt": prompt, 
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.1,  # Very low = more conservative and consistent
-                        "top_p": 0.85
-                    }
+            # Use lower temperature for more consistent output; the schema constrains the answer (see structured_output.py)
+            parsed_json = generate_json(
+                prompt,
+                ANALYSIS_SCHEMA,
+                purpose='analysis',
+                repair=lambda text: repair_and_parse_json(text.strip(), debug_title=article['title']),
+                retry=attempt > 0,
+                options={
+                    "temperature": 0.1,  # Very low = more conservative and consistent
+                    "top_p": 0.85
                 },
                 timeout=300
             )
-            response.raise_for_status()
-            response_text = response.json()['response'].strip()
-            
-            # Try to parse with debug info
-            parsed_json = repair_and_parse_json(response_text, debug_title=article['title'])
             
             if parsed_json:
                 return parsed_json, None
@@ -249,16 +194,17 @@ RESPOND WITH JSON ONLY:"""
                 else:
                     print(f"\n{retry_msg}")
         except requests.RequestException as e:
-            if attempt < max_retries:
-                retry_msg = f"{BColors.WARNING}[RETRYING]{BColors.ENDC} Network error for '{article['title']}' (Attempt {attempt + 2})"
-                if retry_callback:
-                    retry_callback(retry_msg)
-                else:
-                    print(f"\n{retry_msg}")
+            # The Ollama client already retried transient network errors
+            error_msg = f"{BColors.WARNING}[LLM ERROR]{BColors.ENDC} '{article['title']}': {e}"
+            if retry_callback:
+                retry_callback(error_msg)
+            else:
+                print(f"\n{error_msg}")
+            break
     
     # All retries failed
     if retry_callback:
-        retry_callback(f"{BColors.FAIL}[FAILED]{BColors.ENDC} Could not analyze '{article['title']}' after {max_retries + 1} attempts")
+        retry_callback(f"{BColors.FAIL}[FAILED]{BColors.ENDC} Could not analyze '{article['title']}' after {attempt + 1} attempts")
     return None, None
 
 def analyze_articles_sequential(articles):
@@ -0,0 +1,314 @@
+# async_fetcher.py
+import asyncio
+import functools
+import os
+import random
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import feedparser
+
+try:
+    import aiohttp
+except ImportError:  # Optional dependency; callers fall back to the thread-pool fetcher
+    aiohttp = None
+
+from src.config import (
+    RSS_FEEDS, MIN_ARTICLE_LENGTH, FETCH_TIMEOUT, SOCKET_TIMEOUT, FEED_CACHE_ENABLED,
+    FETCH_MAX_CONNECTIONS_PER_HOST, ASYNC_FETCH_MAX_IN_FLIGHT, FETCH_MAX_RETRIES, FETCH_MAX_PAGE_BYTES,
+)
+from src.core.fetcher import (
+    USER_AGENTS, _usable_feed_cache, _feed_cache_state, _entry_guid, _tally_feed_entries,
+    _entry_feed_text, fetch_and_scrape_articles_parallel, log_host_politeness_summary,
+    _PAGE_CHUNK_BYTES, PageRejectedError, check_page_headers, fetch_outcome, FetchStats, FeedCacheUpdate,
+)
+from src.core.extraction import extract_page_body, save_domain_selectors, create_parse_executor
+from src.core.feed_health import FeedHealthTracker
+from src.core.politeness import get_host_scheduler
+from src.utils.db_utils import get_feed_cache
+from src.utils.html_store import store_html, evict_html_store
+from src.utils.logging_utils import log_info, log_success, log_warn, BColors, log_debug
+
+
+def is_async_fetch_available():
+    """True when the optional aiohttp dependency is installed."""
+    return aiohttp is not None
+
+
+class _HostLimiter:
+    """Lazily created asyncio.Semaphore per host, capping concurrent requests to one site."""
+
+    def __init__(self, per_host):
+        self.per_host = per_host
+        self._semaphores = {}
+
+    def for_url(self, url):
+        host = urlparse(url).netloc
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.per_host)
+        return self._semaphores[host]
+
+
+async def _get(session, limiter, url, timeout, headers=None, page=False):
+    """GET a URL under its host's semaphore; returns (status, headers, body bytes).
+
+    Paced by the shared politeness scheduler like fetcher.polite_get: 429/5xx
+    are retried after backing off, and an open circuit raises
+    HostCircuitOpenError before any request is made. With page=True the body
+    is gated and capped like fetcher.download_page (PageRejectedError).
+    """
+    request_headers = {'User-Agent': random.choice(USER_AGENTS)}
+    if headers:
+        request_headers.update(headers)
+    scheduler = get_host_scheduler()
+    for attempt in range(FETCH_MAX_RETRIES + 1):
+        delay = scheduler.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        async with limiter.for_url(url):
+            try:
+                async with session.get(url, headers=request_headers, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    scheduler.record_response(url, response.status, response.headers.get('Retry-After'))
+                    if scheduler.is_retryable(response.status) and attempt < FETCH_MAX_RETRIES:
+                        continue
+                    if response.status == 304:
+                        return response.status, response.headers, b''
+                    response.raise_for_status()
+                    if not page:
+                        return response.status, response.headers, await response.read()
+                    check_page_headers(url, response.headers.get('Content-Type'), response.headers.get('Content-Length'))
+                    chunks = []
+                    size = 0
+                    async for chunk in response.content.iter_chunked(_PAGE_CHUNK_BYTES):
+                        size += len(chunk)
+                        if size > FETCH_MAX_PAGE_BYTES:
+                            raise PageRejectedError('too_large', f"{url} exceeds {FETCH_MAX_PAGE_BYTES} bytes")
+                        chunks.append(chunk)
+                    return response.status, response.headers, b''.join(chunks)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                scheduler.record_failure(url)
+                raise
+
+
+async def _fetch_feed_async(session, limiter, executor, feed_url, cached):
+    """Async counterpart of fetcher._fetch_feed (conditional GET, parsing in the executor)."""
+    headers = {}
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+    status, response_headers, body = await _get(session, limiter, feed_url, SOCKET_TIMEOUT, headers)
+    if status == 304:
+        return feedparser.FeedParserDict(entries=[], status=304)
+    loop = asyncio.get_running_loop()
+    feed = await loop.run_in_executor(executor, functools.partial(
+        feedparser.parse, body, response_headers={
+            'content-location': feed_url,
+            'content-type': response_headers.get('Content-Type', ''),
+        }
+    ))
+    feed['status'] = status
+    feed['etag'] = response_headers.get('ETag')
+    feed['modified'] = response_headers.get('Last-Modified')
+    return feed
+
+
+async def _process_entry_async(session, limiter, executor, entry, published_date, on_article=None, parse_executor=None,
+                               fetch_stats=None, feed_cache_update=None):
+    """Async counterpart of fetcher._process_entry."""
+    article_data = {'title': entry.title, 'url': entry.link, 'published_date': published_date.isoformat(), 'content': ""}
+    log_debug(f"Fetching: {entry.title[:80]} [{urlparse(entry.link).netloc}]")
+    loop = asyncio.get_running_loop()
+    outcome = 'feed'
+    try:
+        article_data['content'] = await loop.run_in_executor(executor, _entry_feed_text, entry)
+
+        # If content is short, try fetching the page
+        if len(article_data['content']) < MIN_ARTICLE_LENGTH:
+            _, response_headers, body = await _get(session, limiter, article_data['url'], FETCH_TIMEOUT, page=True)
+            await loop.run_in_executor(executor, store_html, article_data['url'], body, response_headers.get('Content-Type'))
+            body_text = await loop.run_in_executor(executor, extract_page_body, body, article_data['url'], parse_executor)
+            outcome = 'page' if body_text else 'no_body'
+            if body_text:
+                article_data['content'] = body_text
+    except aiohttp.ClientResponseError:
+        outcome = 'http_error'
+    except Exception as e:
+        # On failure, keep whatever we had (may be empty)
+        outcome = fetch_outcome(e)
+    if fetch_stats is not None:
+        fetch_stats.record(outcome)
+    if feed_cache_update is not None:
+        feed_cache_update.record_fetch(article_data['url'], outcome)
+    if on_article:
+        # May block on a full downstream queue; run it off the event loop (not on the parse executor)
+        await loop.run_in_executor(None, on_article, article_data)
+    return article_data
+
+
+async def _fetch_and_scrape(existing_urls, start_date, end_date, max_in_flight, on_article=None, feed_cache_update=None):
+    all_articles = []
+    scraped = 0
+    fetch_stats = FetchStats()
+    all_entries = []
+    skipped_duplicates = 0
+    skipped_outside_range = 0
+    skipped_screened = 0
+    seen_urls = set()
+    feed_health = FeedHealthTracker()
+    feeds_to_poll = feed_health.feeds_to_poll(RSS_FEEDS)
+    total_sources = len(feeds_to_poll)
+    checked_sources = 0
+
+    def print_sources_progress(current, total, msg=None):
+        width = 40
+        percent = int((current / total) * 100) if total else 100
+        filled = int(width * percent // 100)
+        bar = '█' * filled + '-' * (width - filled)
+        sys.stdout.write('\r\033[K')
+        if msg:
+            sys.stdout.write(f"{msg}\n")
+        sys.stdout.write(f"Checking Sources |{bar}| {percent}% ({current}/{total})")
+        sys.stdout.flush()
+
+    feed_cache = get_feed_cache() if FEED_CACHE_ENABLED else {}
+    feed_cache_update = FeedCacheUpdate() if feed_cache_update is None else feed_cache_update
+    limiter = _HostLimiter(FETCH_MAX_CONNECTIONS_PER_HOST)
+    connector = aiohttp.TCPConnector(limit=max_in_flight)
+    # HTML/XML parsing is CPU-bound; keep it off the event loop. Page bodies are
+    # parsed in worker processes (the executor threads only wait for the result)
+    executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 4)
+    parse_executor = create_parse_executor()
+
+    try:
+        async with aiohttp.ClientSession(connector=connector, headers={'Accept-Encoding': 'gzip, deflate'}) as session:
+            # Phase A: poll all feeds on the event loop
+            async def poll(feed_url):
+                cached = _usable_feed_cache(feed_cache, feed_url, start_date)
+                started = time.monotonic()
+                try:
+                    feed = await _fetch_feed_async(session, limiter, executor, feed_url, cached)
+                    return feed_url, cached, feed, None, time.monotonic() - started
+                except Exception as e:
+                    return feed_url, cached, None, e, time.monotonic() - started
+
+            if total_sources:
+                print_sources_progress(0, total_sources)
+            for next_done in asyncio.as_completed([poll(feed_url) for feed_url in feeds_to_poll]):
+                feed_url, cached, feed, error, latency = await next_done
+                host = urlparse(feed_url).netloc or feed_url
+                checked_sources += 1
+                if error is not None:
+                    log_warn(f"Could not process feed {feed_url}: {error}")
+                    feed_health.record_poll(feed_url, latency, error=error)
+                    print_sources_progress(
+                        checked_sources,
+                        total_sources,
+                        msg=f"{BColors.OKCYAN}[SOURCE]{BColors.ENDC} {host} — error: {str(error)[:80]}"
+                    )
+                    continue
+                feed_state = _feed_cache_state(feed, cached, start_date)
+                if feed.get('status') == 304:
+                    feed_cache_update.add(feed_url, feed_state)
+                    feed_health.record_poll(feed_url, latency, feed)
+                    print_sources_progress(
+                        checked_sources,
+                        total_sources,
+                        msg=f"{BColors.OKCYAN}[SOURCE]{BColors.ENDC} {host} — not modified since last poll"
+                    )
+                    continue
+                seen_before = feed_cache.get(feed_url, {}).get('seen_guids', set())
+                new_this = sum(1 for e in feed.entries if _entry_guid(e) not in seen_before)
+                feed_health.record_poll(feed_url, latency, feed, new_entries=new_this)
+                try:
+                    in_range, dupes_this, outside_this, screened_this = _tally_feed_entries(feed, existing_urls, start_date, end_date, seen_urls)
+                except sqlite3.Error as e:
+                    # Stored articles could not be looked up: skip the feed rather than treat every entry as new
+                    log_warn(f"Skipping feed {feed_url} this run: {e}")
+                    print_sources_progress(
+                        checked_sources,
+                        total_sources,
+                        msg=f"{BColors.OKCYAN}[SOURCE]{BColors.ENDC} {host} — error: stored-article lookup failed"
+                    )
+                    continue
+                feed_cache_update.add(feed_url, feed_state, in_range)
+                all_entries.extend(in_range)
+                skipped_duplicates += dupes_this
+                skipped_outside_range += outside_this
+                skipped_screened += screened_this
+                print_sources_progress(
+                    checked_sources,
+                    total_sources,
+                    msg=f"{BColors.OKCYAN}[SOURCE]{BColors.ENDC} {host} — entries: {len(feed.entries)} | new: {new_this} | in-range: {len(in_range)} | dupes: {dupes_this}"
+                )
+
+            total = len(all_entries)
+            sys.stdout.write('\n')
+            sys.stdout.flush()
+            feed_health.save()
+            log_info(f"Found {total} new articles (skipped {skipped_duplicates} duplicates, {skipped_outside_range} outside date range, {skipped_screened} off-topic)")
+
+            if total == 0:
+                return []
+
+            # Phase B: scrape entries, all in flight at once (bounded by connector + host semaphores)
+            progress_bar_width = 50
+
+            def print_progress(current):
+                percent = int((current / total) * 100) if total else 100
+                filled_length = int(progress_bar_width * percent // 100)
+                bar = '█' * filled_length + '-' * (progress_bar_width - filled_length)
+                sys.stdout.write(f"\rFetching Articles |{bar}| {percent}% ({current}/{total})")
+                sys.stdout.flush()
+
+            print_progress(0)
+            tasks = [
+                _process_entry_async(session, limiter, executor, entry, pub, on_article, parse_executor, fetch_stats,
+                                     feed_cache_update)
+                for entry, pub in all_entries
+            ]
+            for processed, next_done in enumerate(asyncio.as_completed(tasks), start=1):
+                article = await next_done
+                scraped += 1
+                if on_article is None:
+                    all_articles.append(article)
+                print_progress(processed)
+    finally:
+        executor.shutdown(wait=False)
+        if parse_executor is not None:
+            parse_executor.shutdown(wait=False)
+
+    sys.stdout.write('\n')
+    sys.stdout.flush()
+    fetch_stats.log_summary()
+    log_host_politeness_summary()
+    evict_html_store()
+    save_domain_selectors()
+    log_success(f"Found a total of {scraped} new potential articles across all feeds.")
+    return all_articles
+
+
+def fetch_and_scrape_articles_async(existing_urls, start_date, end_date, max_in_flight=None, on_article=None,
+                                    feed_cache_update=None):
+    """asyncio version of fetch_and_scrape_articles.
+
+    Feeds and article pages are fetched on a single event loop with up to
+    ASYNC_FETCH_MAX_IN_FLIGHT concurrent requests and at most
+    FETCH_MAX_CONNECTIONS_PER_HOST per site; feed parsing runs in a thread
+    executor and page extraction in a process pool.
+    Falls back to the thread-pool fetcher when aiohttp is not installed.
+    on_article is called (off the event loop) as each article is scraped;
+    those articles are not collected and an empty list is returned.
+    feed_cache_update is as for fetch_and_scrape_articles_sequential.
+    """
+    if not is_async_fetch_available():
+        log_warn("aiohttp is not installed; falling back to the thread-pool fetcher (pip install aiohttp)")
+        return fetch_and_scrape_articles_parallel(existing_urls, start_date, end_date, on_article=on_article,
+                                                  feed_cache_update=feed_cache_update)
+    log_info(f"Searching for new articles from {len(RSS_FEEDS)} sources for {start_date} to {end_date} ({(end_date - start_date).days + 1} days)...")
+    return asyncio.run(_fetch_and_scrape(existing_urls, start_date, end_date, max_in_flight or ASYNC_FETCH_MAX_IN_FLIGHT,
+                                         on_article, feed_cache_update))
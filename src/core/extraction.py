@@ -0,0 +1,504 @@
+# extraction.py
+"""
+Article text extraction from downloaded HTML.
+
+Two engines produce the same text as the original BeautifulSoup extractor
+(`get_text(separator='\\n', strip=True)` over the first matching container):
+
+- lxml (when installed): pages are parsed with lxml.html and walked once;
+  the first element for every candidate selector is recorded in that single
+  pass instead of running one `soup.find` per selector.
+- BeautifulSoup fallback: html.parser with a SoupStrainer, so only candidate
+  containers (and title/h1/p when needed) are turned into Tag objects.
+
+Page bodies scraped during fetch runs first try the selector learned for the
+page's domain (DomainSelectorCache) before scanning all candidates. The
+threaded and async fetchers parse pages in a process pool
+(create_parse_executor) so extraction scales with cores instead of being
+serialized by the GIL in the download threads.
+
+scripts/benchmarks/benchmark_extraction.py measures throughput and text
+equivalence against the original extractor over stored pages.
+"""
+
+import datetime
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, BrokenExecutor
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # Optional dependency; the BeautifulSoup engine is used instead
+    lxml = None
+
+from src.config import (
+    HTML_PARSER, MIN_ARTICLE_LENGTH, DOMAIN_SELECTOR_CACHE_ENABLED,
+    DOMAIN_SELECTOR_REVALIDATE_EVERY, DOMAIN_SELECTOR_REVALIDATE_DAYS, HTML_PARSE_PROCESSES,
+)
+from src.utils.db_utils import get_domain_selectors, store_domain_selectors
+from src.utils.logging_utils import log_debug
+
+# Candidate article containers in priority order: (tag, class, id)
+ARTICLE_SELECTORS = [
+    ('article', None, None),
+    ('div', 'article-body', None),
+    ('div', 'article-content', None),
+    ('div', 'post-content', None),
+    ('div', 'entry-content', None),
+    ('div', None, 'article-body'),
+    ('main', None, None),
+]
+# Subset used when scraping feed entries (indexes into ARTICLE_SELECTORS)
+PAGE_BODY_SELECTORS = [0, 1, 2, 6]
+
+_SELECTOR_CLASSES = {cls for _, cls, _ in ARTICLE_SELECTORS if cls}
+_SELECTOR_IDS = {id_ for _, _, id_ in ARTICLE_SELECTORS if id_}
+_SKIP_TEXT_TAGS = ('script', 'style')  # BeautifulSoup's get_text() ignores these too
+
+
+def get_extraction_engine():
+    """Name of the engine in use: 'lxml' or 'html.parser'."""
+    if HTML_PARSER == 'html.parser' or lxml is None:
+        return 'html.parser'
+    return 'lxml'
+
+
+def _selector_slot(tag, classes, element_id, candidates):
+    """Index of the first selector in candidates that matches the element, or None."""
+    for index in candidates:
+        name, cls, id_ = ARTICLE_SELECTORS[index]
+        if tag == name and (cls is None or cls in classes) and (id_ is None or id_ == element_id):
+            return index
+    return None
+
+
+# ---------------------------------------------------------------------------
+# lxml engine
+# ---------------------------------------------------------------------------
+
+_lxml_parser = None
+
+
+def _parse_lxml(html):
+    global _lxml_parser
+    if _lxml_parser is None:
+        # Comments are dropped at parse time (their tail text is kept), matching get_text()
+        _lxml_parser = lxml.html.HTMLParser(remove_comments=True, remove_pis=True)
+    if isinstance(html, bytes):
+        # libxml2 assumes Latin-1 when a page has no charset declaration; most pages are
+        # UTF-8, so decode that up front and only leave other encodings to the <meta> tag
+        try:
+            text = html.decode('utf-8')
+        except UnicodeDecodeError:
+            text = None
+    else:
+        text = html
+    if text is not None and not text.lstrip().startswith('<?xml'):
+        return lxml.html.document_fromstring(text, parser=_lxml_parser)
+    # lxml refuses str input with an XML encoding declaration; let it decode the bytes
+    if text is not None and not isinstance(html, bytes):
+        html = html.encode('utf-8')
+    return lxml.html.document_fromstring(html, parser=_lxml_parser)
+
+
+def _lxml_strings(element):
+    """Stripped, non-empty text fragments of element in document order, skipping script/style."""
+    strings = []
+    for event, el in etree.iterwalk(element, events=('start', 'end')):
+        if event == 'start':
+            text = el.text if el.tag not in _SKIP_TEXT_TAGS else None
+        elif el is not element:
+            text = el.tail
+        else:
+            continue
+        if text:
+            text = text.strip()
+            if text:
+                strings.append(text)
+    return strings
+
+
+def _scan_lxml(root, candidates, want_title=False, want_paragraphs=False):
+    """Single pass over the tree: first element per candidate selector, plus h1/title/p if requested."""
+    found = {}
+    first_h1 = first_title = None
+    paragraphs = []
+    best = min(candidates)
+    for el in root.iter():
+        tag = el.tag
+        if not isinstance(tag, str):
+            continue
+        if tag == 'p':
+            if want_paragraphs:
+                paragraphs.append(el)
+            continue
+        if tag == 'h1':
+            if first_h1 is None:
+                first_h1 = el
+            continue
+        if tag == 'title':
+            if first_title is None:
+                first_title = el
+            continue
+        if tag in ('article', 'main') or (tag == 'div' and (el.get('class') or el.get('id'))):
+            slot = _selector_slot(tag, (el.get('class') or '').split(), el.get('id'), candidates)
+            if slot is not None and slot not in found:
+                found[slot] = el
+                # Nothing can beat the top-priority container when only the body is wanted
+                if slot == best and not (want_title or want_paragraphs):
+                    break
+    return found, first_h1, first_title, paragraphs
+
+
+# ---------------------------------------------------------------------------
+# BeautifulSoup engine
+# ---------------------------------------------------------------------------
+
+class _CandidateStrainer(SoupStrainer):
+    """SoupStrainer that only builds candidate containers (and optionally title/h1/p).
+
+    Non-matching tags are never turned into Tag objects; matching ones are kept
+    with their whole subtree, so get_text() on them is unchanged.
+    """
+
+    def __init__(self, extra_tags=()):
+        self.extra_tags = frozenset(extra_tags)
+        # bs4 < 4.13 calls the name function with (tag name, attrs)
+        super().__init__(self._matches)
+
+    def allow_tag_creation(self, nsprefix, name, attrs):  # bs4 >= 4.13
+        return self._matches(name, attrs)
+
+    def _matches(self, name, attrs=None):
+        if not isinstance(name, str):
+            return False
+        if name in ('article', 'main') or name in self.extra_tags:
+            return True
+        if name != 'div' or not attrs:
+            return False
+        classes = attrs.get('class') or ''
+        if isinstance(classes, str):
+            classes = classes.split()
+        return bool(_SELECTOR_CLASSES.intersection(classes)) or attrs.get('id') in _SELECTOR_IDS
+
+
+_BODY_STRAINER = _CandidateStrainer()
+_ARTICLE_STRAINER = _CandidateStrainer(extra_tags=('title', 'h1', 'p'))
+
+
+def _scan_soup(soup, candidates, want_paragraphs=False):
+    """Single pass over a (strained) soup: first element per candidate selector, plus h1/title/p."""
+    found = {}
+    first_h1 = first_title = None
+    paragraphs = []
+    for el in soup.find_all(True):
+        if el.name == 'p':
+            if want_paragraphs:
+                paragraphs.append(el)
+        elif el.name == 'h1':
+            if first_h1 is None:
+                first_h1 = el
+        elif el.name == 'title':
+            if first_title is None:
+                first_title = el
+        else:
+            slot = _selector_slot(el.name, el.get('class') or [], el.get('id'), candidates)
+            if slot is not None and slot not in found:
+                found[slot] = el
+    return found, first_h1, first_title, paragraphs
+
+
+# ---------------------------------------------------------------------------
+# Learned per-domain selectors
+# ---------------------------------------------------------------------------
+
+_SELECTOR_NAMES = [
+    name + (f'.{cls}' if cls else '') + (f'#{id_}' if id_ else '')
+    for name, cls, id_ in ARTICLE_SELECTORS
+]  # 'article', 'div.article-body', ..., 'div#article-body', 'main'
+_SELECTOR_SLOTS = {selector: slot for slot, selector in enumerate(_SELECTOR_NAMES)}
+
+
+def _selector_domain(url):
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def _utc_timestamp():
+    # Same format as SQLite's CURRENT_TIMESTAMP
+    return datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class DomainSelectorCache:
+    """Content selector learned per domain, persisted in the domain_selectors table.
+
+    After a full selector scan, the selector that supplied the page body is
+    remembered for the page's domain. Later pages from that domain try it
+    first and skip the scan when it yields at least MIN_ARTICLE_LENGTH
+    characters. A learned selector that stops matching is replaced by the
+    next scan's winner. Every DOMAIN_SELECTOR_REVALIDATE_EVERY pages (or after
+    DOMAIN_SELECTOR_REVALIDATE_DAYS) a full scan runs anyway, so a layout
+    change that leaves the old selector matching the wrong container is
+    still noticed.
+    """
+
+    def __init__(self, revalidate_every=None, revalidate_days=None):
+        self.revalidate_every = revalidate_every or DOMAIN_SELECTOR_REVALIDATE_EVERY
+        self.revalidate_days = revalidate_days or DOMAIN_SELECTOR_REVALIDATE_DAYS
+        self._entries = None
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = get_domain_selectors()
+
+    def _due_for_validation(self, entry):
+        if entry['pages_since_validation'] >= self.revalidate_every:
+            return True
+        try:
+            validated = datetime.datetime.strptime(entry['validated_at'], '%Y-%m-%d %H:%M:%S')
+        except (TypeError, ValueError):
+            return True
+        age = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) - validated
+        return age.days >= self.revalidate_days
+
+    def lookup(self, domain):
+        """Slot of the learned selector for domain, or None if unknown or due for re-validation."""
+        with self._lock:
+            self._load()
+            entry = self._entries.get(domain)
+            if entry is None or entry['selector'] not in _SELECTOR_SLOTS:
+                return None
+            self.lookups += 1
+            entry['pages_since_validation'] += 1
+            self._dirty.add(domain)
+            if self._due_for_validation(entry):
+                return None
+            return _SELECTOR_SLOTS[entry['selector']]
+
+    def record_hit(self, domain):
+        with self._lock:
+            self.hits += 1
+            self._entries[domain]['hits'] += 1
+
+    def learn(self, domain, slot, missed=False):
+        """Record the outcome of a full scan for domain.
+
+        slot is the selector that produced usable content (None if none did);
+        missed is True when the learned selector was tried first and failed.
+        """
+        with self._lock:
+            self._load()
+            entry = self._entries.get(domain)
+            if entry is None:
+                if slot is not None:
+                    self._entries[domain] = {
+                        'selector': _SELECTOR_NAMES[slot], 'hits': 0, 'misses': 0,
+                        'pages_since_validation': 0, 'validated_at': _utc_timestamp(),
+                    }
+                    self._dirty.add(domain)
+                return
+            if missed:
+                entry['misses'] += 1
+            else:
+                # Full scan run for re-validation
+                entry['pages_since_validation'] = 0
+                entry['validated_at'] = _utc_timestamp()
+            if slot is not None and _SELECTOR_NAMES[slot] != entry['selector']:
+                log_debug(f"Content selector for {domain} changed: {entry['selector']} -> {_SELECTOR_NAMES[slot]}")
+                entry['selector'] = _SELECTOR_NAMES[slot]
+            self._dirty.add(domain)
+
+    def save(self):
+        """Persist domains changed since the last save."""
+        with self._lock:
+            if not self._dirty:
+                return 0
+            changed = {domain: dict(self._entries[domain]) for domain in self._dirty}
+            self._dirty.clear()
+        return store_domain_selectors(changed)
+
+
+_selector_cache = None
+_selector_cache_lock = threading.Lock()
+
+
+def get_domain_selector_cache():
+    """Return the process-wide DomainSelectorCache (loaded lazily from the database)."""
+    global _selector_cache
+    if _selector_cache is None:
+        with _selector_cache_lock:
+            if _selector_cache is None:
+                _selector_cache = DomainSelectorCache()
+    return _selector_cache
+
+
+def save_domain_selectors():
+    """Persist learned selectors at the end of a fetch run and log how often they were used."""
+    if not DOMAIN_SELECTOR_CACHE_ENABLED or _selector_cache is None:
+        return
+    if _selector_cache.lookups:
+        log_debug(f"Learned content selectors used for {_selector_cache.hits}/{_selector_cache.lookups} pages from known domains")
+    _selector_cache.save()
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def html_to_text(html):
+    """Plain text of an HTML fragment (RSS content/summary), like BeautifulSoup's get_text(strip=True)."""
+    if not html:
+        return ""
+    if get_extraction_engine() == 'lxml':
+        try:
+            return ''.join(_lxml_strings(_parse_lxml(html)))
+        except (etree.ParserError, ValueError):
+            return ""
+    return BeautifulSoup(html, 'html.parser').get_text(strip=True)
+
+
+def _find_first(doc, slot):
+    """First element in a parsed document matching one selector, or None."""
+    name, cls, id_ = ARTICLE_SELECTORS[slot]
+    if get_extraction_engine() == 'lxml':
+        for el in doc.iter(name):
+            if _selector_slot(name, (el.get('class') or '').split(), el.get('id'), (slot,)) is not None:
+                return el
+        return None
+    if cls:
+        return doc.find(name, class_=cls)
+    if id_:
+        return doc.find(name, id=id_)
+    return doc.find(name)
+
+
+def _body_text(el):
+    if get_extraction_engine() == 'lxml':
+        return '\n'.join(_lxml_strings(el))
+    return el.get_text(separator='\n', strip=True)
+
+
+def _extract_body(html, learned=None):
+    """Parse a page and find its body text; runs in-process or in a parse worker process.
+
+    Tries the learned selector slot first. Returns (text, outcome, slot):
+    outcome is 'hit' when the learned slot matched, 'scan' after a full
+    selector scan (slot is then the winning selector, or None if its text is
+    too short), or None when the page could not be parsed.
+    """
+    if get_extraction_engine() == 'lxml':
+        try:
+            doc = _parse_lxml(html)
+        except (etree.ParserError, ValueError):
+            return None, None, None
+    else:
+        doc = BeautifulSoup(html, 'html.parser', parse_only=_BODY_STRAINER)
+
+    if learned is not None:
+        el = _find_first(doc, learned)
+        if el is not None:
+            text = _body_text(el)
+            if len(text) >= MIN_ARTICLE_LENGTH:
+                return text, 'hit', learned
+
+    if get_extraction_engine() == 'lxml':
+        found, _, _, _ = _scan_lxml(doc, PAGE_BODY_SELECTORS)
+    else:
+        found, _, _, _ = _scan_soup(doc, PAGE_BODY_SELECTORS)
+    winner = min(found) if found else None
+    text = _body_text(found[winner]) if found else None
+    useful = winner if text and len(text) >= MIN_ARTICLE_LENGTH else None
+    return text, 'scan', useful
+
+
+def create_parse_executor():
+    """Process pool for page extraction in the fetch phase, or None to parse in the calling thread.
+
+    Sized by HTML_PARSE_PROCESSES (None = CPU count, 0 = disabled). Workers
+    are spawned rather than forked because the fetch threads are already
+    running when the first page is submitted.
+    """
+    if HTML_PARSE_PROCESSES is None:
+        workers = os.cpu_count() or 1
+        if workers < 2:
+            return None  # A single core gains nothing from the extra processes
+    else:
+        workers = HTML_PARSE_PROCESSES
+    if workers <= 0:
+        return None
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+def extract_page_body(html, url=None, executor=None):
+    """Extract the main article text from a downloaded page, or None if no body container is found.
+
+    When url is given, the selector learned for its domain is tried before
+    the full selector scan (see DomainSelectorCache). With an executor from
+    create_parse_executor(), parsing runs in a worker process: only the page
+    bytes and the extracted text cross the process boundary, while the
+    selector cache stays in this process.
+    """
+    cache = get_domain_selector_cache() if url and DOMAIN_SELECTOR_CACHE_ENABLED else None
+    domain = _selector_domain(url) if cache else None
+    learned = cache.lookup(domain) if cache else None
+
+    if executor is not None:
+        try:
+            text, outcome, slot = executor.submit(_extract_body, html, learned).result()
+        except BrokenExecutor:
+            # Worker processes unavailable (e.g. killed); parse here instead
+            text, outcome, slot = _extract_body(html, learned)
+    else:
+        text, outcome, slot = _extract_body(html, learned)
+
+    if cache and outcome == 'hit':
+        cache.record_hit(domain)
+    elif cache and outcome == 'scan':
+        cache.learn(domain, slot, missed=learned is not None)
+    return text
+
+
+def extract_article(html):
+    """Extract (title, content) from a full article page.
+
+    The title is the first <h1>, else <title>, else None. Content is taken from
+    the ARTICLE_SELECTORS in order, stopping at the first one longer than
+    MIN_ARTICLE_LENGTH; if all are shorter, all <p> text is joined instead.
+    """
+    all_selectors = range(len(ARTICLE_SELECTORS))
+    if get_extraction_engine() == 'lxml':
+        try:
+            found, first_h1, first_title, paragraphs = _scan_lxml(
+                _parse_lxml(html), all_selectors, want_title=True, want_paragraphs=True
+            )
+        except (etree.ParserError, ValueError):
+            return None, ""
+        title_el = first_h1 if first_h1 is not None else first_title
+        title = ''.join(_lxml_strings(title_el)) if title_el is not None else None
+        text_of = lambda el, sep: sep.join(_lxml_strings(el))
+    else:
+        soup = BeautifulSoup(html, 'html.parser', parse_only=_ARTICLE_STRAINER)
+        found, first_h1, first_title, paragraphs = _scan_soup(soup, all_selectors, want_paragraphs=True)
+        title_el = first_h1 if first_h1 is not None else first_title
+        title = title_el.get_text(strip=True) if title_el is not None else None
+        text_of = lambda el, sep: el.get_text(separator=sep, strip=True)
+
+    content = ""
+    for slot in sorted(found):
+        content = text_of(found[slot], '\n')
+        if len(content) > MIN_ARTICLE_LENGTH:
+            break
+
+    # Fallback: get all paragraph text
+    if len(content) < MIN_ARTICLE_LENGTH:
+        content = '\n'.join(text_of(p, '') for p in paragraphs)
+    return title, content
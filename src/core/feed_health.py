@@ -0,0 +1,162 @@
+# feed_health.py
+"""
+Per-feed health tracking for RSS polling.
+
+Every poll records the feed's latency, HTTP status, entry count and number of
+entries not seen before in the feed_health table. The fetchers use that
+history to:
+
+- skip feeds that keep failing: after FEED_MAX_CONSECUTIVE_FAILURES failed
+  polls in a row, a feed is skipped for FEED_FAILURE_BACKOFF_HOURS, doubling
+  with every further failure up to FEED_FAILURE_BACKOFF_MAX_HOURS;
+- poll low-yield feeds less often: yield is measured as new entries per hour
+  between polls that return the feed (304 Not Modified polls add no sample and
+  leave the clock running). Once a feed has FEED_HEALTH_MIN_POLLS such polls
+  and averages fewer than FEED_LOW_YIELD_PER_HOUR new entries per hour, it is
+  polled at most every FEED_LOW_YIELD_INTERVAL_HOURS.
+
+`python main.py --feed-health` reports the slowest and least productive sources.
+"""
+
+import datetime
+import threading
+
+from src import config
+from src.config import (
+    FEED_HEALTH_ENABLED, FEED_MAX_CONSECUTIVE_FAILURES, FEED_FAILURE_BACKOFF_HOURS,
+    FEED_FAILURE_BACKOFF_MAX_HOURS, FEED_LOW_YIELD_PER_HOUR, FEED_LOW_YIELD_INTERVAL_HOURS,
+    FEED_HEALTH_MIN_POLLS,
+)
+from src.utils.db_utils import get_feed_health, store_feed_health
+from src.utils.logging_utils import log_info, log_debug
+
+_EWMA_WEIGHT = 0.3  # Weight of the latest poll in the running latency/yield-per-poll averages
+_YIELD_WINDOW_HOURS = 72  # Hours covered by a yield sample for it to replace the average outright
+_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'  # Same as SQLite's CURRENT_TIMESTAMP (UTC)
+
+
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+def _ewma(previous, value, weight=_EWMA_WEIGHT):
+    return value if previous is None else previous + weight * (value - previous)
+
+
+def _error_status(error):
+    """HTTP status carried by a requests/aiohttp error, if any."""
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    return status if status is not None else getattr(error, 'status', None)
+
+
+class FeedHealthTracker:
+    """Collects poll results for one fetch run and decides which feeds are due.
+
+    Thread-safe; record_poll() may be called from feed polling workers.
+    Call save() once polling is done.
+    """
+
+    def __init__(self):
+        self.enabled = FEED_HEALTH_ENABLED
+        self.health = get_feed_health() if self.enabled else {}
+        self._updated = {}
+        self._lock = threading.Lock()
+
+    def feeds_to_poll(self, feeds):
+        """Return the feeds that are due this run, logging the ones skipped."""
+        # Read at call time so main.py can set it from --all-feeds
+        if not self.enabled or config.FEED_HEALTH_POLL_ALL:
+            return list(feeds)
+        now = _now().strftime(_TIMESTAMP_FORMAT)
+        due, failing, low_yield = [], [], []
+        for feed_url in feeds:
+            row = self.health.get(feed_url)
+            if row and row.get('next_poll_at') and row['next_poll_at'] > now:
+                if (row.get('consecutive_failures') or 0) >= FEED_MAX_CONSECUTIVE_FAILURES:
+                    failing.append(feed_url)
+                else:
+                    low_yield.append(feed_url)
+                log_debug(f"Skipping feed {feed_url} until {row['next_poll_at']} UTC")
+                continue
+            due.append(feed_url)
+        if failing or low_yield:
+            log_info(
+                f"Skipping {len(failing) + len(low_yield)} of {len(feeds)} feeds until their next poll is due "
+                f"({len(failing)} failing, {len(low_yield)} low-yield); use --all-feeds to poll them anyway"
+            )
+        return due
+
+    def record_poll(self, feed_url, latency, feed=None, new_entries=0, error=None):
+        """Record one poll: either the parsed feed (status 200/304) or the error that occurred."""
+        if not self.enabled:
+            return
+        if error is None and feed is not None and feed.get('status') != 304 and not feed.entries and feed.get('bozo'):
+            # Parsed nothing from a malformed document (HTML error page, dead feed)
+            error = feed.get('bozo_exception') or 'malformed feed'
+        now = _now()
+        with self._lock:
+            previous = self._updated.get(feed_url) or self.health.get(feed_url) or {}
+            row = dict(previous, feed_url=feed_url)
+            row['last_polled_at'] = now.strftime(_TIMESTAMP_FORMAT)
+            row['last_latency_ms'] = int(latency * 1000)
+            row['avg_latency_ms'] = _ewma(previous.get('avg_latency_ms'), latency * 1000)
+            row['total_polls'] = (previous.get('total_polls') or 0) + 1
+            if error is not None:
+                failures = (previous.get('consecutive_failures') or 0) + 1
+                row['last_status'] = _error_status(error) or (feed.get('status') if feed is not None else None)
+                row['last_error'] = str(error)[:300]
+                row['consecutive_failures'] = failures
+                row['total_failures'] = (previous.get('total_failures') or 0) + 1
+                row['next_poll_at'] = None
+                if failures >= FEED_MAX_CONSECUTIVE_FAILURES:
+                    hours = min(
+                        FEED_FAILURE_BACKOFF_HOURS * 2 ** (failures - FEED_MAX_CONSECUTIVE_FAILURES),
+                        FEED_FAILURE_BACKOFF_MAX_HOURS,
+                    )
+                    row['next_poll_at'] = (now + datetime.timedelta(hours=hours)).strftime(_TIMESTAMP_FORMAT)
+            else:
+                row['last_status'] = feed.get('status')
+                row['last_error'] = None
+                row['consecutive_failures'] = 0
+                if feed.get('status') != 304:
+                    row['last_entry_count'] = len(feed.entries)
+                row['last_new_entries'] = new_entries
+                row['avg_new_entries'] = _ewma(previous.get('avg_new_entries'), new_entries)
+                if feed.get('status') != 304:
+                    self._record_yield(row, previous, now, new_entries)
+                row['next_poll_at'] = None
+                if (row.get('yield_polls') or 0) >= FEED_HEALTH_MIN_POLLS and \
+                        row.get('avg_new_per_hour') is not None and row['avg_new_per_hour'] < FEED_LOW_YIELD_PER_HOUR:
+                    row['next_poll_at'] = (
+                        now + datetime.timedelta(hours=FEED_LOW_YIELD_INTERVAL_HOURS)
+                    ).strftime(_TIMESTAMP_FORMAT)
+            self._updated[feed_url] = row
+
+    @staticmethod
+    def _record_yield(row, previous, now, new_entries):
+        """Add a new-entries-per-hour sample covering the time since the feed last returned content.
+
+        Each sample is weighted by the hours it covers, so a run of short
+        daemon-cycle polls counts for as much as one poll a day apart.
+        """
+        row['last_content_at'] = now.strftime(_TIMESTAMP_FORMAT)
+        if not previous.get('last_content_at'):
+            return  # First content poll: nothing to measure the interval from
+        since = datetime.datetime.strptime(previous['last_content_at'], _TIMESTAMP_FORMAT)
+        hours = (now - since).total_seconds() / 3600
+        if hours <= 0:
+            return
+        row['avg_new_per_hour'] = _ewma(
+            previous.get('avg_new_per_hour'), new_entries / hours, min(1.0, hours / _YIELD_WINDOW_HOURS)
+        )
+        row['yield_polls'] = (previous.get('yield_polls') or 0) + 1
+
+    def save(self):
+        """Persist the rows updated during this run."""
+        with self._lock:
+            rows = list(self._updated.values())
+            self._updated.clear()
+        for row in rows:
+            self.health[row['feed_url']] = row
+        return store_feed_health(rows)
@@ -1,14 +1,31 @@
 # fetcher.py
 import feedparser
 import requests
+from requests.adapters import HTTPAdapter
 import random
-import socket
+import sqlite3
 import sys
 import datetime
+import threading
+import time
+from collections import Counter
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup
-from src.config import RSS_FEEDS, MIN_ARTICLE_LENGTH, FETCH_TIMEOUT, SOCKET_TIMEOUT, THREADS_FETCH, ENABLE_PHASED_MULTITHREADING
+from src.config import (
+    RSS_FEEDS, MIN_ARTICLE_LENGTH, FETCH_TIMEOUT, SOCKET_TIMEOUT, THREADS_FETCH, THREADS_FEEDS,
+    ENABLE_PHASED_MULTITHREADING, FEED_CACHE_ENABLED, FEED_CACHE_MAX_ENTRY_RETRIES, FETCH_MAX_CONNECTIONS_PER_HOST,
+    FETCH_MAX_RETRIES,
+    RSS_PRESCREEN_ENABLED, FETCH_MAX_PAGE_BYTES, FETCH_PAGE_CONTENT_TYPES,
+)
+from src.core.extraction import (
+    extract_article, extract_page_body, html_to_text, save_domain_selectors, create_parse_executor,
+)
+from src.core.feed_health import FeedHealthTracker
+from src.core.filtering import prescreen_entry
+from src.core.politeness import get_host_scheduler, HostCircuitOpenError
+from src.utils.db_utils import get_feed_cache, store_feed_cache, find_stored_canonical_urls, record_fetch_failures
+from src.utils.html_store import store_html, evict_html_store
 from src.utils.logging_utils import log_info, log_success, log_warn, log_error, BColors, log_debug
+from src.utils.url_utils import canonicalize_url, entry_article_url
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 USER_AGENTS = [
@@ -17,51 +34,172 @@ USER_AGENTS = [
     'Mozilla/50.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Firefox/109.0 Safari/537.36',
 ]
 
+_PAGE_CHUNK_BYTES = 64 * 1024
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_http_session():
+    """Return the process-wide pooled HTTP session used for feeds and article pages.
+
+    A single requests.Session is shared by all fetch threads so keep-alive
+    connections (and TLS sessions) are reused across articles from the same
+    host. urllib3's pool manager is thread-safe; with pool_block=True each host
+    is limited to FETCH_MAX_CONNECTIONS_PER_HOST concurrent connections and
+    extra threads wait for a free connection instead of opening new ones.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=max(THREADS_FETCH, THREADS_FEEDS, len(RSS_FEEDS)),
+                    pool_maxsize=FETCH_MAX_CONNECTIONS_PER_HOST,
+                    pool_block=True,
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers.update({'Accept-Encoding': 'gzip, deflate'})
+                _session = session
+    return _session
+
+def polite_get(url, **kwargs):
+    """GET through the shared session, paced by the per-host politeness scheduler.
+
+    429/5xx responses are retried up to FETCH_MAX_RETRIES times after the
+    host's backoff (or Retry-After) has elapsed; the last response is returned
+    as-is so callers still see the final status. Raises HostCircuitOpenError
+    without touching the network when the host's circuit breaker is open.
+    """
+    scheduler = get_host_scheduler()
+    for attempt in range(FETCH_MAX_RETRIES + 1):
+        delay = scheduler.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+        try:
+            response = get_http_session().get(url, **kwargs)
+        except requests.RequestException:
+            scheduler.record_failure(url)
+            raise
+        scheduler.record_response(url, response.status_code, response.headers.get('Retry-After'))
+        if not scheduler.is_retryable(response.status_code) or attempt == FETCH_MAX_RETRIES:
+            return response
+        response.close()
+        log_debug(f"HTTP {response.status_code} from {urlparse(url).netloc}; retrying ({attempt + 1}/{FETCH_MAX_RETRIES})")
+
+class PageRejectedError(Exception):
+    """Raised when an article page is not downloaded (not HTML/XML, or over FETCH_MAX_PAGE_BYTES)."""
+
+    def __init__(self, outcome, message):
+        super().__init__(message)
+        self.outcome = outcome  # 'not_html' or 'too_large'
+
+def check_page_headers(url, content_type, content_length):
+    """Raise PageRejectedError when the response headers already rule the page out."""
+    media_type = (content_type or '').split(';')[0].strip().lower()
+    # A missing Content-Type is let through; the extractor copes with whatever arrives
+    if media_type and media_type not in FETCH_PAGE_CONTENT_TYPES and not media_type.endswith('+xml'):
+        raise PageRejectedError('not_html', f"{url} is {media_type}, not HTML")
+    try:
+        length = int(content_length) if content_length else 0
+    except ValueError:
+        length = 0
+    if length > FETCH_MAX_PAGE_BYTES:
+        raise PageRejectedError('too_large', f"{url} is {length} bytes (limit {FETCH_MAX_PAGE_BYTES})")
+
+def download_page(url, polite=True):
+    """Stream an article page; returns (body bytes, Content-Type).
+
+    The body is read in chunks and the download is abandoned as soon as it
+    passes FETCH_MAX_PAGE_BYTES, so a fetch thread never holds more than that
+    much page data however large the resource is. Responses that are not
+    HTML/XML are closed before their body is read. Raises PageRejectedError,
+    requests.RequestException or HostCircuitOpenError.
+    """
+    headers = {'User-Agent': random.choice(USER_AGENTS)}
+    get = polite_get if polite else get_http_session().get
+    response = get(url, headers=headers, timeout=FETCH_TIMEOUT, stream=True)
+    try:
+        response.raise_for_status()
+        content_type = response.headers.get('Content-Type')
+        check_page_headers(url, content_type, response.headers.get('Content-Length'))
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=_PAGE_CHUNK_BYTES):
+            size += len(chunk)
+            if size > FETCH_MAX_PAGE_BYTES:
+                raise PageRejectedError('too_large', f"{url} exceeds {FETCH_MAX_PAGE_BYTES} bytes")
+            chunks.append(chunk)
+        return b''.join(chunks), content_type
+    finally:
+        # Unread (rejected) bodies are not drained; the connection is dropped instead
+        response.close()
+
+def fetch_outcome(error):
+    """FetchStats outcome for an exception raised while fetching an article page."""
+    if isinstance(error, PageRejectedError):
+        return error.outcome
+    if isinstance(error, HostCircuitOpenError):
+        return 'host_skipped'
+    if isinstance(error, requests.HTTPError):
+        return 'http_error'
+    return 'error'
+
+class FetchStats:
+    """Per-run tally of article outcomes, shared by the fetch workers (thread-safe)."""
+
+    LABELS = (
+        ('feed', 'from feed text'),
+        ('page', 'scraped'),
+        ('no_body', 'no article text on page'),
+        ('too_large', 'too large'),
+        ('not_html', 'not HTML'),
+        ('http_error', 'HTTP errors'),
+        ('host_skipped', 'host skipped'),
+        ('error', 'failed'),
+    )
+
+    def __init__(self):
+        self.counts = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, outcome):
+        with self._lock:
+            self.counts[outcome] += 1
+
+    def log_summary(self):
+        parts = [f"{self.counts[key]} {label}" for key, label in self.LABELS if self.counts[key]]
+        if parts:
+            log_info(f"Article outcomes: {', '.join(parts)} (page limit {FETCH_MAX_PAGE_BYTES // 1024} KB)")
+
+def log_host_politeness_summary():
+    """Warn about hosts that throttled, blocked or failed during this run."""
+    for host, stats in sorted(get_host_scheduler().summary().items()):
+        details = []
+        if stats['throttled']:
+            details.append(f"429: {stats['throttled']}")
+        if stats['server_errors']:
+            details.append(f"5xx: {stats['server_errors']}")
+        if stats['blocked']:
+            details.append(f"401/403: {stats['blocked']}")
+        if stats['skipped']:
+            details.append(f"skipped: {stats['skipped']}")
+        state = " (circuit open)" if stats['circuit_open'] else ""
+        log_warn(f"Host {host}{state} — {', '.join(details)} of {stats['requests']} requests")
+
 def fetch_single_article(url):
     """Fetch and scrape a single article from a URL"""
     log_info(f"Fetching article from: {url}")
     
     try:
-        headers = {'User-Agent': random.choice(USER_AGENTS)}
-        response = requests.get(url, headers=headers, timeout=FETCH_TIMEOUT)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
+        body, content_type = download_page(url, polite=False)
+        store_html(url, body, content_type)
         
-        # Try to extract title
-        title = None
-        if soup.find('h1'):
-            title = soup.find('h1').get_text(strip=True)
-        elif soup.find('title'):
-            title = soup.find('title').get_text(strip=True)
-        else:
+        title, content = extract_article(body)
+        if title is None:
             title = url.split('/')[-1].replace('-', ' ').title()
         
-        # Try to extract article content
-        content = ""
-        
-        # Try common article selectors
-        article_selectors = [
-            soup.find('article'),
-            soup.find('div', class_='article-body'),
-            soup.find('div', class_='article-content'),
-            soup.find('div', class_='post-content'),
-            soup.find('div', class_='entry-content'),
-            soup.find('div', {'id': 'article-body'}),
-            soup.find('main'),
-        ]
-        
-        for selector in article_selectors:
-            if selector:
-                content = selector.get_text(separator='\n', strip=True)
-                if len(content) > MIN_ARTICLE_LENGTH:
-                    break
-        
-        # Fallback: get all paragraph text
-        if len(content) < MIN_ARTICLE_LENGTH:
-            paragraphs = soup.find_all('p')
-            content = '\n'.join([p.get_text(strip=True) for p in paragraphs])
-        
         article_data = {
             'title': title,
             'url': url,
@@ -74,14 +212,213 @@ def fetch_single_article(url):
         
         return article_data
         
-    except requests.RequestException as e:
+    except (requests.RequestException, PageRejectedError) as e:
         log_error(f"Failed to fetch article from {url}: {e}")
         return None
     except Exception as e:
         log_error(f"Error processing article from {url}: {e}")
         return None
 
-def fetch_and_scrape_articles_sequential(existing_urls, start_date, end_date):
+def _fetch_feed(feed_url, cached=None):
+    """Download and parse a single RSS feed with a per-request timeout.
+
+    The feed body is retrieved with requests (so the timeout applies to this
+    request only) and handed to feedparser as bytes. This avoids toggling the
+    process-global socket timeout, which is not safe once feeds are polled
+    from several threads.
+
+    When cached validators are given, the request is made conditional
+    (If-None-Match / If-Modified-Since). A 304 response is returned as an
+    empty result with status 304 without invoking the parser at all.
+    """
+    headers = {'User-Agent': random.choice(USER_AGENTS)}
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+    response = polite_get(feed_url, headers=headers, timeout=SOCKET_TIMEOUT)
+    if response.status_code == 304:
+        return feedparser.FeedParserDict(entries=[], status=304)
+    response.raise_for_status()
+    feed = feedparser.parse(response.content, response_headers={
+        'content-location': response.url,
+        'content-type': response.headers.get('Content-Type', ''),
+    })
+    feed['status'] = response.status_code
+    feed['etag'] = response.headers.get('ETag')
+    feed['modified'] = response.headers.get('Last-Modified')
+    return feed
+
+def _timed_fetch_feed(feed_url, cached=None):
+    """_fetch_feed that returns (feed, error, latency_seconds) instead of raising, so failures keep their latency."""
+    started = time.monotonic()
+    try:
+        return _fetch_feed(feed_url, cached), None, time.monotonic() - started
+    except Exception as e:
+        return None, e, time.monotonic() - started
+
+def _usable_feed_cache(feed_cache, feed_url, start_date):
+    """Return the cached state for a feed if it may be used for a conditional GET.
+
+    A 304 means "same entries as last poll", which is only safe to skip when the
+    last poll already covered this fetch window (e.g. not for a wider -t backfill).
+    """
+    cached = feed_cache.get(feed_url)
+    if not cached or not cached.get('window_start'):
+        return None
+    if cached['window_start'] > start_date.isoformat():
+        return None
+    return cached
+
+def _entry_guid(entry):
+    """Stable identifier for a feed entry (RSS guid / Atom id, falling back to the link)."""
+    return entry.get('id') or entry.get('link')
+
+def _feed_cache_state(feed, cached, start_date):
+    """Build the cache row to persist for a feed after polling it."""
+    if feed.get('status') == 304:
+        return cached
+    return {
+        'etag': feed.get('etag'),
+        'last_modified': feed.get('modified'),
+        'seen_guids': {g for g in (_entry_guid(e) for e in feed.entries) if g},
+        'window_start': start_date.isoformat(),
+    }
+
+class FeedCacheUpdate:
+    """Feed cache rows from one run, saved only once the run has dealt with the feeds' entries.
+
+    A 304 skips every entry of a feed, so new validators may only be stored
+    when each entry the run took from that feed ended up stored or was judged
+    not relevant. Entries cut by -n, lost to analysis failures, or never
+    reached because the run crashed are fetched again next run; their feeds
+    keep the previous cache row until then.
+
+    Pages that could not be downloaded are settled too, or a single blocked
+    link would make its feed download in full on every poll. Rejected pages
+    (not HTML, too large, no article text) are settled at once; other
+    failures (HTTP errors, skipped hosts, connection errors) once they have
+    failed in FEED_CACHE_MAX_ENTRY_RETRIES runs.
+    """
+
+    PERMANENT_OUTCOMES = ('not_html', 'too_large', 'no_body')
+
+    def __init__(self):
+        self._states = {}
+        self._entry_urls = {}
+        self._failures = {}
+        self._lock = threading.Lock()
+
+    def add(self, feed_url, state, entries=()):
+        """Record a polled feed's new cache row and the (entry, published_date) pairs taken from it."""
+        self._states[feed_url] = state
+        self._entry_urls[feed_url] = {canonicalize_url(entry.link) for entry, _ in entries}
+
+    def record_fetch(self, url, outcome):
+        """Note an article page's FetchStats outcome (called from the fetch workers)."""
+        if outcome not in ('feed', 'page'):
+            with self._lock:
+                self._failures[canonicalize_url(url)] = outcome
+
+    def save(self, settled_urls=()):
+        """Store the rows of feeds whose entries are all settled.
+
+        An entry is settled when it is in the database, in settled_urls
+        (article URLs handled without being stored: judged not relevant) or
+        its page failed to download (see the class docstring). Returns the
+        number of feeds held back.
+        """
+        if not FEED_CACHE_ENABLED or not self._states:
+            return 0
+        settled = {canonicalize_url(url) for url in settled_urls}
+        pending = set().union(*self._entry_urls.values()) - settled
+        try:
+            settled |= find_stored_canonical_urls(pending)
+        except sqlite3.Error:
+            pass  # Logged; feeds with entries not settled otherwise keep their previous row
+        failed = {url: self._failures[url] for url in pending - settled if url in self._failures}
+        settled |= {url for url, outcome in failed.items() if outcome in self.PERMANENT_OUTCOMES}
+        retried = {url: outcome for url, outcome in failed.items() if outcome not in self.PERMANENT_OUTCOMES}
+        attempts = record_fetch_failures(retried)
+        settled |= {url for url, count in attempts.items() if count >= FEED_CACHE_MAX_ENTRY_RETRIES}
+        ready = {url: state for url, state in self._states.items() if self._entry_urls[url] <= settled}
+        store_feed_cache(ready)
+        held_back = len(self._states) - len(ready)
+        if held_back:
+            log_info(f"Feed cache not updated for {held_back} feeds with unprocessed entries; they are fetched in full next run")
+        return held_back
+
+def _entry_published_date(entry):
+    """Return the entry's publication date, defaulting to today when missing/unparseable."""
+    try:
+        published = entry.published_parsed
+        return datetime.date(*published[:3]) if published else datetime.date.today()
+    except Exception:
+        return datetime.date.today()
+
+def _tally_feed_entries(feed, existing_urls, start_date, end_date, seen_urls=None):
+    """Split a parsed feed's entries into new in-range entries and skip counts.
+
+    Returns (in_range, dupes, outside_range, screened_out) where in_range is a
+    list of (entry, published_date) tuples for entries not already stored.
+    With RSS_PRESCREEN_ENABLED, entries whose title and feed summary are
+    clearly off-topic are dropped here (screened_out) so their pages are
+    never fetched.
+    Entries are compared by canonical URL. With existing_urls=None, stored
+    articles are found with one indexed batch query per feed instead of a
+    preloaded set; sqlite3.Error from that lookup propagates, and callers
+    skip the feed for this run. seen_urls collects the canonical URLs taken so far in this
+    run, so the same article syndicated by several feeds is fetched once.
+    """
+    candidates = []
+    for entry in feed.entries:
+        link = entry_article_url(entry)
+        if not link:
+            continue
+        # FeedBurner entries link to a redirector; fetch and store the original article URL
+        entry['link'] = link
+        candidates.append((entry, canonicalize_url(link)))
+    if existing_urls is None:
+        stored = find_stored_canonical_urls({canonical for _, canonical in candidates})
+    else:
+        stored = existing_urls
+
+    in_range = []
+    dupes = 0
+    outside_range = 0
+    screened_out = 0
+    seen_urls = set() if seen_urls is None else seen_urls
+    for entry, canonical in candidates:
+        # Skip duplicates immediately
+        if canonical in stored or entry.link in stored or canonical in seen_urls:
+            dupes += 1
+            continue
+        published_date = _entry_published_date(entry)
+        if not start_date <= published_date <= end_date:
+            outside_range += 1
+            continue
+        seen_urls.add(canonical)
+        if RSS_PRESCREEN_ENABLED and prescreen_entry(entry.get('title'), _entry_feed_text(entry)) is False:
+            log_debug(f"Screened out: {entry.get('title', '')[:80]}")
+            screened_out += 1
+            continue
+        in_range.append((entry, published_date))
+    return in_range, dupes, outside_range, screened_out
+
+def fetch_and_scrape_articles_sequential(existing_urls, start_date, end_date, on_article=None, feed_cache_update=None):
+    """Fetch new articles from all feeds one at a time.
+
+    existing_urls=None checks each feed's entries against the database
+    (see _tally_feed_entries) instead of a preloaded set of stored URLs.
+    on_article, if given, is called with each article as soon as it is scraped
+    (used by the streaming pipeline; a blocking callback pauses fetching).
+    Articles handed to on_article are not collected, so an empty list is
+    returned and memory does not grow with the number of articles.
+    The polled feeds' cache rows go to feed_cache_update (a FeedCacheUpdate),
+    for the caller to save once the articles are stored; without it the feed
+    cache is used but not updated.
+    """
     all_articles = []
     log_info(f"Searching for new articles from {len(RSS_FEEDS)} sources for {start_date} to {end_date} ({(end_date - start_date).days + 1} days)...")
     
@@ -89,7 +426,11 @@ def fetch_and_scrape_articles_sequential(existing_urls, start_date, end_date):
     all_entries = []
     skipped_duplicates = 0
     skipped_outside_range = 0
-    total_sources = len(RSS_FEEDS)
+    skipped_screened = 0
+    seen_urls = set()
+    feed_health = FeedHealthTracker()
+    feeds_to_poll = feed_health.feeds_to_poll(RSS_FEEDS)
+    total_sources = len(feeds_to_poll)
     checked_sources = 0
 
     def print_sources_progress(current, total, msg=None):
@@ -108,47 +449,59 @@ def fetch_and_scrape_articles_sequential(existing_urls, start_date, end_date):
     if total_sources:
         print_sources_progress(0, total_sources)
 
-    for idx, feed_url in enumerate(RSS_FEEDS, start=1):
+    feed_cache = get_feed_cache() if FEED_CACHE_ENABLED else {}
+    feed_cache_update = FeedCacheUpdate() if feed_cache_update is None else feed_cache_update
+
+    for idx, feed_url in enumerate(feeds_to_poll, start=1):
+        latency = 0.0
         try:
-            socket.setdefaulttimeout(SOCKET_TIMEOUT)
-            feed = feedparser.parse(feed_url)
-            socket.setdefaulttimeout(None)
+            cached = _usable_feed_cache(feed_cache, feed_url, start_date)
+            feed, error, latency = _timed_fetch_feed(feed_url, cached)
+            if error is not None:
+                raise error
             host = urlparse(feed_url).netloc or feed_url
-            in_range_this = 0
-            dupes_this = 0
-            
-            for entry in feed.entries:
-                # Skip duplicates immediately
-                if entry.link in existing_urls:
-                    skipped_duplicates += 1
-                    dupes_this += 1
-                    continue
-                
-                # Check date
-                try:
-                    published_date = entry.published_parsed
-                    import datetime
-                    published_date = datetime.date(*published_date[:3]) if published_date else datetime.date.today()
-                except Exception:
-                    import datetime
-                    published_date = datetime.date.today()
-                
-                if start_date <= published_date <= end_date:
-                    all_entries.append((entry, published_date))
-                    in_range_this += 1
-                else:
-                    skipped_outside_range += 1
+            feed_state = _feed_cache_state(feed, cached, start_date)
+            if feed.get('status') == 304:
+                feed_cache_update.add(feed_url, feed_state)
+                feed_health.record_poll(feed_url, latency, feed)
+                checked_sources += 1
+                print_sources_progress(
+                    checked_sources,
+                    total_sources,
+                    msg=f"{BColors.OKCYAN}[SOURCE]{BColors.ENDC} {host} — not modified since last poll"
+                )
+                continue
+            seen_before = feed_cache.get(feed_url, {}).get('seen_guids', set())
+            new_this = sum(1 for e in feed.entries if _entry_guid(e) not in seen_before)
+            feed_health.record_poll(feed_url, latency, feed, new_entries=new_this)
+            in_range, dupes_this, outside_this, screened_this = _tally_feed_entries(feed, existing_urls, start_date, end_date, seen_urls)
+            feed_cache_update.add(feed_url, feed_state, in_range)
+            in_range_this = len(in_range)
+            all_entries.extend(in_range)
+            skipped_duplicates += dupes_this
+            skipped_outside_range += outside_this
+            skipped_screened += screened_this
 
             checked_sources += 1
             print_sources_progress(
                 checked_sources,
                 total_sources,
-                msg=f"{BColors.OKCYAN}[SOURCE]{BColors.ENDC} {host} — entries: {len(feed.entries)} | in-range: {in_range_this} | dupes: {dupes_this}"
+                msg=f"{BColors.OKCYAN}[SOURCE]{BColors.ENDC} {host} — entries: {len(feed.entries)} | new: {new_this} | in-range: {in_range_this} | dupes: {dupes_this}"
             )
                     
-        except (socket.timeout, Exception) as e:
+        except sqlite3.Error as e:
+            # Stored articles could not be looked up: skip the feed rather than treat every entry as new
+            log_warn(f"Skipping feed {feed_url} this run: {e}")
+            checked_sources += 1
+            host = urlparse(feed_url).netloc or feed_url
+            print_sources_progress(
+                checked_sources,
+                total_sources,
+                msg=f"{BColors.OKCYAN}[SOURCE]{BColors.ENDC} {host} — error: stored-article lookup failed"
+            )
+        except Exception as e:
             log_warn(f"Could not process feed {feed_url}: {e}")
-            socket.setdefaulttimeout(None)
+            feed_health.record_poll(feed_url, latency, error=e)
             checked_sources += 1
             host = urlparse(feed_url).netloc or feed_url
             print_sources_progress(
@@ -159,7 +512,8 @@ def fetch_and_scrape_articles_sequential(existing_urls, start_date, end_date):
     
     sys.stdout.write('\n')
     sys.stdout.flush()
-    log_info(f"Found {len(all_entries)} new articles (skipped {skipped_duplicates} duplicates, {skipped_outside_range} outside date range)")
+    feed_health.save()
+    log_info(f"Found {len(all_entries)} new articles (skipped {skipped_duplicates} duplicates, {skipped_outside_range} outside date range, {skipped_screened} off-topic)")
     
     # Second pass: fetch and scrape only new articles
     processed_articles = 0
@@ -180,69 +534,101 @@ def fetch_and_scrape_articles_sequential(existing_urls, start_date, end_date):
         print_progress_bar(0, len(all_entries), "Fetching Articles")
     
     status_messages = []
+    fetch_stats = FetchStats()
     for entry, published_date in all_entries:
         status_messages.append(f"{BColors.OKCYAN}[NEW]{BColors.ENDC} Fetched: {entry.title}")
         article_data = {'title': entry.title, 'url': entry.link, 'published_date': published_date.isoformat(), 'content': ""}
         
-        if hasattr(entry, 'content') and entry.content:
-            article_data['content'] = BeautifulSoup(entry.content[0].value, 'html.parser').get_text(strip=True)
-        elif hasattr(entry, 'summary'):
-            article_data['content'] = BeautifulSoup(entry.summary, 'html.parser').get_text(strip=True)
+        article_data['content'] = _entry_feed_text(entry)
         
+        outcome = 'feed'
         if len(article_data['content']) < MIN_ARTICLE_LENGTH:
             try:
-                headers = {'User-Agent': random.choice(USER_AGENTS)}
-                response = requests.get(article_data['url'], headers=headers, timeout=FETCH_TIMEOUT)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.content, 'html.parser')
-                body = soup.find('article') or soup.find('div', class_='article-body')
-                if body:
-                    article_data['content'] = body.get_text(separator='\n', strip=True)
-            except requests.RequestException:
+                body, content_type = download_page(article_data['url'])
+                store_html(article_data['url'], body, content_type)
+                body_text = extract_page_body(body, url=article_data['url'])
+                outcome = 'page' if body_text else 'no_body'
+                if body_text:
+                    article_data['content'] = body_text
+            except (requests.RequestException, HostCircuitOpenError, PageRejectedError) as e:
+                outcome = fetch_outcome(e)
                 article_data['content'] = None
+        fetch_stats.record(outcome)
+        feed_cache_update.record_fetch(article_data['url'], outcome)
         
-        all_articles.append(article_data)
+        if on_article:
+            on_article(article_data)
+        else:
+            all_articles.append(article_data)
         processed_articles += 1
         print_progress_bar(processed_articles, len(all_entries), "Fetching Articles", status_messages)
         status_messages = []
         
     sys.stdout.write('\n')
     sys.stdout.flush()
-    log_success(f"Found a total of {len(all_articles)} new potential articles across all feeds.")
+    fetch_stats.log_summary()
+    log_host_politeness_summary()
+    evict_html_store()
+    save_domain_selectors()
+    log_success(f"Found a total of {processed_articles} new potential articles across all feeds.")
     return all_articles
 
-def _process_entry(entry, published_date):
-    """Build article data from an RSS entry and optionally fetch full content if too short."""
+def _entry_feed_text(entry):
+    """Plain text of the content/summary embedded in an RSS entry (may be empty)."""
+    if hasattr(entry, 'content') and entry.content:
+        return html_to_text(entry.content[0].value)
+    elif hasattr(entry, 'summary'):
+        return html_to_text(entry.summary)
+    return ""
+
+def _process_entry(entry, published_date, on_article=None, parse_executor=None, fetch_stats=None,
+                   feed_cache_update=None):
+    """Build article data from an RSS entry and optionally fetch full content if too short.
+
+    With parse_executor, the downloaded page is parsed in a worker process
+    while this thread moves on to waiting for the next download. The outcome
+    (feed text, scraped page, rejected page, failure) goes to fetch_stats and
+    feed_cache_update.
+    """
     article_data = {'title': entry.title, 'url': entry.link, 'published_date': published_date.isoformat(), 'content': ""}
     try:
         host = urlparse(entry.link).netloc
     except Exception:
         host = ''
     log_debug(f"Fetching: {entry.title[:80]}" + (f" [{host}]" if host else ""))
+    outcome = 'feed'
     try:
-        if hasattr(entry, 'content') and entry.content:
-            article_data['content'] = BeautifulSoup(entry.content[0].value, 'html.parser').get_text(strip=True)
-        elif hasattr(entry, 'summary'):
-            article_data['content'] = BeautifulSoup(entry.summary, 'html.parser').get_text(strip=True)
+        article_data['content'] = _entry_feed_text(entry)
 
         # If content is short, try fetching the page
         if len(article_data['content']) < MIN_ARTICLE_LENGTH:
-            headers = {'User-Agent': random.choice(USER_AGENTS)}
-            response = requests.get(article_data['url'], headers=headers, timeout=FETCH_TIMEOUT)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            body = soup.find('article') or soup.find('div', class_='article-body') or soup.find('div', class_='article-content') or soup.find('main')
-            if body:
-                article_data['content'] = body.get_text(separator='\n', strip=True)
-    except Exception:
+            body, content_type = download_page(article_data['url'])
+            store_html(article_data['url'], body, content_type)
+            body_text = extract_page_body(body, url=article_data['url'], executor=parse_executor)
+            outcome = 'page' if body_text else 'no_body'
+            if body_text:
+                article_data['content'] = body_text
+    except Exception as e:
         # On failure, keep whatever we had (may be empty)
-        pass
+        outcome = fetch_outcome(e)
+    if fetch_stats is not None:
+        fetch_stats.record(outcome)
+    if feed_cache_update is not None:
+        feed_cache_update.record_fetch(article_data['url'], outcome)
+    if on_article:
+        # Called on the worker thread so a full downstream queue holds this worker back
+        on_article(article_data)
     return article_data
 
-def fetch_and_scrape_articles_parallel(existing_urls, start_date, end_date, max_workers=None):
+def fetch_and_scrape_articles_parallel(existing_urls, start_date, end_date, max_workers=None, on_article=None,
+                                       feed_cache_update=None):
     """Parallel version of fetch_and_scrape_articles using threads per entry.
 
-    Phases remain: collect entries sequentially, then fetch/scrape entries concurrently.
+    Phases remain: collect entries from all feeds (polled concurrently, up to
+    THREADS_FEEDS at a time), then fetch/scrape entries concurrently.
+    on_article is called from the worker threads as each article is scraped;
+    those articles are not collected and an empty list is returned.
+    feed_cache_update is as for fetch_and_scrape_articles_sequential.
     """
     all_articles = []
     log_info(f"Searching for new articles from {len(RSS_FEEDS)} sources for {start_date} to {end_date} ({(end_date - start_date).days + 1} days)...")
@@ -251,7 +637,11 @@ def fetch_and_scrape_articles_parallel(existing_urls, start_date, end_date, max_
     all_entries = []
     skipped_duplicates = 0
     skipped_outside_range = 0
-    total_sources = len(RSS_FEEDS)
+    skipped_screened = 0
+    seen_urls = set()
+    feed_health = FeedHealthTracker()
+    feeds_to_poll = feed_health.feeds_to_poll(RSS_FEEDS)
+    total_sources = len(feeds_to_poll)
     checked_sources = 0
 
     def print_sources_progress(current, total, msg=None):
@@ -269,52 +659,74 @@ def fetch_and_scrape_articles_parallel(existing_urls, start_date, end_date, max_
     if total_sources:
         print_sources_progress(0, total_sources)
 
-    for idx, feed_url in enumerate(RSS_FEEDS, start=1):
-        try:
-            socket.setdefaulttimeout(SOCKET_TIMEOUT)
-            feed = feedparser.parse(feed_url)
-            socket.setdefaulttimeout(None)
+    # Poll feeds concurrently; results are tallied here on the main thread so the
+    # duplicate/date-range counters and progress output need no locking.
+    feed_cache = get_feed_cache() if FEED_CACHE_ENABLED else {}
+    feed_cache_update = FeedCacheUpdate() if feed_cache_update is None else feed_cache_update
+
+    with ThreadPoolExecutor(max_workers=THREADS_FEEDS) as executor:
+        future_to_feed = {}
+        for feed_url in feeds_to_poll:
+            cached = _usable_feed_cache(feed_cache, feed_url, start_date)
+            future_to_feed[executor.submit(_timed_fetch_feed, feed_url, cached)] = (feed_url, cached)
+        for future in as_completed(future_to_feed):
+            feed_url, cached = future_to_feed[future]
             host = urlparse(feed_url).netloc or feed_url
-            in_range_this = 0
-            dupes_this = 0
-            for entry in feed.entries:
-                if entry.link in existing_urls:
-                    skipped_duplicates += 1
-                    dupes_this += 1
+            feed, error, latency = future.result()
+            try:
+                if error is not None:
+                    raise error
+                feed_state = _feed_cache_state(feed, cached, start_date)
+                if feed.get('status') == 304:
+                    feed_cache_update.add(feed_url, feed_state)
+                    feed_health.record_poll(feed_url, latency, feed)
+                    checked_sources += 1
+                    print_sources_progress(
+                        checked_sources,
+                        total_sources,
+                        msg=f"{BColors.OKCYAN}[SOURCE]{BColors.ENDC} {host} — not modified since last poll"
+                    )
                     continue
-                try:
-                    published_date = entry.published_parsed
-                    import datetime as _dt
-                    published_date = _dt.date(*published_date[:3]) if published_date else _dt.date.today()
-                except Exception:
-                    import datetime as _dt
-                    published_date = _dt.date.today()
-                if start_date <= published_date <= end_date:
-                    all_entries.append((entry, published_date))
-                    in_range_this += 1
-                else:
-                    skipped_outside_range += 1
-            checked_sources += 1
-            print_sources_progress(
-                checked_sources,
-                total_sources,
-                msg=f"{BColors.OKCYAN}[SOURCE]{BColors.ENDC} {host} — entries: {len(feed.entries)} | in-range: {in_range_this} | dupes: {dupes_this}"
-            )
-        except (socket.timeout, Exception) as e:
-            log_warn(f"Could not process feed {feed_url}: {e}")
-            socket.setdefaulttimeout(None)
-            checked_sources += 1
-            host = urlparse(feed_url).netloc or feed_url
-            print_sources_progress(
-                checked_sources,
-                total_sources,
-                msg=f"{BColors.OKCYAN}[SOURCE]{BColors.ENDC} {host} — error: {str(e)[:80]}"
-            )
+                seen_before = feed_cache.get(feed_url, {}).get('seen_guids', set())
+                new_this = sum(1 for e in feed.entries if _entry_guid(e) not in seen_before)
+                feed_health.record_poll(feed_url, latency, feed, new_entries=new_this)
+                in_range, dupes_this, outside_this, screened_this = _tally_feed_entries(feed, existing_urls, start_date, end_date, seen_urls)
+                feed_cache_update.add(feed_url, feed_state, in_range)
+                in_range_this = len(in_range)
+                all_entries.extend(in_range)
+                skipped_duplicates += dupes_this
+                skipped_outside_range += outside_this
+                skipped_screened += screened_this
+                checked_sources += 1
+                print_sources_progress(
+                    checked_sources,
+                    total_sources,
+                    msg=f"{BColors.OKCYAN}[SOURCE]{BColors.ENDC} {host} — entries: {len(feed.entries)} | new: {new_this} | in-range: {in_range_this} | dupes: {dupes_this}"
+                )
+            except sqlite3.Error as e:
+                # Stored articles could not be looked up: skip the feed rather than treat every entry as new
+                log_warn(f"Skipping feed {feed_url} this run: {e}")
+                checked_sources += 1
+                print_sources_progress(
+                    checked_sources,
+                    total_sources,
+                    msg=f"{BColors.OKCYAN}[SOURCE]{BColors.ENDC} {host} — error: stored-article lookup failed"
+                )
+            except Exception as e:
+                log_warn(f"Could not process feed {feed_url}: {e}")
+                feed_health.record_poll(feed_url, latency, error=e)
+                checked_sources += 1
+                print_sources_progress(
+                    checked_sources,
+                    total_sources,
+                    msg=f"{BColors.OKCYAN}[SOURCE]{BColors.ENDC} {host} — error: {str(e)[:80]}"
+                )
 
     total = len(all_entries)
     sys.stdout.write('\n')
     sys.stdout.flush()
-    log_info(f"Found {total} new articles (skipped {skipped_duplicates} duplicates, {skipped_outside_range} outside date range)")
+    feed_health.save()
+    log_info(f"Found {total} new articles (skipped {skipped_duplicates} duplicates, {skipped_outside_range} outside date range, {skipped_screened} off-topic)")
 
     if total == 0:
         return []
@@ -332,18 +744,34 @@ def fetch_and_scrape_articles_parallel(existing_urls, start_date, end_date, max_
 
     print_progress(0)
     workers = max_workers or THREADS_FETCH
+    # Downloads stay on the threads; HTML parsing goes to a process pool sized to the CPU count
+    parse_executor = create_parse_executor()
+    fetch_stats = FetchStats()
     with ThreadPoolExecutor(max_workers=workers) as executor:
-        future_to_entry = {executor.submit(_process_entry, entry, pub): (entry, pub) for entry, pub in all_entries}
+        future_to_entry = {
+            executor.submit(_process_entry, entry, pub, on_article, parse_executor, fetch_stats,
+                            feed_cache_update): (entry, pub)
+            for entry, pub in all_entries
+        }
         for future in as_completed(future_to_entry):
+            # Drop the finished future so its article can be freed once handed on
+            future_to_entry.pop(future)
             try:
                 result = future.result()
-                all_articles.append(result)
+                if on_article is None:
+                    all_articles.append(result)
             except Exception:
                 pass
             processed += 1
             print_progress(processed)
+    if parse_executor is not None:
+        parse_executor.shutdown()
 
     sys.stdout.write('\n')
     sys.stdout.flush()
-    log_success(f"Found a total of {len(all_articles)} new potential articles across all feeds.")
+    fetch_stats.log_summary()
+    log_host_politeness_summary()
+    evict_html_store()
+    save_domain_selectors()
+    log_success(f"Found a total of {processed} new potential articles across all feeds.")
     return all_articles
@@ -1,11 +1,237 @@
 # filtering.py
+import hashlib
+import json
+import re
 import requests
 import sys
+import threading
 from urllib.parse import urlparse
-from src.config import OLLAMA_MODEL, OLLAMA_HOST, THREADS_FILTER, ENABLE_PHASED_MULTITHREADING
-from src.utils.logging_utils import log_success, BColors, log_debug
+from src.config import (
+    OLLAMA_MODEL, THREADS_FILTER, ENABLE_PHASED_MULTITHREADING,
+    RELEVANCE_BATCH_SIZE, RELEVANCE_BATCH_EXCERPT_CHARS,
+)
+from src.core.relevance_model import get_relevance_gate
+from src.utils import ollama_client
+from src.utils.keyword_matcher import KeywordMatcher
+from src.utils.logging_utils import log_success, log_info, BColors, log_debug
+from src.utils.verdict_cache import verdict_key, get_cached_verdict, store_verdict, evict_verdict_cache, log_verdict_cache_summary
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+# Critical keywords that ALWAYS mean cybersecurity relevance
+CRITICAL_KEYWORDS = [
+    'ransomware', 'malware', 'cve-', 'vulnerability', 'zero-day', 'zero day',
+    'exploit', 'breach', 'data breach', 'hack', 'hacked', 'attack', 'apt ',
+    'threat actor', 'phishing', 'trojan', 'backdoor', 'rootkit', 'botnet',
+    'ntlm', 'ldap', 'authentication bypass', 'privilege escalation',
+    'living-off-the-land', 'lolbas', 'lolbins', 'ecrime', 'e-crime',
+    'patch tuesday', 'security advisory', 'cisa alert', 'security bulletin',
+    'credential theft', 'stolen credentials', 'supply chain attack',
+    'nation-state', 'apt group', 'threat intelligence', 'ioc', 'indicator of compromise',
+    'security flaw', 'remote code execution', 'arbitrary code execution',
+    'ddos', 'denial of service', 'sql injection', 'xss', 'cross-site scripting',
+    'stealer', 'infostealer', 'threat landscape', 'adversaries are abusing',
+    'adversary', 'incident response', 'security operations', 'ai cli tools',
+    'command line', 'malicious activity', 'threat detection'
+]
+
+# Security vendors; a vendor in the title plus a security term means relevant
+SECURITY_VENDOR_KEYWORDS = [
+    'crowdstrike', 'falcon platform', 'falcon insight', 'falcon defends',
+    'falcon exposure', 'microsoft defender', 'microsoft sentinel',
+    'sophos firewall', 'palo alto', 'unit 42', 'fortinet', 'fortigate',
+    'check point', 'cisco talos', 'mandiant', 'proofpoint', 'red canary',
+    'intelligence insights', 'threat intelligence', 'commanding attention'
+]
+VENDOR_SECURITY_TERMS = [
+    'security', 'threat', 'attack', 'vulnerability', 'malware',
+    'protection', 'defense', 'stops', 'detects', 'prevents',
+    'adversaries', 'abusing', 'landscape report', 'intelligence insights',
+    'taxonomy', 'stealer', 'incident response'
+]
+
+# Shopping/consumer content in the title
+NEGATIVE_TITLE_KEYWORDS = [
+    'black friday', 'gift guide', 'best deals', 'price drop', 'walmart',
+    'shop the', 'buy now', 'on sale', 'discount', 'smartwatch deal',
+    'gift the person', 'best gizmos', 'best 8 gizmos', 'unboxing', 'best buy deals',
+    'early deals', 'sales', 'nintendo switch', 'ipad pro', 'samsung smartwatch',
+    'tech gift', 'holiday gift', 'apple watch bands', 'gaming pc guy',
+    'power bank', 'space heater', 'windows pc i recommend', 'pc crash',
+    'future-proof their tech careers', 'laptop changed my perspective'
+]
+# Titles the RSS pre-screen may drop unfetched, matched as whole words. Only phrases that
+# are never part of a security headline; weaker signals ('sales', 'deals', 'prime day')
+# also appear in breach and scam news and are left to the relevance filter.
+PRESCREEN_DROP_TITLE_KEYWORDS = [
+    'gift guide', 'best deals', 'early deals', 'best buy deals',
+    'price drop', 'unboxing', 'box office', 'quarterly results', 'revenue forecast',
+    'earnings call', 'power bank', 'space heater', 'apple watch bands'
+]
+_PRESCREEN_DROP_RE = re.compile(
+    r'\b(?:' + '|'.join(re.escape(keyword) for keyword in PRESCREEN_DROP_TITLE_KEYWORDS) + r')\b'
+)
+# Words that keep a drop-listed title in the filter ("Scammers push fake gift guide ...")
+PRESCREEN_KEEP_KEYWORDS = [
+    'scam', 'fraud', 'steal', 'stolen', 'theft', 'leak', 'impersonat', 'credential', 'fake',
+    'hijack', 'spoof', 'extortion', 'security', 'cyber', 'hacker', 'spyware', 'scraped'
+]
+
+# Extended cybersecurity keywords (checked in title + content)
+EXTENDED_KEYWORDS = [
+    'trojan', 'backdoor', 'rootkit', 'credential theft', 'security advisory',
+    'cisa', 'intrusion', 'compromise', 'compromised', 'cybersecurity',
+    'cyber security', 'infosec', 'threat intelligence', 'incident response',
+    'forensics', 'siem', 'edr', 'xdr', 'firewall bypass',
+    'remote code execution', 'sql injection', 'cross-site scripting',
+    'buffer overflow', 'mitre att&ck', 'data breach', 'security patch',
+    'nation-state', 'cyber attack', 'cyber threat', 'threat hunting',
+    'soc ', 'security operation', 'git vulnerability', 'publicly disclosed',
+    'lolbins', 'threat actor', 'botnet', 'domain user to system',
+    'stealer', 'infostealer', 'taxonomy', 'adversaries are abusing',
+    'commanding attention', 'intelligence insights', 'landscape report',
+    'atomic stealer', 'odyssey stealer', 'poseidon stealer', 'ai cli tools',
+    'redefining incident response'
+]
+
+
+# Keyword fallback (is_article_relevant_keywords) title lists
+FALLBACK_CRITICAL_TITLE_KEYWORDS = [
+    'ransomware', 'malware', 'exploit', 'cve-', 'cve ', 'vulnerability',
+    'zero-day', 'zero day', 'breach', 'hack', 'attack', 'threat',
+    'phishing', 'ddos', 'crowdstrike', 'falcon', 'patch tuesday',
+    'authentication bypass', 'privilege escalation', 'ntlm', 'ldap',
+    'living-off-the-land', 'exposure management', 'endpoint detection',
+    'threat landscape', 'ecrime', 'apt', 'security flaw', 'stealer',
+    'infostealer', 'adversaries', 'abusing', 'incident response',
+    'threat detection', 'intelligence insights', 'taxonomy', 'commanding attention'
+]
+FALLBACK_VENDOR_TITLE_KEYWORDS = [
+    'crowdstrike', 'falcon platform', 'falcon insight', 'falcon defends',
+    'falcon exposure', 'sophos firewall', 'palo alto', 'fortinet',
+    'check point', 'cisco security', 'microsoft defender', 'sentinel',
+    'kaspersky', 'bitdefender', 'trend micro', 'mcafee', 'eset',
+    'red canary', 'redcanary'
+]
+# Security terms that indicate protective measures
+PROTECTION_TITLE_KEYWORDS = [
+    'how to stay protected', 'end of support', 'automated response',
+    'security update', 'stops', 'defends against', 'predicts what attacker'
+]
+# Vendor marketing posts (awards, test results) on vendor domains
+VENDOR_DOMAINS = [
+    'crowdstrike.com', 'microsoft.com', 'security.microsoft.com', 'sophos.com', 'paloaltonetworks.com',
+    'unit42.paloaltonetworks.com', 'fortinet.com', 'fortiguard.com', 'checkpoint.com', 'talosintelligence.com',
+    'mandiant.com', 'proofpoint.com', 'googleprojectzero.blogspot.com', 'blog.google', 'cloud.google.com'
+]
+MARKETING_TITLE_KEYWORDS = [
+    'se labs', 'leader', 'leaders', 'award', 'awarded', 'recognition', 'scores', 'score', 'frost radar',
+    'benchmark', 'evaluation', 'tested', 'wins', 'winner', 'named leader', 'magic quadrant'
+]
+
+# All keyword lists above, compiled once into a single automaton
+_KEYWORD_MATCHER = KeywordMatcher({
+    'critical': CRITICAL_KEYWORDS,
+    'vendor': SECURITY_VENDOR_KEYWORDS,
+    'vendor_terms': VENDOR_SECURITY_TERMS,
+    'negative': NEGATIVE_TITLE_KEYWORDS,
+    'prescreen_keep': PRESCREEN_KEEP_KEYWORDS,
+    'extended': EXTENDED_KEYWORDS,
+    'fallback_critical': FALLBACK_CRITICAL_TITLE_KEYWORDS,
+    'fallback_vendor': FALLBACK_VENDOR_TITLE_KEYWORDS,
+    'protection': PROTECTION_TITLE_KEYWORDS,
+    'marketing': MARKETING_TITLE_KEYWORDS,
+})
+
+
+class KeywordMatches:
+    """Keyword groups found in an article, by where they occur.
+
+    title holds the groups found in the title. preview (first preview_chars
+    of content) and combined (title + " " + first content_chars of content)
+    come from one scan of the content, made the first time either is used;
+    most decisions are settled by the title alone. keywords maps each group
+    to the keywords found, for reporting.
+    """
+
+    def __init__(self, title, content='', preview_chars=1000, content_chars=3000):
+        self._title_lower = (title or '').lower()
+        self._content = (content or '')[:content_chars]
+        self._preview_chars = preview_chars
+        self.title = set()
+        for _, _, keyword in _KEYWORD_MATCHER.find(self._title_lower):
+            self.title.update(_KEYWORD_MATCHER.groups_of(keyword))
+        self._preview = None
+        self._combined = None
+        self._keywords = None
+
+    def _scan_content(self):
+        text = self._title_lower + " " + self._content.lower()
+        title_end = len(self._title_lower)
+        preview_end = title_end + 1 + self._preview_chars
+        found, in_preview = set(), set()
+        for start, end, keyword in _KEYWORD_MATCHER.find(text):
+            found.add(keyword)
+            if start > title_end and end <= preview_end:
+                in_preview.add(keyword)
+        self._preview = {group for keyword in in_preview for group in _KEYWORD_MATCHER.groups_of(keyword)}
+        self._combined, self._keywords = set(), {}
+        for keyword in found:
+            for group in _KEYWORD_MATCHER.groups_of(keyword):
+                self._combined.add(group)
+                self._keywords.setdefault(group, set()).add(keyword)
+
+    @property
+    def preview(self):
+        if self._preview is None:
+            self._scan_content()
+        return self._preview
+
+    @property
+    def combined(self):
+        if self._combined is None:
+            self._scan_content()
+        return self._combined
+
+    @property
+    def keywords(self):
+        if self._keywords is None:
+            self._scan_content()
+        return self._keywords
+
+
+def match_keywords(title, content=''):
+    """Return the KeywordMatches of an article's title and content."""
+    return KeywordMatches(title, content)
+
+
+def _keyword_prefilter(matches):
+    """True when title/text keywords alone show the article is relevant, else None."""
+    if 'critical' in matches.title:
+        return True
+    # A vendor in the title plus security terms in the title or text is relevant
+    if 'vendor' in matches.title and ('vendor_terms' in matches.title or 'vendor_terms' in matches.preview):
+        return True
+    return None
+
+
+def prescreen_entry(title, summary=''):
+    """Relevance verdict from an RSS entry's title and summary, before its page is fetched.
+
+    Returns True (clearly relevant: the LLM filter's own keyword pre-check
+    passes), False (clearly irrelevant: a PRESCREEN_DROP_TITLE_KEYWORDS title
+    with no security keyword in title or summary) or None (ambiguous; fetch
+    and filter as usual). The drop decision never fetches the page, so it
+    only uses whole-word matches of unambiguous phrases.
+    """
+    matches = match_keywords(title, summary)
+    if _keyword_prefilter(matches):
+        return True
+    if (_PRESCREEN_DROP_RE.search((title or '').lower())
+            and not matches.combined & {'critical', 'extended', 'prescreen_keep'}):
+        return False
+    return None
+
+
 def filter_articles_sequential(articles):
     relevant_articles = []
     articles_to_check = [a for a in articles if a.get('content')]
@@ -56,67 +282,10 @@ def filter_articles_sequential(articles):
     sys.stdout.write('\n')  # End progress bar line
     sys.stdout.flush()
     log_success(f"Found {len(relevant_articles)} new relevant articles to analyze.")
+    log_filter_run_summary()
     return relevant_articles
 
-def is_article_relevant_with_llm(article):
-    # Verbose: show which article is being evaluated
-    try:
-        host = urlparse(article.get('url', '')).netloc
-    except Exception:
-        host = ''
-    log_debug(f"Filtering: {article.get('title','(untitled)')[:80]}" + (f" [{host}]" if host else ""))
-    # STEP 1: Pre-filter with critical keywords (catch obvious cybersecurity content)
-    title_lower = article['title'].lower()
-    content = article.get('content', '') or ''  # Handle None content
-    content_preview = content[:1000].lower()
-    
-    # Critical keywords that ALWAYS mean cybersecurity relevance
-    critical_keywords = [
-        'ransomware', 'malware', 'cve-', 'vulnerability', 'zero-day', 'zero day',
-        'exploit', 'breach', 'data breach', 'hack', 'hacked', 'attack', 'apt ',
-        'threat actor', 'phishing', 'trojan', 'backdoor', 'rootkit', 'botnet',
-        'ntlm', 'ldap', 'authentication bypass', 'privilege escalation',
-        'living-off-the-land', 'lolbas', 'lolbins', 'ecrime', 'e-crime',
-        'patch tuesday', 'security advisory', 'cisa alert', 'security bulletin',
-        'credential theft', 'stolen credentials', 'supply chain attack',
-        'nation-state', 'apt group', 'threat intelligence', 'ioc', 'indicator of compromise',
-        'security flaw', 'remote code execution', 'arbitrary code execution',
-        'ddos', 'denial of service', 'sql injection', 'xss', 'cross-site scripting',
-        'stealer', 'infostealer', 'threat landscape', 'adversaries are abusing',
-        'adversary', 'incident response', 'security operations', 'ai cli tools',
-        'command line', 'malicious activity', 'threat detection'
-    ]
-    
-    # Check title for critical keywords
-    for keyword in critical_keywords:
-        if keyword in title_lower:
-            return True  # Skip LLM, definitely relevant
-    
-    # Check if from security vendor discussing threats/security
-    security_vendor_keywords = [
-        'crowdstrike', 'falcon platform', 'falcon insight', 'falcon defends',
-        'falcon exposure', 'microsoft defender', 'microsoft sentinel',
-        'sophos firewall', 'palo alto', 'unit 42', 'fortinet', 'fortigate',
-        'check point', 'cisco talos', 'mandiant', 'proofpoint', 'red canary',
-        'intelligence insights', 'threat intelligence', 'commanding attention'
-    ]
-    
-    for vendor in security_vendor_keywords:
-        if vendor in title_lower:
-            # If vendor + security terms, it's relevant
-            security_terms = ['security', 'threat', 'attack', 'vulnerability', 'malware', 
-                            'protection', 'defense', 'stops', 'detects', 'prevents',
-                            'adversaries', 'abusing', 'landscape report', 'intelligence insights',
-                            'taxonomy', 'stealer', 'incident response']
-            if any(term in title_lower or term in content_preview for term in security_terms):
-                return True
-    
-    # STEP 2: Use LLM for edge cases (simplified prompt)
-    prompt = f"""You are a cybersecurity expert analyzing articles for a Security Operations Center.
-
-Is this article relevant for security professionals and threat intelligence?
-
-✅ YES if about:
+_RELEVANCE_CRITERIA = """✅ YES if about:
 - Malware, ransomware, vulnerabilities, CVEs, exploits, breaches, attacks
 - Threat actors, APT groups, cybercrime, nation-state hacking
 - Security products/defenses (EDR, XDR, SIEM, firewalls, threat hunting)
@@ -132,21 +301,104 @@ Is this article relevant for security professionals and threat intelligence?
 - Shopping deals, gift guides, product reviews (phones, TVs, gadgets)
 - General tech news (earnings, mergers) unless security-related
 - Entertainment, lifestyle, or non-security software features
+"""
+
+RELEVANCE_PROMPT = """You are a cybersecurity expert analyzing articles for a Security Operations Center.
+
+Is this article relevant for security professionals and threat intelligence?
 
-Title: {article['title']}
-Content (excerpt): {content[:1500]}
+""" + _RELEVANCE_CRITERIA + """
+Title: {title}
+Content (excerpt): {excerpt}
 
 Is this relevant for cybersecurity professionals?
 Answer ONLY: YES or NO
 """
+# Several articles per request (RELEVANCE_BATCH_SIZE); one verdict object per numbered article
+RELEVANCE_BATCH_PROMPT = """You are a cybersecurity expert analyzing articles for a Security Operations Center.
+
+For EACH numbered article below, decide whether it is relevant for security professionals and threat intelligence.
+
+""" + _RELEVANCE_CRITERIA + """
+{articles}
+
+Answer ONLY with a JSON array holding one object per article, in order, for example:
+[{{"id": 1, "relevant": "YES"}}, {{"id": 2, "relevant": "NO"}}]
+"""
+# Changes whenever the prompt text does, so cached verdicts for an older prompt are not reused
+RELEVANCE_PROMPT_VERSION = hashlib.sha256(RELEVANCE_PROMPT.encode('utf-8')).hexdigest()[:12]
+RELEVANCE_BATCH_PROMPT_VERSION = hashlib.sha256(RELEVANCE_BATCH_PROMPT.encode('utf-8')).hexdigest()[:12]
+_BATCH_LINE_RE = re.compile(r"\[?(\d+)\]?\s*[:.)\-]?\s*\"?(YES|NO)\b", re.IGNORECASE)
+_batch_stats = {'batches': 0, 'articles': 0, 'retried': 0}
+_batch_stats_lock = threading.Lock()
+
+
+def log_filter_run_summary():
+    """Log how many articles the local model and the verdict cache decided this run; trim the cache."""
+    gate = get_relevance_gate()
+    if gate:
+        gate.log_summary()
+    log_verdict_cache_summary()
+    evict_verdict_cache()
+    with _batch_stats_lock:
+        batch_stats = dict(_batch_stats)
+        _batch_stats.update(batches=0, articles=0, retried=0)
+    if batch_stats['batches']:
+        log_info(f"Batched relevance: {batch_stats['articles']} articles in {batch_stats['batches']} LLM requests "
+                 f"({batch_stats['retried']} asked again individually)")
+
+def decide_relevance_locally(article, batched=False):
+    """Steps 1-3 of the relevance check, none of which calls the LLM.
+
+    Returns (verdict, None) when decided, else (None, pending) where pending
+    holds what the LLM step needs (cache keys of the single and the batched
+    question, excerpt, local model verdict when this decision is audited).
+    batched=True is for articles headed to classify_relevance_batch: a cached
+    batched verdict is then reused too. Single questions only reuse verdicts
+    to the single prompt.
+    """
+    # Verbose: show which article is being evaluated
     try:
-        response = requests.post(
-            f"{OLLAMA_HOST}/api/generate",
-            json={"model": OLLAMA_MODEL, "prompt": prompt, "stream": False},
-            timeout=60
-        )
-        response.raise_for_status()
-        response_text = response.json()['response'].strip().upper()
+        host = urlparse(article.get('url', '')).netloc
+    except Exception:
+        host = ''
+    log_debug(f"Filtering: {article.get('title','(untitled)')[:80]}" + (f" [{host}]" if host else ""))
+    # STEP 1: Pre-filter with critical keywords (catch obvious cybersecurity content)
+    content = article.get('content', '') or ''  # Handle None content
+    if _keyword_prefilter(match_keywords(article['title'], content)):
+        return True, None  # Skip LLM, definitely relevant
+    
+    # STEP 2: Reuse the LLM's verdict if this question was asked before
+    excerpt = content[:1500]
+    cache_key = verdict_key(OLLAMA_MODEL, RELEVANCE_PROMPT_VERSION, article['title'], excerpt)
+    batch_cache_key = verdict_key(OLLAMA_MODEL, RELEVANCE_BATCH_PROMPT_VERSION, article['title'],
+                                  excerpt[:RELEVANCE_BATCH_EXCERPT_CHARS])
+    # A batched question falls back to the single one, whose verdict (longer excerpt) it may also use
+    cached_verdict = get_cached_verdict(batch_cache_key, cache_key) if batched else get_cached_verdict(cache_key)
+    if cached_verdict is not None:
+        return cached_verdict, None
+    
+    # STEP 3: Local trained classifier decides confident cases (see src/core/relevance_model.py)
+    gate = get_relevance_gate()
+    model_verdict = gate.decide(article) if gate else None
+    if model_verdict is not None and not gate.should_audit():
+        return model_verdict, None
+    return None, {'cache_key': cache_key, 'batch_cache_key': batch_cache_key, 'excerpt': excerpt,
+                  'model_verdict': model_verdict}
+
+
+def _record_llm_verdict(pending, is_relevant, batched=False):
+    """Cache an LLM verdict under the key of the question asked; count it towards the local model's audit."""
+    store_verdict(pending['batch_cache_key' if batched else 'cache_key'], is_relevant, OLLAMA_MODEL)
+    if pending['model_verdict'] is not None:
+        get_relevance_gate().record_audit(pending['model_verdict'], is_relevant)
+
+
+def _ask_llm_relevance(article, pending):
+    """STEP 4: Use LLM for edge cases (simplified prompt)"""
+    prompt = RELEVANCE_PROMPT.format(title=article['title'], excerpt=pending['excerpt'])
+    try:
+        response_text = ollama_client.generate(prompt, purpose='relevance', timeout=60).strip().upper()
         
         # Debug: print response if not clear YES/NO
         if "YES" not in response_text and "NO" not in response_text:
@@ -154,116 +406,116 @@ Answer ONLY: YES or NO
         
         # More flexible YES detection
         is_relevant = "YES" in response_text or response_text.startswith("Y")
-        
+        if "YES" in response_text or "NO" in response_text:
+            _record_llm_verdict(pending, is_relevant)
         return is_relevant
     except requests.RequestException as e:
         print(f"\n[DEBUG] LLM request failed for '{article['title'][:50]}...': {e}")
+        if pending['model_verdict'] is not None:
+            return pending['model_verdict']
         # Fallback: Use keyword-based filtering if LLM fails
         return is_article_relevant_keywords(article)
 
 
+def is_article_relevant_with_llm(article):
+    verdict, pending = decide_relevance_locally(article)
+    if pending is None:
+        return verdict
+    return _ask_llm_relevance(article, pending)
+
+
+def _parse_batch_verdicts(response_text, count):
+    """Map article number (1-based) to verdict for every article the batch answer covers."""
+    verdicts = {}
+    start, end = response_text.find('['), response_text.rfind(']')
+    if start != -1 and end > start:
+        try:
+            items = json.loads(response_text[start:end + 1])
+        except ValueError:
+            items = []
+        for item in items if isinstance(items, list) else []:
+            if not isinstance(item, dict):
+                continue
+            number = item.get('id')
+            answer = str(item.get('relevant', '')).strip().upper()
+            if isinstance(number, int) and 1 <= number <= count and answer in ('YES', 'NO', 'TRUE', 'FALSE'):
+                verdicts[number] = answer in ('YES', 'TRUE')
+    if not verdicts:
+        # Plain-text answers such as "1: YES" / "[2] NO"
+        for match in _BATCH_LINE_RE.finditer(response_text):
+            number = int(match.group(1))
+            if 1 <= number <= count:
+                verdicts.setdefault(number, match.group(2).upper() == 'YES')
+    return verdicts
+
+
+def classify_relevance_batch(items):
+    """Ask the LLM about several undecided articles in one request.
+
+    items is a list of (article, pending) from decide_relevance_locally(batched=True).
+    Returns the verdicts in the same order. Articles the answer does not
+    cover (parse failure, missing entries, request error) are asked
+    individually.
+    """
+    if len(items) == 1:
+        return [_ask_llm_relevance(*items[0])]
+    articles_text = "\n\n".join(
+        f"[{number}] Title: {article['title']}\nContent (excerpt): {pending['excerpt'][:RELEVANCE_BATCH_EXCERPT_CHARS]}"
+        for number, (article, pending) in enumerate(items, start=1)
+    )
+    verdicts = {}
+    try:
+        response_text = ollama_client.generate(
+            RELEVANCE_BATCH_PROMPT.format(articles=articles_text),
+            purpose='relevance batch',
+            timeout=60 + 15 * len(items),
+        )
+        verdicts = _parse_batch_verdicts(response_text, len(items))
+    except requests.RequestException as e:
+        log_debug(f"Batched relevance request failed ({len(items)} articles): {e}")
+
+    results = []
+    for number, (article, pending) in enumerate(items, start=1):
+        if number in verdicts:
+            _record_llm_verdict(pending, verdicts[number], batched=True)
+            results.append(verdicts[number])
+        else:
+            results.append(_ask_llm_relevance(article, pending))
+    with _batch_stats_lock:
+        _batch_stats['batches'] += 1
+        _batch_stats['articles'] += len(items)
+        _batch_stats['retried'] += len(items) - len(verdicts)
+    return results
+
+
 def is_article_relevant_keywords(article):
     """Fallback keyword-based filtering when LLM is unavailable"""
-    title_lower = article['title'].lower()
-    content_lower = article.get('content', '').lower()[:3000]  # Check first 3000 chars
+    matches = match_keywords(article['title'], article.get('content') or '')
     # Try to include domain context for vendor-aware rules
     try:
-        from urllib.parse import urlparse
         domain = urlparse(article.get('url') or '').netloc.lower()
     except Exception:
         domain = ''
-    combined = title_lower + " " + content_lower
     
     # Vendor marketing posts: allow through as 'relevant' so they get analyzed and will likely
     # be classified as INFORMATIONAL by the analyzer. This ensures vendor updates don't linger
     # as UNANALYZED/NOT_RELEVANT.
-    vendor_domains = [
-        'crowdstrike.com', 'microsoft.com', 'security.microsoft.com', 'sophos.com', 'paloaltonetworks.com',
-        'unit42.paloaltonetworks.com', 'fortinet.com', 'fortiguard.com', 'checkpoint.com', 'talosintelligence.com',
-        'mandiant.com', 'proofpoint.com', 'googleprojectzero.blogspot.com', 'blog.google', 'cloud.google.com'
-    ]
-    marketing_title_terms = [
-        'se labs', 'leader', 'leaders', 'award', 'awarded', 'recognition', 'scores', 'score', 'frost radar',
-        'benchmark', 'evaluation', 'tested', 'wins', 'winner', 'named leader', 'magic quadrant'
-    ]
-    if any(d in domain for d in vendor_domains) and any(t in title_lower for t in marketing_title_terms):
+    if 'marketing' in matches.title and any(d in domain for d in VENDOR_DOMAINS):
         return True
 
     # First check for negative keywords in title (shopping/consumer content)
-    negative_keywords_in_title = [
-        'black friday', 'gift guide', 'best deals', 'price drop', 'walmart',
-        'shop the', 'buy now', 'on sale', 'discount', 'smartwatch deal',
-        'gift the person', 'best gizmos', 'best 8 gizmos', 'unboxing', 'best buy deals',
-        'early deals', 'sales', 'nintendo switch', 'ipad pro', 'samsung smartwatch',
-        'tech gift', 'holiday gift', 'apple watch bands', 'gaming pc guy',
-        'power bank', 'space heater', 'windows pc i recommend', 'pc crash',
-        'future-proof their tech careers', 'laptop changed my perspective'
-    ]
-    
-    for keyword in negative_keywords_in_title:
-        if keyword in title_lower:
-            return False
+    if 'negative' in matches.title:
+        return False
     
-    # HIGH PRIORITY: Keywords that DEFINITELY mean it's cybersecurity
-    # Check TITLE FIRST for these critical terms
-    critical_title_keywords = [
-        'ransomware', 'malware', 'exploit', 'cve-', 'cve ', 'vulnerability',
-        'zero-day', 'zero day', 'breach', 'hack', 'attack', 'threat',
-        'phishing', 'ddos', 'crowdstrike', 'falcon', 'patch tuesday',
-        'authentication bypass', 'privilege escalation', 'ntlm', 'ldap',
-        'living-off-the-land', 'exposure management', 'endpoint detection',
-        'threat landscape', 'ecrime', 'apt', 'security flaw', 'stealer',
-        'infostealer', 'adversaries', 'abusing', 'incident response',
-        'threat detection', 'intelligence insights', 'taxonomy', 'commanding attention'
-    ]
-    
-    for keyword in critical_title_keywords:
-        if keyword in title_lower:
-            return True
-    
-    # Check for security vendor names in title (CrowdStrike, Falcon, etc.)
-    vendor_keywords_in_title = [
-        'crowdstrike', 'falcon platform', 'falcon insight', 'falcon defends',
-        'falcon exposure', 'sophos firewall', 'palo alto', 'fortinet',
-        'check point', 'cisco security', 'microsoft defender', 'sentinel',
-        'kaspersky', 'bitdefender', 'trend micro', 'mcafee', 'eset',
-        'red canary', 'redcanary'
-    ]
-    
-    for vendor in vendor_keywords_in_title:
-        if vendor in title_lower:
-            return True
-    
-    # Security terms that indicate protective measures
-    protection_keywords_in_title = [
-        'how to stay protected', 'end of support', 'automated response',
-        'security update', 'stops', 'defends against', 'predicts what attacker'
-    ]
-    
-    for keyword in protection_keywords_in_title:
-        if keyword in title_lower:
+    # HIGH PRIORITY: Keywords that DEFINITELY mean it's cybersecurity (title),
+    # security vendor names (CrowdStrike, Falcon, etc.) and protective measures
+    for group in ('fallback_critical', 'fallback_vendor', 'protection'):
+        if group in matches.title:
             return True
     
     # Extended cybersecurity keywords (check in title + content)
-    extended_keywords = [
-        'trojan', 'backdoor', 'rootkit', 'credential theft', 'security advisory',
-        'cisa', 'intrusion', 'compromise', 'compromised', 'cybersecurity',
-        'cyber security', 'infosec', 'threat intelligence', 'incident response',
-        'forensics', 'siem', 'edr', 'xdr', 'firewall bypass',
-        'remote code execution', 'sql injection', 'cross-site scripting',
-        'buffer overflow', 'mitre att&ck', 'data breach', 'security patch',
-        'nation-state', 'cyber attack', 'cyber threat', 'threat hunting',
-        'soc ', 'security operation', 'git vulnerability', 'publicly disclosed',
-        'lolbins', 'threat actor', 'botnet', 'domain user to system',
-        'stealer', 'infostealer', 'taxonomy', 'adversaries are abusing',
-        'commanding attention', 'intelligence insights', 'landscape report',
-        'atomic stealer', 'odyssey stealer', 'poseidon stealer', 'ai cli tools',
-        'redefining incident response'
-    ]
-    
-    for keyword in extended_keywords:
-        if keyword in combined:
-            return True
+    if 'extended' in matches.combined:
+        return True
     
     # Default: If no keywords matched, it's not relevant
     return False
@@ -292,32 +544,65 @@ def filter_articles_parallel(articles, max_workers=None):
 
     print_progress(0)
     workers = max_workers or THREADS_FILTER
-    # Run relevance checks concurrently
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        future_to_article = {}
+    if RELEVANCE_BATCH_SIZE > 1:
+        # Keyword, cache and local-model decisions are cheap; only the rest goes to the LLM, several per request
+        undecided = []
         for a in articles_to_check:
-            # Announce the article being checked as it's submitted
-            try:
-                host = urlparse(a.get('url', '')).netloc
-            except Exception:
-                host = ''
-            print_progress(processed, msg=f"{BColors.OKBLUE}[CHECK]{BColors.ENDC} {a['title']}" + (f" [{host}]" if host else ""))
-            future = executor.submit(is_article_relevant_with_llm, a)
-            future_to_article[future] = a
-        for future in as_completed(future_to_article):
-            article = future_to_article[future]
             try:
-                is_rel = future.result()
+                is_rel, pending = decide_relevance_locally(a, batched=True)
             except Exception:
-                is_rel = False
+                is_rel, pending = False, None
+            if pending is not None:
+                undecided.append((a, pending))
+                continue
             if is_rel:
-                relevant_articles.append(article)
-                # brief success line without breaking progress
-                print_progress(processed, msg=f"{BColors.OKGREEN}[RELEVANT]{BColors.ENDC} {article['title']}")
+                relevant_articles.append(a)
+                print_progress(processed, msg=f"{BColors.OKGREEN}[RELEVANT]{BColors.ENDC} {a['title']}")
             processed += 1
             print_progress(processed)
+        batches = [undecided[i:i + RELEVANCE_BATCH_SIZE] for i in range(0, len(undecided), RELEVANCE_BATCH_SIZE)]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            future_to_batch = {executor.submit(classify_relevance_batch, batch): batch for batch in batches}
+            for future in as_completed(future_to_batch):
+                batch = future_to_batch[future]
+                try:
+                    verdicts = future.result()
+                except Exception:
+                    verdicts = [False] * len(batch)
+                for (article, _), is_rel in zip(batch, verdicts):
+                    if is_rel:
+                        relevant_articles.append(article)
+                        print_progress(processed, msg=f"{BColors.OKGREEN}[RELEVANT]{BColors.ENDC} {article['title']}")
+                    processed += 1
+                    print_progress(processed)
+    else:
+        # Run relevance checks concurrently
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            future_to_article = {}
+            for a in articles_to_check:
+                # Announce the article being checked as it's submitted
+                try:
+                    host = urlparse(a.get('url', '')).netloc
+                except Exception:
+                    host = ''
+                print_progress(processed, msg=f"{BColors.OKBLUE}[CHECK]{BColors.ENDC} {a['title']}" + (f" [{host}]" if host else ""))
+                future = executor.submit(is_article_relevant_with_llm, a)
+                future_to_article[future] = a
+            for future in as_completed(future_to_article):
+                article = future_to_article[future]
+                try:
+                    is_rel = future.result()
+                except Exception:
+                    is_rel = False
+                if is_rel:
+                    relevant_articles.append(article)
+                    # brief success line without breaking progress
+                    print_progress(processed, msg=f"{BColors.OKGREEN}[RELEVANT]{BColors.ENDC} {article['title']}")
+                processed += 1
+                print_progress(processed)
 
     sys.stdout.write('\n')
     sys.stdout.flush()
     log_success(f"Found {len(relevant_articles)} new relevant articles to analyze.")
+    log_filter_run_summary()
     return relevant_articles
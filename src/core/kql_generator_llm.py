@@ -4,11 +4,11 @@ LLM-Enhanced KQL Query Generator for Threat Intelligence
 Uses Ollama LLM to intelligently extract IOCs and generate context-aware KQL queries
 """
 
-import requests
 import json
 import re
 from typing import Dict, List, Optional
-from src.config import OLLAMA_MODEL, OLLAMA_HOST
+from src.utils.json_repair import loads_tolerant
+from src.core.structured_output import IOC_SCHEMA, KQL_QUERIES_SCHEMA, BEHAVIORAL_QUERY_SCHEMA, generate_json
 from src.utils.logging_utils import log_info, log_success, log_warn, log_error, BColors
 
 # Import regex-based extractor as fallback
@@ -70,25 +70,18 @@ Output JSON structure:
 Respond with JSON only:"""
 
         try:
-            response = requests.post(
-                f"{OLLAMA_HOST}/api/generate",
-                json={
-                    "model": OLLAMA_MODEL,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.1,  # Very low for better JSON structure
-                        "top_p": 0.9,
-                        "num_predict": 16384  # Allow very long responses for many IOCs (98 domains)
-                    }
+            iocs = generate_json(
+                prompt,
+                IOC_SCHEMA,
+                purpose='ioc extraction',
+                repair=self._parse_llm_response,
+                options={
+                    "temperature": 0.1,  # Very low for better JSON structure
+                    "top_p": 0.9,
+                    "num_predict": 16384  # Allow very long responses for many IOCs (98 domains)
                 },
                 timeout=120
             )
-            response.raise_for_status()
-            response_text = response.json()['response'].strip()
-            
-            # Parse JSON
-            iocs = self._parse_llm_response(response_text)
             
             if iocs:
                 total = sum(len(iocs.get(key, [])) for key in iocs)
@@ -103,35 +96,24 @@ Respond with JSON only:"""
             return self._fallback_extraction(article)
     
     def _parse_llm_response(self, response_text: str) -> Optional[Dict]:
-        """Parse LLM JSON response with repair"""
-        # Find JSON boundaries
-        json_start = response_text.find('{')
-        json_end = response_text.rfind('}')
+        """Parse LLM JSON response with repair (a truncated long IOC list keeps its complete entries)"""
+        iocs = loads_tolerant(response_text)
+        if not isinstance(iocs, dict):
+            log_error("Failed to parse LLM JSON")
+            return None
         
-        if json_start == -1 or json_end == -1:
+        # Validate structure
+        expected_keys = ['ips', 'domains', 'urls', 'hashes', 'cves', 'emails']
+        if not any(key in iocs for key in expected_keys):
+            log_warn("LLM response missing expected IOC categories")
             return None
         
-        json_str = response_text[json_start:json_end + 1]
+        # Ensure all lists exist
+        for key in expected_keys + ['filenames', 'registry_keys', 'techniques']:
+            if key not in iocs:
+                iocs[key] = []
         
-        try:
-            iocs = json.loads(json_str)
-            
-            # Validate structure
-            expected_keys = ['ips', 'domains', 'urls', 'hashes', 'cves', 'emails']
-            if not any(key in iocs for key in expected_keys):
-                log_warn("LLM response missing expected IOC categories")
-                return None
-            
-            # Ensure all lists exist
-            for key in expected_keys + ['filenames', 'registry_keys', 'techniques']:
-                if key not in iocs:
-                    iocs[key] = []
-            
-            return iocs
-            
-        except json.JSONDecodeError as e:
-            log_error(f"Failed to parse LLM JSON: {e}")
-            return None
+        return iocs
     
     def _fallback_extraction(self, article: Dict) -> Dict:
         """Fallback to regex-based extraction"""
@@ -237,25 +219,20 @@ Output JSON only:
 Respond with JSON only:"""
 
         try:
-            response = requests.post(
-                f"{OLLAMA_HOST}/api/generate",
-                json={
-                    "model": OLLAMA_MODEL,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.1,  # Very low for structured JSON output
-                        "top_p": 0.9,
-                        "num_predict": 4096
-                    }
+            parsed = generate_json(
+                prompt,
+                KQL_QUERIES_SCHEMA,
+                purpose='kql query',
+                options={
+                    "temperature": 0.1,  # Very low for structured JSON output
+                    "top_p": 0.9,
+                    "num_predict": 4096
                 },
                 timeout=120
             )
-            response.raise_for_status()
-            response_text = response.json()['response'].strip()
             
             # Parse queries
-            queries = self._parse_query_response(response_text, article)
+            queries = self._prepare_queries(parsed.get('queries', []), article) if parsed else []
             
             if queries:
                 # Inject actual IOCs into the query
@@ -394,6 +371,7 @@ Use tables like:
 
 Output JSON:
 {{
+  "skip": false,
   "name": "Descriptive query name based on threat behavior",
   "type": "Behavioral_Hunt",
   "description": "What this query detects (be specific to the threat)",
@@ -406,37 +384,20 @@ Return ONLY JSON. If not a technical threat, return: {{"skip": true}}
 """
 
         try:
-            response = requests.post(
-                f"{OLLAMA_HOST}/api/generate",
-                json={
-                    "model": OLLAMA_MODEL,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.2,  # Slightly higher for creative behavioral queries
-                        "top_p": 0.9,
-                        "num_predict": 2048
-                    }
+            query_data = generate_json(
+                prompt,
+                BEHAVIORAL_QUERY_SCHEMA,
+                purpose='kql behavioral query',
+                options={
+                    "temperature": 0.2,  # Slightly higher for creative behavioral queries
+                    "top_p": 0.9,
+                    "num_predict": 2048
                 },
                 timeout=120
             )
-            response.raise_for_status()
-            response_text = response.json()['response'].strip()
-            
-            # Parse response - look for JSON
-            json_start = response_text.find('{')
-            json_end = response_text.rfind('}')
-            
-            if json_start == -1 or json_end == -1:
-                log_info(f"No JSON response for '{article['title']}', skipping")
-                return []
-            
-            json_str = response_text[json_start:json_end + 1]
             
-            try:
-                query_data = json.loads(json_str)
-            except json.JSONDecodeError as e:
-                log_error(f"Failed to parse behavioral query JSON: {e}")
+            if query_data is None:
+                log_error(f"No valid behavioral query JSON for '{article['title']}', skipping")
                 return []
             
             if not query_data or query_data.get('skip'):
@@ -477,43 +438,27 @@ Return ONLY JSON. If not a technical threat, return: {{"skip": true}}
         
         return filtered
     
-    def _parse_query_response(self, response_text: str, article: Dict) -> List[Dict]:
-        """Parse LLM query response"""
-        json_start = response_text.find('{')
-        json_end = response_text.rfind('}')
-        
-        if json_start == -1 or json_end == -1:
-            return []
-        
-        json_str = response_text[json_start:json_end + 1]
-        
-        try:
-            parsed = json.loads(json_str)
-            queries = parsed.get('queries', [])
-            
-            # Enhance query metadata
-            for query in queries:
-                query['article_title'] = article['title']
-                query['threat_risk'] = article.get('threat_risk', 'UNKNOWN')
-                
-                # Clean up KQL (unescape newlines)
-                if 'kql' in query:
-                    query['query'] = query['kql'].replace('\\n', '\n')
-                    del query['kql']
-                
-                # Add defaults
-                if 'platform' not in query:
-                    query['platform'] = 'Microsoft Defender'
-                if 'category' not in query:
-                    query['category'] = 'Network'
-                if 'tables' not in query:
-                    query['tables'] = self._extract_tables(query.get('query', ''))
+    def _prepare_queries(self, queries: List[Dict], article: Dict) -> List[Dict]:
+        """Add article metadata and defaults to the queries of an LLM query response"""
+        queries = [query for query in queries if isinstance(query, dict)]
+        for query in queries:
+            query['article_title'] = article['title']
+            query['threat_risk'] = article.get('threat_risk', 'UNKNOWN')
             
-            return queries
+            # Clean up KQL (unescape newlines)
+            if 'kql' in query:
+                query['query'] = query['kql'].replace('\\n', '\n')
+                del query['kql']
             
-        except json.JSONDecodeError as e:
-            log_error(f"Failed to parse query JSON: {e}")
-            return []
+            # Add defaults
+            if 'platform' not in query:
+                query['platform'] = 'Microsoft Defender'
+            if 'category' not in query:
+                query['category'] = 'Network'
+            if 'tables' not in query:
+                query['tables'] = self._extract_tables(query.get('query', ''))
+        
+        return queries
     
     def _extract_tables(self, kql: str) -> List[str]:
         """Extract table names from KQL query"""
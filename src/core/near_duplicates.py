@@ -0,0 +1,188 @@
+# near_duplicates.py
+"""
+Near-duplicate story detection ahead of the LLM stages.
+
+The same story often arrives from several outlets (syndicated copies, vendor
+blog reposts), and each copy would otherwise get its own filter and analysis
+LLM calls. Every article gets a 64-bit SimHash of its word 3-shingles, and
+articles whose fingerprints differ in at most NEAR_DUP_MAX_DISTANCE bits count
+as the same story. Only the first copy (the representative) is filtered and
+analyzed. The other copies are stored with the representative's analysis and
+with duplicate_of set to its id. New articles are also matched against
+articles analyzed in the last NEAR_DUP_LOOKBACK_DAYS days, whose analysis is
+reused directly.
+
+Lookups use banding: the fingerprint is split into NEAR_DUP_MAX_DISTANCE + 1
+bands. Two fingerprints within that distance must agree exactly on at least
+one band, so only articles that share a band are compared.
+"""
+
+import datetime
+import hashlib
+import json
+import re
+import threading
+
+from src.config import NEAR_DUP_DETECTION_ENABLED, NEAR_DUP_MAX_DISTANCE, NEAR_DUP_LOOKBACK_DAYS
+from src.utils.db_utils import get_recent_article_fingerprints, store_article_fingerprints, store_analyzed_data
+from src.utils.logging_utils import log_info, log_debug
+from src.utils.url_utils import canonicalize_url
+
+_BITS = 64
+_SHINGLE_SIZE = 3
+_MIN_SHINGLES = 20  # Shorter texts are too small to fingerprint reliably
+_WORD_RE = re.compile(r"\w+")
+# Byte values with a given bit set, for summing bit votes per byte position
+_VALUES_WITH_BIT = [[value for value in range(256) if value >> bit & 1] for bit in range(8)]
+_ANALYSIS_FIELDS = ('summary', 'threat_risk', 'category', 'recommendations')
+
+
+def simhash(text):
+    """64-bit SimHash of the text's word 3-shingles, or None when the text is too short."""
+    words = _WORD_RE.findall((text or '').lower())
+    shingles = {' '.join(words[i:i + _SHINGLE_SIZE]) for i in range(len(words) - _SHINGLE_SIZE + 1)}
+    if len(shingles) < _MIN_SHINGLES:
+        return None
+    # Count, per digest byte position, how often each byte value occurs; bit votes are summed afterwards
+    counts = [[0] * 256 for _ in range(_BITS // 8)]
+    for shingle in shingles:
+        digest = hashlib.blake2b(shingle.encode('utf-8'), digest_size=_BITS // 8).digest()
+        for position, value in enumerate(digest):
+            counts[position][value] += 1
+    threshold = len(shingles) / 2
+    fingerprint = 0
+    for position, value_counts in enumerate(counts):
+        for bit, values in enumerate(_VALUES_WITH_BIT):
+            if sum(value_counts[value] for value in values) > threshold:
+                fingerprint |= 1 << (position * 8 + bit)
+    return fingerprint
+
+
+def _to_db(fingerprint):
+    """SQLite integers are signed 64-bit."""
+    return fingerprint - (1 << _BITS) if fingerprint >= 1 << (_BITS - 1) else fingerprint
+
+
+def _from_db(value):
+    return value & ((1 << _BITS) - 1)
+
+
+class NearDuplicateDetector:
+    """Groups the articles of one run into stories; thread-safe.
+
+    check() is called once per new article: the first article of a story is
+    kept as its representative, later copies are held back. After the
+    representatives are analyzed and stored, store_duplicates() stores the
+    held-back copies linked to them.
+    """
+
+    def __init__(self, max_distance=None, lookback_days=None):
+        self.enabled = NEAR_DUP_DETECTION_ENABLED
+        self.max_distance = NEAR_DUP_MAX_DISTANCE if max_distance is None else max_distance
+        bands = self.max_distance + 1
+        width = _BITS // bands
+        self._bands = [
+            (i * width, (1 << ((_BITS if i == bands - 1 else (i + 1) * width) - i * width)) - 1)
+            for i in range(bands)
+        ]
+        self._index = {}
+        self.duplicates = []  # (article, (kind, representative)); kind is 'new' or 'stored'
+        self._lock = threading.Lock()
+        if self.enabled:
+            self._load_stored(NEAR_DUP_LOOKBACK_DAYS if lookback_days is None else lookback_days)
+
+    def _band_keys(self, fingerprint):
+        return [(i, (fingerprint >> shift) & mask) for i, (shift, mask) in enumerate(self._bands)]
+
+    def _add(self, fingerprint, ref):
+        for key in self._band_keys(fingerprint):
+            self._index.setdefault(key, []).append((fingerprint, ref))
+
+    def _find(self, fingerprint):
+        for key in self._band_keys(fingerprint):
+            for other, ref in self._index.get(key, ()):
+                if bin(fingerprint ^ other).count('1') <= self.max_distance:
+                    return ref
+        return None
+
+    def _load_stored(self, lookback_days):
+        since = datetime.date.today() - datetime.timedelta(days=lookback_days)
+        backfill = []
+        for row in get_recent_article_fingerprints(since):
+            if row['simhash'] is None:
+                fingerprint = simhash(row.pop('content'))
+                if fingerprint is None:
+                    continue
+                backfill.append((_to_db(fingerprint), row['id']))
+            else:
+                fingerprint = _from_db(row['simhash'])
+            self._add(fingerprint, ('stored', row))
+        store_article_fingerprints(backfill)
+
+    def fingerprint(self, article):
+        """Compute and set article['simhash'] ahead of check(), e.g. outside a caller's lock."""
+        if self.enabled and 'simhash' not in article:
+            fingerprint = simhash(article.get('content'))
+            article['simhash'] = None if fingerprint is None else _to_db(fingerprint)
+
+    def check(self, article):
+        """Return True if article repeats a story already seen (it is held back), else False."""
+        if not self.enabled:
+            return False
+        self.fingerprint(article)
+        if article['simhash'] is None:
+            return False
+        fingerprint = _from_db(article['simhash'])
+        with self._lock:
+            match = self._find(fingerprint)
+            if match is None:
+                self._add(fingerprint, ('new', article))
+                return False
+            self.duplicates.append((article, match))
+        log_debug(f"Near-duplicate: '{article['title'][:60]}' repeats '{match[1]['title'][:60]}'")
+        return True
+
+    def remove_duplicates(self, articles):
+        """Return the articles that are not copies of a story already seen."""
+        representatives = [article for article in articles if not self.check(article)]
+        held_back = len(articles) - len(representatives)
+        if held_back:
+            log_info(f"Held back {held_back} near-duplicate copies; {len(representatives)} articles go to filtering")
+        return representatives
+
+    def store_duplicates(self, article_ids, not_relevant=()):
+        """Store held-back copies with their representative's analysis.
+
+        article_ids is the (article_id, article) list returned by
+        store_analyzed_data for the representatives. Copies of representatives
+        that were not stored (judged irrelevant, analysis failed) are dropped.
+        Returns the dropped copies whose representative is in not_relevant
+        (the articles judged not relevant), which count as judged too.
+        """
+        stored_ids = {canonicalize_url(data['url']): article_id for article_id, data in article_ids}
+        irrelevant_urls = {canonicalize_url(article['url']) for article in not_relevant}
+        rows = []
+        judged_copies = []
+        for article, (kind, representative) in self.duplicates:
+            if kind == 'stored':
+                representative_id = representative['duplicate_of'] or representative['id']
+                analysis = dict(representative)
+                try:
+                    analysis['recommendations'] = json.loads(analysis['recommendations'] or '[]')
+                except ValueError:
+                    analysis['recommendations'] = []
+            else:
+                representative_id = stored_ids.get(canonicalize_url(representative['url']))
+                if representative_id is None:
+                    if canonicalize_url(representative['url']) in irrelevant_urls:
+                        judged_copies.append(article)
+                    continue
+                analysis = representative
+            row = dict(article, duplicate_of=representative_id)
+            row.update({field: analysis.get(field) for field in _ANALYSIS_FIELDS})
+            rows.append(row)
+        self.duplicates = []
+        if rows:
+            log_info(f"Storing {len(rows)} near-duplicate copies linked to already analyzed stories")
+            store_analyzed_data(rows)
+        return judged_copies
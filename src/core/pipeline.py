@@ -0,0 +1,217 @@
+# pipeline.py
+"""
+Streaming fetch → filter → analyze pipeline.
+
+The phased pipeline waits for every article to be fetched before filtering
+starts, and for every article to be filtered before analysis starts. Here the
+three stages run at the same time and are connected by bounded queues: an
+article is handed to the filter workers as soon as it is scraped, and to the
+analysis workers as soon as it is judged relevant. A full queue blocks the
+stage feeding it (backpressure), so a slow LLM holds fetching back instead of
+letting scraped articles pile up in memory. Wall time approaches the slowest
+stage rather than the sum of all three.
+
+Filter workers ask the LLM about up to RELEVANCE_BATCH_SIZE articles at a
+time, waiting at most RELEVANCE_BATCH_WAIT_SECONDS for a batch to fill.
+"""
+
+import queue
+import sys
+import threading
+import time
+
+from src.config import (
+    THREADS_FILTER, THREADS_ANALYZE, ENABLE_PHASED_MULTITHREADING, STREAM_QUEUE_SIZE, RELEVANCE_BATCH_SIZE,
+    RELEVANCE_BATCH_WAIT_SECONDS,
+)
+from src.core.filtering import decide_relevance_locally, classify_relevance_batch, log_filter_run_summary
+from src.core.analysis import analyze_article_with_llm
+from src.utils.logging_utils import log_info, log_success, log_warn, BColors
+
+_DONE = object()  # End-of-stream marker, one per downstream worker
+
+
+class _StageTimer:
+    """Wall-clock span of a stage: first item started to last item finished."""
+
+    def __init__(self):
+        self.first = None
+        self.last = None
+        self._lock = threading.Lock()
+
+    def mark(self):
+        now = time.time()
+        with self._lock:
+            if self.first is None:
+                self.first = now
+            self.last = now
+
+    def span(self, origin):
+        if self.first is None:
+            return "idle"
+        return f"{self.first - origin:.0f}s → {self.last - origin:.0f}s"
+
+
+def run_streaming_pipeline(fetch_fn, article_limit=None, queue_size=None,
+                           filter_workers=None, analyze_workers=None, near_duplicates=None, not_relevant=None):
+    """Fetch, filter and analyze articles concurrently.
+
+    fetch_fn(on_article) runs one of the fetch engines, calling on_article for
+    every scraped article. Returns (relevant_articles, analyzed_articles) like
+    the filter and analysis phases of the phased pipeline. With article_limit,
+    only the first N scraped articles with content are passed on. With a
+    NearDuplicateDetector, copies of a story already seen are held back in it
+    instead of being passed on. Articles judged not relevant are appended to
+    the not_relevant list, if given.
+    """
+    queue_size = queue_size or STREAM_QUEUE_SIZE
+    if ENABLE_PHASED_MULTITHREADING:
+        filter_workers = filter_workers or THREADS_FILTER
+        analyze_workers = analyze_workers or THREADS_ANALYZE
+    else:
+        filter_workers = filter_workers or 1
+        analyze_workers = analyze_workers or 1
+
+    to_filter = queue.Queue(maxsize=queue_size)
+    to_analyze = queue.Queue(maxsize=queue_size)
+    relevant_articles = []
+    analyzed_articles = []
+    counts = {'fetched': 0, 'forwarded': 0, 'duplicates': 0, 'checked': 0}
+    lock = threading.Lock()
+    output_lock = threading.Lock()
+    fetch_timer, filter_timer, analyze_timer = _StageTimer(), _StageTimer(), _StageTimer()
+    started = time.time()
+
+    def status(msg):
+        # Print above whatever progress bar the fetch engine is drawing; it redraws on its next update
+        with output_lock:
+            sys.stdout.write(f"\r\033[K{msg}\n")
+            sys.stdout.flush()
+
+    def on_article(article):
+        fetch_timer.mark()
+        if near_duplicates is not None and article.get('content'):
+            # SimHash of the whole text; computed before taking the lock every fetch worker shares
+            near_duplicates.fingerprint(article)
+        with lock:
+            counts['fetched'] += 1
+            if article_limit and counts['forwarded'] >= article_limit:
+                return
+            if not article.get('content'):
+                return
+            if near_duplicates is not None and near_duplicates.check(article):
+                counts['duplicates'] += 1
+                return
+            counts['forwarded'] += 1
+        # Blocks while the filter stage is behind, which pauses the fetch worker
+        to_filter.put(article)
+
+    def fetch_stage():
+        try:
+            fetch_fn(on_article)
+        except Exception as e:
+            log_warn(f"Fetch stage failed: {e}")
+        finally:
+            for _ in range(filter_workers):
+                to_filter.put(_DONE)
+
+    def settle(article, is_relevant):
+        filter_timer.mark()
+        with lock:
+            counts['checked'] += 1
+            if is_relevant:
+                relevant_articles.append(article)
+            elif is_relevant is False and not_relevant is not None:
+                not_relevant.append(article)
+        if is_relevant:
+            status(f"{BColors.OKGREEN}[RELEVANT]{BColors.ENDC} {article['title']}")
+            to_analyze.put(article)
+
+    def filter_worker():
+        # Articles the keywords, the verdict cache or the local model cannot decide are
+        # gathered (up to RELEVANCE_BATCH_SIZE, waiting at most RELEVANCE_BATCH_WAIT_SECONDS
+        # for more) and asked about in one LLM request
+        done = False
+        while not done:
+            article = to_filter.get()
+            if article is _DONE:
+                return
+            batch = []
+            deadline = None
+            while True:
+                try:
+                    is_relevant, pending = decide_relevance_locally(article, batched=RELEVANCE_BATCH_SIZE > 1)
+                except Exception:
+                    is_relevant, pending = None, None
+                if pending is None:
+                    settle(article, is_relevant)
+                else:
+                    batch.append((article, pending))
+                    deadline = deadline or time.monotonic() + RELEVANCE_BATCH_WAIT_SECONDS
+                if not batch:
+                    break  # Nothing waiting for the LLM; block for the next article
+                if len(batch) >= RELEVANCE_BATCH_SIZE:
+                    break
+                try:
+                    article = to_filter.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if article is _DONE:
+                    done = True
+                    break
+            if batch:
+                try:
+                    verdicts = classify_relevance_batch(batch)
+                except Exception:
+                    verdicts = [None] * len(batch)
+                for (article, _), is_relevant in zip(batch, verdicts):
+                    settle(article, is_relevant)
+
+    def analyze_worker():
+        while True:
+            article = to_analyze.get()
+            if article is _DONE:
+                return
+            try:
+                llm_analysis, _ = analyze_article_with_llm(article)
+            except Exception:
+                llm_analysis = None
+            analyze_timer.mark()
+            if llm_analysis:
+                article.update(llm_analysis)
+                with lock:
+                    analyzed_articles.append(article)
+                status(f"{BColors.OKGREEN}[ANALYZED]{BColors.ENDC} {article['title']} (Risk: {article.get('threat_risk')})")
+
+    log_info(f"Streaming pipeline: {filter_workers} filter / {analyze_workers} analysis workers, queue depth {queue_size}")
+    fetcher = threading.Thread(target=fetch_stage, name="stream-fetch", daemon=True)
+    filters = [threading.Thread(target=filter_worker, name=f"stream-filter-{i}", daemon=True) for i in range(filter_workers)]
+    analyzers = [threading.Thread(target=analyze_worker, name=f"stream-analyze-{i}", daemon=True) for i in range(analyze_workers)]
+    for thread in [fetcher] + filters + analyzers:
+        thread.start()
+
+    fetcher.join()
+    for thread in filters:
+        thread.join()
+    for _ in range(analyze_workers):
+        to_analyze.put(_DONE)
+    for thread in analyzers:
+        thread.join()
+
+    elapsed = time.time() - started
+    sys.stdout.write('\n')
+    sys.stdout.flush()
+    if article_limit and counts['fetched'] > counts['forwarded']:
+        log_info(f"Limited to {article_limit} articles as requested.")
+    if counts['duplicates']:
+        log_info(f"Held back {counts['duplicates']} near-duplicate copies of stories already seen")
+    log_info(
+        f"Stage activity — fetch: {fetch_timer.span(started)} | "
+        f"filter: {filter_timer.span(started)} | analyze: {analyze_timer.span(started)}"
+    )
+    log_success(
+        f"Streamed {counts['fetched']} fetched → {counts['checked']} checked → {len(relevant_articles)} relevant → "
+        f"{len(analyzed_articles)} analyzed in {elapsed:.1f}s"
+    )
+    log_filter_run_summary()
+    return relevant_articles, analyzed_articles
@@ -0,0 +1,186 @@
+# politeness.py
+import datetime
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+from src.config import (
+    HOST_REQUESTS_PER_SECOND,
+    HOST_BURST,
+    BACKOFF_BASE_SECONDS,
+    BACKOFF_MAX_SECONDS,
+    CIRCUIT_BREAKER_THRESHOLD,
+    CIRCUIT_BREAKER_COOLDOWN,
+)
+
+
+class HostCircuitOpenError(Exception):
+    """Raised when a host's circuit breaker is open and requests to it are being skipped."""
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds, or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (when - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+class _HostState:
+    """Token bucket, backoff and circuit breaker state for a single host."""
+
+    def __init__(self, burst):
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+        self.not_before = 0.0            # Earliest time the next request may start (backoff / Retry-After)
+        self.consecutive_failures = 0
+        self.circuit_open_until = 0.0
+        self.trial_started = 0.0         # When the half-open circuit's one trial request was let through
+        self.requests = 0
+        self.throttled = 0               # 429 responses
+        self.server_errors = 0           # 5xx responses
+        self.blocked = 0                 # 401/403 responses
+        self.skipped = 0                 # Requests refused while the circuit was open
+
+
+class HostScheduler:
+    """Per-host politeness scheduler shared by all fetch workers.
+
+    Each host gets a token bucket (HOST_REQUESTS_PER_SECOND, bursting to
+    HOST_BURST). 429 and 5xx responses push the host back exponentially, or
+    by the server's Retry-After when given. After CIRCUIT_BREAKER_THRESHOLD
+    consecutive failures the host's circuit opens for CIRCUIT_BREAKER_COOLDOWN
+    seconds. While it is open, reserve() raises HostCircuitOpenError instead
+    of letting workers hammer a failing site. Once the cooldown passes the
+    circuit is half-open: one trial request is let through and every other
+    request is still refused until the trial's outcome is recorded. A failed
+    trial reopens the circuit; any other response closes it. A trial that
+    never reports back frees its slot after another cooldown.
+
+    The scheduler never sleeps itself: reserve() returns how long the caller
+    must wait, so thread workers can time.sleep() and asyncio tasks can
+    await asyncio.sleep() on the same shared state.
+    """
+
+    def __init__(self, rate=None, burst=None, backoff_base=None, backoff_max=None,
+                 failure_threshold=None, cooldown=None):
+        self.rate = rate or HOST_REQUESTS_PER_SECOND
+        self.burst = burst or HOST_BURST
+        self.backoff_base = backoff_base or BACKOFF_BASE_SECONDS
+        self.backoff_max = backoff_max or BACKOFF_MAX_SECONDS
+        self.failure_threshold = failure_threshold or CIRCUIT_BREAKER_THRESHOLD
+        self.cooldown = cooldown or CIRCUIT_BREAKER_COOLDOWN
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _state(self, url):
+        host = urlparse(url).netloc or url
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.burst)
+        return state
+
+    def reserve(self, url):
+        """Reserve a request slot for url's host and return the delay (seconds) before sending it."""
+        with self._lock:
+            state = self._state(url)
+            now = time.monotonic()
+            if state.circuit_open_until > now:
+                state.skipped += 1
+                raise HostCircuitOpenError(f"circuit open for {urlparse(url).netloc} ({int(state.circuit_open_until - now)}s left)")
+            if state.circuit_open_until:
+                # Half-open: this request is the trial unless one is already in flight
+                if now - state.trial_started < self.cooldown:
+                    state.skipped += 1
+                    raise HostCircuitOpenError(f"circuit half-open for {urlparse(url).netloc} (trial request in flight)")
+                state.trial_started = now
+            # Refill, then take a token; a negative balance is a reservation further in the future
+            state.tokens = min(self.burst, state.tokens + (now - state.last_refill) * self.rate)
+            state.last_refill = now
+            state.tokens -= 1
+            delay = 0.0 if state.tokens >= 0 else -state.tokens / self.rate
+            state.requests += 1
+            return max(delay, state.not_before - now)
+
+    def record_response(self, url, status_code, retry_after=None):
+        """Update a host's backoff/circuit state from an HTTP response status."""
+        with self._lock:
+            state = self._state(url)
+            if status_code == 429 or status_code >= 500:
+                if status_code == 429:
+                    state.throttled += 1
+                else:
+                    state.server_errors += 1
+                self._register_failure(state, parse_retry_after(retry_after))
+            elif status_code in (401, 403):
+                # Bot blocking: no point retrying, but it counts towards the breaker
+                state.blocked += 1
+                self._register_failure(state, None)
+            elif status_code < 400 or state.circuit_open_until:
+                # The host answered: ends the failure streak and closes a half-open circuit
+                state.consecutive_failures = 0
+                state.circuit_open_until = 0.0
+                state.trial_started = 0.0
+
+    def record_failure(self, url):
+        """Register a connection error/timeout for url's host."""
+        with self._lock:
+            self._register_failure(self._state(url), None)
+
+    def _register_failure(self, state, retry_after):
+        now = time.monotonic()
+        state.consecutive_failures += 1
+        if retry_after is not None:
+            backoff = min(retry_after, self.backoff_max)
+        else:
+            backoff = min(self.backoff_base * (2 ** (state.consecutive_failures - 1)), self.backoff_max)
+            backoff *= random.uniform(0.8, 1.2)  # Jitter so workers don't retry in lockstep
+        state.not_before = max(state.not_before, now + backoff)
+        if state.consecutive_failures >= self.failure_threshold:
+            state.circuit_open_until = now + self.cooldown
+            state.trial_started = 0.0
+
+    def is_retryable(self, status_code):
+        """Whether a response status warrants another attempt after backing off."""
+        return status_code == 429 or status_code >= 500
+
+    def summary(self):
+        """Per-host counters for hosts that were throttled, failing or skipped."""
+        with self._lock:
+            now = time.monotonic()
+            return {
+                host: {
+                    'requests': s.requests,
+                    'throttled': s.throttled,
+                    'server_errors': s.server_errors,
+                    'blocked': s.blocked,
+                    'skipped': s.skipped,
+                    'circuit_open': s.circuit_open_until > now,
+                }
+                for host, s in self._hosts.items()
+                if s.throttled or s.server_errors or s.blocked or s.skipped
+            }
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_host_scheduler():
+    """Return the process-wide HostScheduler (state persists across fetch runs)."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = HostScheduler()
+    return _scheduler
@@ -0,0 +1,278 @@
+# relevance_model.py
+"""
+Local relevance classifier used as a gate in front of the LLM filter.
+
+Articles already judged in the database are the labels: rows marked
+NOT_RELEVANT are negatives, analyzed rows (HIGH/MEDIUM/LOW/INFORMATIONAL)
+are positives. The model is hashed TF-IDF over word unigrams and bigrams
+(title words also get their own features) with logistic regression, in plain
+Python so it needs no extra packages. python main.py --train-relevance
+trains it, prints hold-out metrics and writes it to RELEVANCE_MODEL_PATH.
+
+At filter time the model decides an article directly when its probability is
+at least RELEVANCE_MODEL_THRESHOLD either way. Only the uncertain band in
+between goes to the LLM. A RELEVANCE_MODEL_AUDIT_RATE share of the confident
+decisions is also sent to the LLM, to measure agreement in production.
+"""
+
+import datetime
+import json
+import math
+import os
+import random
+import re
+import threading
+import zlib
+
+from src.config import (
+    RELEVANCE_MODEL_ENABLED, RELEVANCE_MODEL_PATH, RELEVANCE_MODEL_THRESHOLD,
+    RELEVANCE_MODEL_AUDIT_RATE, RELEVANCE_MODEL_MIN_EXAMPLES,
+)
+from src.utils.logging_utils import log_info, log_warn, log_debug
+
+_DIMENSIONS = 1 << 18
+_CONTENT_CHARS = 3000
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9_\-\.]*[a-z0-9]|[a-z0-9]")
+_EPOCHS = 30
+_L2 = 1e-4
+_EVAL_THRESHOLDS = (0.7, 0.8, 0.9, 0.95, 0.99)
+
+
+def _features(title, content):
+    """Hashed feature counts of an article: title words, body unigrams and bigrams."""
+    counts = {}
+    title_words = _WORD_RE.findall((title or '').lower())
+    words = title_words + _WORD_RE.findall((content or '')[:_CONTENT_CHARS].lower())
+    tokens = [f"t:{word}" for word in title_words]
+    tokens += words
+    tokens += [f"{first} {second}" for first, second in zip(words, words[1:])]
+    for token in tokens:
+        index = zlib.crc32(token.encode('utf-8')) & (_DIMENSIONS - 1)
+        counts[index] = counts.get(index, 0) + 1
+    return counts
+
+
+class RelevanceModel:
+    """Hashed TF-IDF + logistic regression relevance model."""
+
+    def __init__(self, weights=None, bias=0.0, idf=None, default_idf=1.0, info=None):
+        self.weights = weights or {}
+        self.bias = bias
+        self.idf = idf or {}
+        self.default_idf = default_idf
+        self.info = info or {}
+
+    def _vector(self, counts):
+        """Sublinear TF x IDF, L2-normalized."""
+        vector = {index: (1 + math.log(count)) * self.idf.get(index, self.default_idf)
+                  for index, count in counts.items()}
+        norm = math.sqrt(sum(value * value for value in vector.values())) or 1.0
+        return {index: value / norm for index, value in vector.items()}
+
+    def _score(self, vector):
+        z = self.bias + sum(self.weights.get(index, 0.0) * value for index, value in vector.items())
+        return 1 / (1 + math.exp(-max(-30.0, min(30.0, z))))
+
+    def probability(self, article):
+        """Probability that the article is relevant."""
+        return self._score(self._vector(_features(article.get('title'), article.get('content'))))
+
+    @classmethod
+    def train(cls, examples, seed=0):
+        """Fit on (title, content, label) examples; label 1 = relevant, 0 = not relevant."""
+        feature_rows = [_features(title, content) for title, content, _ in examples]
+        labels = [label for _, _, label in examples]
+        document_frequency = {}
+        for counts in feature_rows:
+            for index in counts:
+                document_frequency[index] = document_frequency.get(index, 0) + 1
+        total = len(feature_rows)
+        model = cls(
+            idf={index: math.log((1 + total) / (1 + df)) + 1 for index, df in document_frequency.items()},
+            default_idf=math.log(1 + total) + 1,
+        )
+        vectors = [model._vector(counts) for counts in feature_rows]
+
+        # Balanced class weights: the NOT_RELEVANT class is usually much smaller
+        positives = sum(labels)
+        class_weight = {
+            1: total / (2 * max(1, positives)),
+            0: total / (2 * max(1, total - positives)),
+        }
+        rng = random.Random(seed)
+        order = list(range(total))
+        for epoch in range(_EPOCHS):
+            rng.shuffle(order)
+            rate = 0.5 / (1 + 0.2 * epoch)
+            for i in order:
+                vector, label = vectors[i], labels[i]
+                gradient = (model._score(vector) - label) * class_weight[label]
+                model.bias -= rate * gradient
+                for index, value in vector.items():
+                    weight = model.weights.get(index, 0.0)
+                    model.weights[index] = weight - rate * (gradient * value + _L2 * weight)
+        model.weights = {index: weight for index, weight in model.weights.items() if abs(weight) > 1e-6}
+        return model
+
+    def save(self, path=None):
+        path = path or RELEVANCE_MODEL_PATH
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': 1,
+                'dimensions': _DIMENSIONS,
+                'bias': self.bias,
+                'default_idf': self.default_idf,
+                'weights': {str(index): round(weight, 6) for index, weight in self.weights.items()},
+                'idf': {str(index): round(value, 4) for index, value in self.idf.items()},
+                'info': self.info,
+            }, f)
+
+    @classmethod
+    def load(cls, path=None):
+        with open(path or RELEVANCE_MODEL_PATH, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('dimensions') != _DIMENSIONS:
+            raise ValueError("model was trained with a different feature space; retrain it")
+        return cls(
+            weights={int(index): weight for index, weight in data['weights'].items()},
+            bias=data['bias'],
+            idf={int(index): value for index, value in data['idf'].items()},
+            default_idf=data['default_idf'],
+            info=data.get('info', {}),
+        )
+
+
+def evaluate(model, examples, thresholds=_EVAL_THRESHOLDS):
+    """Hold-out metrics per confidence threshold.
+
+    coverage is the share of articles the model decides without the LLM;
+    agreement the share of those decisions matching the label; missed the
+    relevant articles it would drop (the costly error for a SOC).
+    """
+    scored = [(model.probability({'title': title, 'content': content}), label)
+              for title, content, label in examples]
+    results = []
+    for threshold in thresholds:
+        decided = [(probability >= threshold, label) for probability, label in scored
+                   if probability >= threshold or probability <= 1 - threshold]
+        results.append({
+            'threshold': threshold,
+            'coverage': len(decided) / len(scored) if scored else 0.0,
+            'agreement': sum(1 for verdict, label in decided if verdict == bool(label)) / len(decided) if decided else None,
+            'missed': sum(1 for verdict, label in decided if label and not verdict),
+        })
+    accuracy = sum(1 for probability, label in scored if (probability >= 0.5) == bool(label)) / len(scored) if scored else None
+    return {'accuracy': accuracy, 'examples': len(scored), 'thresholds': results}
+
+
+def train_from_examples(examples, holdout=0.2, seed=0):
+    """Evaluate on a stratified hold-out split, then fit the final model on all examples.
+
+    Returns (model, metrics); raises ValueError when either class has fewer
+    than RELEVANCE_MODEL_MIN_EXAMPLES examples.
+    """
+    positives = [example for example in examples if example[2]]
+    negatives = [example for example in examples if not example[2]]
+    if min(len(positives), len(negatives)) < RELEVANCE_MODEL_MIN_EXAMPLES:
+        raise ValueError(
+            f"need at least {RELEVANCE_MODEL_MIN_EXAMPLES} relevant and not-relevant articles "
+            f"(have {len(positives)} and {len(negatives)})"
+        )
+    rng = random.Random(seed)
+    train_set, test_set = [], []
+    for group in (positives, negatives):
+        group = group[:]
+        rng.shuffle(group)
+        cut = max(1, int(len(group) * holdout))
+        test_set += group[:cut]
+        train_set += group[cut:]
+    metrics = evaluate(RelevanceModel.train(train_set, seed=seed), test_set)
+
+    model = RelevanceModel.train(examples, seed=seed)
+    model.info = {
+        'trained_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'relevant_examples': len(positives),
+        'not_relevant_examples': len(negatives),
+        'holdout': metrics,
+    }
+    return model, metrics
+
+
+class RelevanceGate:
+    """Loaded model plus per-run decision counters (thread-safe).
+
+    decide() returns True/False for confident articles and None for the
+    uncertain band. record_audit() tallies model/LLM agreement on audited
+    decisions.
+    """
+
+    def __init__(self, model, threshold=None, audit_rate=None):
+        self.model = model
+        self.threshold = RELEVANCE_MODEL_THRESHOLD if threshold is None else threshold
+        self.audit_rate = RELEVANCE_MODEL_AUDIT_RATE if audit_rate is None else audit_rate
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.counts = {'relevant': 0, 'not_relevant': 0, 'deferred': 0, 'audited': 0, 'agreed': 0}
+
+    def decide(self, article):
+        probability = self.model.probability(article)
+        if probability >= self.threshold:
+            verdict, key = True, 'relevant'
+        elif probability <= 1 - self.threshold:
+            verdict, key = False, 'not_relevant'
+        else:
+            verdict, key = None, 'deferred'
+        with self._lock:
+            self.counts[key] += 1
+        log_debug(f"Relevance model: p={probability:.3f} for '{article.get('title', '')[:60]}'")
+        return verdict
+
+    def should_audit(self):
+        return self.audit_rate > 0 and random.random() < self.audit_rate
+
+    def record_audit(self, model_verdict, llm_verdict):
+        with self._lock:
+            self.counts['audited'] += 1
+            if model_verdict == llm_verdict:
+                self.counts['agreed'] += 1
+
+    def log_summary(self):
+        """Log and reset this run's counters."""
+        with self._lock:
+            counts = self.counts
+            self._reset()
+        decided = counts['relevant'] + counts['not_relevant']
+        total = decided + counts['deferred']
+        if not total:
+            return
+        message = (f"Relevance model decided {decided}/{total} articles without the LLM "
+                   f"({counts['relevant']} relevant, {counts['not_relevant']} not relevant, "
+                   f"{counts['deferred']} sent to LLM)")
+        if counts['audited']:
+            message += f"; agreed with the LLM on {counts['agreed']}/{counts['audited']} audited decisions"
+        log_info(message)
+
+
+_gate = None
+_gate_loaded = False
+_gate_lock = threading.Lock()
+
+
+def get_relevance_gate():
+    """The process-wide RelevanceGate, or None when disabled or no model has been trained."""
+    global _gate, _gate_loaded
+    if not _gate_loaded:
+        with _gate_lock:
+            if not _gate_loaded:
+                if RELEVANCE_MODEL_ENABLED and os.path.exists(RELEVANCE_MODEL_PATH):
+                    try:
+                        _gate = RelevanceGate(RelevanceModel.load())
+                    except (OSError, ValueError, KeyError) as e:
+                        log_warn(f"Could not load relevance model {RELEVANCE_MODEL_PATH}: {e}")
+                _gate_loaded = True
+    return _gate
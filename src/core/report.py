@@ -70,7 +70,11 @@ def generate_weekly_report():
     conn = sqlite3.connect(DATABASE_PATH)
     cursor = conn.cursor()
     start_date, end_date = get_last_full_week_dates()
-    cursor.execute("SELECT * FROM articles WHERE published_date BETWEEN ? AND ?", (start_date.isoformat(), end_date.isoformat()))
+    # Near-duplicate copies (duplicate_of set) would repeat a story already in the report
+    cursor.execute(
+        "SELECT * FROM articles WHERE published_date BETWEEN ? AND ? AND duplicate_of IS NULL",
+        (start_date.isoformat(), end_date.isoformat())
+    )
     all_weekly_articles = cursor.fetchall()
     conn.close()
     if not all_weekly_articles:
@@ -0,0 +1,238 @@
+# structured_output.py
+"""
+Schema-constrained JSON responses from the LLM.
+
+Analysis, IOC extraction and KQL generation ask for JSON. Free-text answers
+often came back malformed or incomplete, and analysis then re-sent its full
+8000-character prompt up to twice more. With LLM_STRUCTURED_OUTPUT,
+generate_json() passes the response's JSON schema as Ollama's `format`. The
+model's decoding is constrained to that schema, so the answer parses and
+has the required keys and enum values.
+
+Every answer is still validated against the schema. Truncated or invalid
+answers go through the caller's repair function. Ollama versions that
+predate schema formats reject them with HTTP 400; the client then falls back
+to plain JSON mode (`format: "json"`) for the rest of the process. With
+structured output disabled, the prompt alone asks for JSON and the caller's
+parser stays the gate; schema violations are then only counted.
+
+Outcomes are counted per model and purpose (valid, invalid JSON, schema
+mismatch, request error, retries). log_structured_output_summary() logs them
+and adds them to the llm_output_stats table; python main.py --llm-stats
+compares models.
+"""
+
+import json
+import threading
+
+import requests
+
+from src.config import OLLAMA_MODEL, LLM_STRUCTURED_OUTPUT
+from src.utils import ollama_client
+from src.utils.db_utils import add_llm_output_stats
+from src.utils.json_repair import loads_tolerant
+from src.utils.logging_utils import log_info, log_warn, log_debug
+
+RISK_LEVELS = ['HIGH', 'MEDIUM', 'LOW', 'INFORMATIONAL']
+ANALYSIS_CATEGORIES = ['Ransomware', 'Phishing', 'Vulnerability', 'Malware', 'Breach', 'General Security']
+IOC_TYPES = ['ips', 'domains', 'urls', 'hashes', 'cves', 'emails', 'filenames', 'registry_keys', 'techniques']
+
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "threat_risk": {"type": "string", "enum": RISK_LEVELS},
+        "category": {"type": "string", "enum": ANALYSIS_CATEGORIES},
+        "recommendations": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"title": {"type": "string"}, "description": {"type": "string"}},
+                "required": ["title", "description"],
+            },
+        },
+    },
+    "required": ["summary", "threat_risk", "category", "recommendations"],
+}
+
+_IOC_ITEM_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "value": {"type": "string"},
+        "context": {"type": "string", "enum": ["attacker", "victim", "infrastructure"]},
+        "confidence": {"type": "string", "enum": ["high", "medium", "low"]},
+        "description": {"type": "string"},
+    },
+    "required": ["value", "context", "confidence", "description"],
+}
+
+IOC_SCHEMA = {
+    "type": "object",
+    "properties": {ioc_type: {"type": "array", "items": _IOC_ITEM_SCHEMA} for ioc_type in IOC_TYPES},
+    "required": IOC_TYPES,
+}
+
+KQL_QUERIES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "queries": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "type": {"type": "string"},
+                    "description": {"type": "string"},
+                    "platform": {"type": "string"},
+                    "kql": {"type": "string"},
+                },
+                "required": ["name", "type", "description", "platform", "kql"],
+            },
+        },
+    },
+    "required": ["queries"],
+}
+
+# skip is true (other fields empty) when the article has no huntable behaviour
+BEHAVIORAL_QUERY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "skip": {"type": "boolean"},
+        "name": {"type": "string"},
+        "type": {"type": "string"},
+        "description": {"type": "string"},
+        "tables": {"type": "array", "items": {"type": "string"}},
+        "mitre_techniques": {"type": "array", "items": {"type": "string"}},
+        "query": {"type": "string"},
+    },
+    "required": ["skip", "name", "type", "description", "tables", "mitre_techniques", "query"],
+}
+
+_JSON_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "boolean": bool,
+    "number": (int, float),
+    "integer": int,
+}
+
+_schema_format_supported = True
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def validate(instance, schema, path='$'):
+    """Schema violations of instance as a list of messages (empty when valid).
+
+    Covers the JSON Schema subset the schemas above use: type, properties,
+    required, items and enum.
+    """
+    expected = schema.get("type")
+    if expected:
+        python_type = _JSON_TYPES[expected]
+        # bool is an int subclass; JSON true is not a number
+        if not isinstance(instance, python_type) or (expected in ("number", "integer") and isinstance(instance, bool)):
+            return [f"{path}: expected {expected}, got {type(instance).__name__}"]
+    errors = []
+    if "enum" in schema and instance not in schema["enum"]:
+        errors.append(f"{path}: {instance!r} is not one of {schema['enum']}")
+    if isinstance(instance, dict):
+        for key in schema.get("required", []):
+            if key not in instance:
+                errors.append(f"{path}: missing '{key}'")
+        for key, subschema in schema.get("properties", {}).items():
+            if key in instance:
+                errors += validate(instance[key], subschema, f"{path}.{key}")
+    if isinstance(instance, list) and "items" in schema:
+        for index, item in enumerate(instance):
+            errors += validate(item, schema["items"], f"{path}[{index}]")
+    return errors
+
+
+def extract_json_object(text):
+    """The JSON object in text, repaired if needed (see src/utils/json_repair.py), or None."""
+    parsed = loads_tolerant(text)
+    if not isinstance(parsed, dict):
+        log_debug(f"Could not parse LLM JSON: {text[:200]!r}")
+        return None
+    return parsed
+
+
+def _record(purpose, mode, outcome, retry):
+    with _stats_lock:
+        stats = _stats.setdefault((OLLAMA_MODEL, purpose, mode), {
+            'calls': 0, 'valid': 0, 'invalid_json': 0, 'schema_mismatch': 0, 'errors': 0, 'retries': 0,
+        })
+        stats['calls'] += 1
+        stats[outcome] += 1
+        stats['retries'] += 1 if retry else 0
+
+
+def generate_json(prompt, schema, purpose, repair=None, retry=False, **generate_kwargs):
+    """Ask the LLM for a JSON object matching schema; returns the object or None.
+
+    repair(text) salvages an answer json.loads rejects (default:
+    extract_json_object). retry marks the call as a repeat of a failed one,
+    for the retry rate. generate_kwargs go to ollama_client.generate();
+    requests.RequestException propagates.
+    """
+    global _schema_format_supported
+    repair = repair or extract_json_object
+    if not LLM_STRUCTURED_OUTPUT:
+        mode, response_format = 'free', None
+    elif _schema_format_supported:
+        mode, response_format = 'schema', schema
+    else:
+        mode, response_format = 'json', 'json'
+
+    try:
+        text = ollama_client.generate(prompt, purpose=purpose, format=response_format, **generate_kwargs)
+    except requests.HTTPError as e:
+        if mode == 'schema' and e.response is not None and e.response.status_code == 400:
+            # Ollama before 0.5 only knows format "json"
+            log_warn(f"Ollama rejected the JSON schema format ({e}); using plain JSON mode")
+            _schema_format_supported = False
+            return generate_json(prompt, schema, purpose, repair=repair, retry=retry, **generate_kwargs)
+        _record(purpose, mode, 'errors', retry)
+        raise
+    except requests.RequestException:
+        _record(purpose, mode, 'errors', retry)
+        raise
+
+    parsed = None
+    if mode != 'free':
+        try:
+            parsed = json.loads(text)
+        except ValueError:
+            parsed = None
+    if not isinstance(parsed, dict):
+        parsed = repair(text)
+    if not isinstance(parsed, dict):
+        _record(purpose, mode, 'invalid_json', retry)
+        return None
+
+    errors = validate(parsed, schema)
+    if errors:
+        _record(purpose, mode, 'schema_mismatch', retry)
+        log_debug(f"LLM {purpose} response does not match its schema: {'; '.join(errors[:3])}")
+        # Free-text mode keeps the caller's own checks as the gate
+        return parsed if mode == 'free' else None
+    _record(purpose, mode, 'valid', retry)
+    return parsed
+
+
+def log_structured_output_summary():
+    """Log this run's JSON outcomes, add them to the per-model totals in the database, and reset them."""
+    with _stats_lock:
+        stats = dict(_stats)
+        _stats.clear()
+    rows = []
+    for (model, purpose, mode), counts in sorted(stats.items()):
+        failed = counts['invalid_json'] + counts['schema_mismatch']
+        if failed or counts['retries'] or counts['errors']:
+            log_info(f"LLM JSON ({purpose}, {mode}): {counts['valid']}/{counts['calls']} valid, "
+                     f"{counts['invalid_json']} invalid JSON, {counts['schema_mismatch']} schema mismatches, "
+                     f"{counts['retries']} retries, {counts['errors']} request errors")
+        rows.append(dict(counts, model=model, purpose=purpose, mode=mode))
+    add_llm_output_stats(rows)
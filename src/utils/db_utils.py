@@ -1,8 +1,13 @@
 # db_utils.py
 import sqlite3
 import os
-from src.config import DATABASE_PATH
-from src.utils.logging_utils import log_success, log_error
+import datetime
+import threading
+from src.config import DATABASE_PATH, FETCH_ONLY_BATCH_SIZE
+from src.utils.logging_utils import log_success, log_error, log_info
+from src.utils.url_utils import canonicalize_url
+
+URL_LOOKUP_BATCH_SIZE = 500  # Canonical URLs per IN (...) query, below SQLite's variable limit
 
 def initialize_database():
     conn = sqlite3.connect(DATABASE_PATH)
@@ -53,6 +58,128 @@ def initialize_database():
         )
     """)
 
+    # Create RSS feed cache table (conditional GET validators per feed)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS feed_cache (
+            feed_url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            seen_guids TEXT,
+            window_start TEXT,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Create per-feed health table (updated on every poll)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS feed_health (
+            feed_url TEXT PRIMARY KEY,
+            last_polled_at TEXT,
+            last_status INTEGER,
+            last_latency_ms INTEGER,
+            avg_latency_ms REAL,
+            last_entry_count INTEGER,
+            last_new_entries INTEGER,
+            avg_new_entries REAL,
+            consecutive_failures INTEGER DEFAULT 0,
+            total_polls INTEGER DEFAULT 0,
+            total_failures INTEGER DEFAULT 0,
+            last_error TEXT,
+            next_poll_at TEXT,
+            last_content_at TEXT,
+            avg_new_per_hour REAL,
+            yield_polls INTEGER DEFAULT 0
+        )
+    """)
+    # Yield per hour, added after the first feed health tables were created
+    health_columns = [row[1] for row in cursor.execute("PRAGMA table_info(feed_health)")]
+    for column, column_type in (('last_content_at', 'TEXT'), ('avg_new_per_hour', 'REAL'),
+                                ('yield_polls', 'INTEGER DEFAULT 0')):
+        if column not in health_columns:
+            cursor.execute(f"ALTER TABLE feed_health ADD COLUMN {column} {column_type}")
+
+    # Create raw HTML store index (blobs live on disk under HTML_STORE_DIR)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS html_store (
+            url TEXT PRIMARY KEY,
+            content_hash TEXT NOT NULL,
+            size_bytes INTEGER,
+            content_type TEXT,
+            fetched_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            last_accessed TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Create learned per-domain content selector table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS domain_selectors (
+            domain TEXT PRIMARY KEY,
+            selector TEXT NOT NULL,
+            hits INTEGER DEFAULT 0,
+            misses INTEGER DEFAULT 0,
+            pages_since_validation INTEGER DEFAULT 0,
+            validated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Create LLM relevance verdict cache (see src/utils/verdict_cache.py)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS relevance_verdicts (
+            key TEXT PRIMARY KEY,
+            verdict INTEGER NOT NULL,
+            model TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            last_used_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Create daemon state table (key/value, lets a restarted daemon resume)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS daemon_state (
+            key TEXT PRIMARY KEY,
+            value TEXT,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Create per-article page download failures, counted towards FEED_CACHE_MAX_ENTRY_RETRIES
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS fetch_failures (
+            canonical_url TEXT PRIMARY KEY,
+            attempts INTEGER DEFAULT 0,
+            last_outcome TEXT,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Create per-model LLM JSON outcome totals (see src/core/structured_output.py)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS llm_output_stats (
+            model TEXT NOT NULL,
+            purpose TEXT NOT NULL,
+            mode TEXT NOT NULL,
+            calls INTEGER DEFAULT 0,
+            valid INTEGER DEFAULT 0,
+            invalid_json INTEGER DEFAULT 0,
+            schema_mismatch INTEGER DEFAULT 0,
+            errors INTEGER DEFAULT 0,
+            retries INTEGER DEFAULT 0,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (model, purpose, mode)
+        )
+    """)
+
+    # Add canonical_url to articles created before URL canonicalization
+    article_columns = [row[1] for row in cursor.execute("PRAGMA table_info(articles)")]
+    if 'canonical_url' not in article_columns:
+        cursor.execute("ALTER TABLE articles ADD COLUMN canonical_url TEXT")
+        _backfill_canonical_urls(cursor)
+    # Near-duplicate detection: SimHash fingerprint and the article a copy was linked to
+    for column in ('simhash', 'duplicate_of'):
+        if column not in article_columns:
+            cursor.execute(f"ALTER TABLE articles ADD COLUMN {column} INTEGER")
+
     # Helpful indexes for performance and deduplication
     try:
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_kql_article_id ON kql_queries(article_id)")
@@ -62,6 +189,10 @@ def initialize_database():
         cursor.execute(
             "CREATE UNIQUE INDEX IF NOT EXISTS idx_unique_kql ON kql_queries(article_id, query_name, kql_query)"
         )
+        # Dedup lookups for new feed entries go through this index
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_articles_canonical_url ON articles(canonical_url)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_html_store_hash ON html_store(content_hash)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_html_store_accessed ON html_store(last_accessed)")
     except sqlite3.Error:
         # Index creation is best-effort; continue even if older SQLite lacks feature
         pass
@@ -70,15 +201,374 @@ def initialize_database():
     conn.close()
     log_success("Database initialized successfully.")
 
-def get_existing_urls():
-    if not os.path.exists(DATABASE_PATH):
+def _backfill_canonical_urls(cursor):
+    """Fill canonical_url for existing articles; later copies of the same article stay NULL."""
+    seen = set()
+    updates = []
+    for article_id, url in cursor.execute("SELECT id, url FROM articles ORDER BY id").fetchall():
+        canonical = canonicalize_url(url)
+        if canonical in seen:
+            continue
+        seen.add(canonical)
+        updates.append((canonical, article_id))
+    cursor.executemany("UPDATE articles SET canonical_url = ? WHERE id = ?", updates)
+    if updates:
+        log_info(f"Backfilled canonical URLs for {len(updates)} articles")
+
+def find_stored_canonical_urls(canonical_urls):
+    """Return the subset of canonical_urls already in the articles table (indexed lookup).
+
+    Raises sqlite3.Error (after logging it) when the lookup fails, so a
+    locked database is never mistaken for "nothing stored".
+    """
+    canonical_urls = list(canonical_urls)
+    if not canonical_urls or not os.path.exists(DATABASE_PATH):
         return set()
     conn = sqlite3.connect(DATABASE_PATH)
     cursor = conn.cursor()
-    cursor.execute("SELECT url FROM articles")
-    urls = {row[0] for row in cursor.fetchall()}
+    stored = set()
+    try:
+        for i in range(0, len(canonical_urls), URL_LOOKUP_BATCH_SIZE):
+            batch = canonical_urls[i:i + URL_LOOKUP_BATCH_SIZE]
+            placeholders = ', '.join('?' * len(batch))
+            cursor.execute(f"SELECT canonical_url FROM articles WHERE canonical_url IN ({placeholders})", batch)
+            stored.update(row[0] for row in cursor.fetchall())
+    except sqlite3.Error as e:
+        log_error(f"Error looking up stored articles: {e}")
+        raise
+    finally:
+        conn.close()
+    return stored
+
+def get_feed_cache():
+    """Return cached conditional GET state keyed by feed URL.
+
+    Each value is a dict with 'etag', 'last_modified', 'seen_guids' (set) and
+    'window_start' (ISO date of the fetch window the cached poll covered).
+    """
+    if not os.path.exists(DATABASE_PATH):
+        return {}
+    import json
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT feed_url, etag, last_modified, seen_guids, window_start FROM feed_cache")
+        rows = cursor.fetchall()
+    except sqlite3.Error:
+        # Table not created yet (database predates the feed cache)
+        rows = []
+    conn.close()
+    cache = {}
+    for feed_url, etag, last_modified, seen_guids, window_start in rows:
+        try:
+            guids = set(json.loads(seen_guids or '[]'))
+        except ValueError:
+            guids = set()
+        cache[feed_url] = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'seen_guids': guids,
+            'window_start': window_start,
+        }
+    return cache
+
+def store_feed_cache(feed_states):
+    """Persist conditional GET state for polled feeds.
+
+    feed_states maps feed URL -> dict with 'etag', 'last_modified',
+    'seen_guids' (iterable) and 'window_start'.
+    """
+    if not feed_states:
+        return 0
+    import json
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    stored_count = 0
+    for feed_url, state in feed_states.items():
+        try:
+            cursor.execute("""
+                INSERT OR REPLACE INTO feed_cache
+                (feed_url, etag, last_modified, seen_guids, window_start, updated_at)
+                VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """, (
+                feed_url,
+                state.get('etag'),
+                state.get('last_modified'),
+                json.dumps(sorted(state.get('seen_guids') or [])),
+                state.get('window_start'),
+            ))
+            stored_count += 1
+        except sqlite3.Error as e:
+            log_error(f"Error storing feed cache for {feed_url}: {e}")
+    conn.commit()
+    conn.close()
+    return stored_count
+
+def record_fetch_failures(failures):
+    """Count one more failed run for each canonical URL in failures (URL -> outcome).
+
+    Returns URL -> failed runs so far. Rows untouched for 30 days are
+    removed. On a database error nothing is counted (every URL reports 0).
+    """
+    if not failures or not os.path.exists(DATABASE_PATH):
+        return {}
+    conn = sqlite3.connect(DATABASE_PATH, timeout=30)
+    attempts = {url: 0 for url in failures}
+    try:
+        with conn:
+            conn.execute("DELETE FROM fetch_failures WHERE updated_at < datetime('now', '-30 days')")
+            conn.executemany("""
+                INSERT INTO fetch_failures (canonical_url, attempts, last_outcome, updated_at)
+                VALUES (?, 1, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT (canonical_url) DO UPDATE SET
+                    attempts = attempts + 1, last_outcome = excluded.last_outcome, updated_at = CURRENT_TIMESTAMP
+            """, list(failures.items()))
+            urls = list(failures)
+            for i in range(0, len(urls), URL_LOOKUP_BATCH_SIZE):
+                batch = urls[i:i + URL_LOOKUP_BATCH_SIZE]
+                attempts.update(conn.execute(
+                    f"SELECT canonical_url, attempts FROM fetch_failures WHERE canonical_url IN ({', '.join('?' * len(batch))})",
+                    batch,
+                ).fetchall())
+    except sqlite3.Error as e:
+        log_error(f"Error recording fetch failures: {e}")
+        attempts = {url: 0 for url in failures}
+    conn.close()
+    return attempts
+
+FEED_HEALTH_COLUMNS = (
+    'feed_url', 'last_polled_at', 'last_status', 'last_latency_ms', 'avg_latency_ms',
+    'last_entry_count', 'last_new_entries', 'avg_new_entries', 'consecutive_failures',
+    'total_polls', 'total_failures', 'last_error', 'next_poll_at', 'last_content_at', 'avg_new_per_hour',
+    'yield_polls',
+)
+
+def get_feed_health():
+    """Return feed health rows keyed by feed URL (each a dict of FEED_HEALTH_COLUMNS)."""
+    if not os.path.exists(DATABASE_PATH):
+        return {}
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT {', '.join(FEED_HEALTH_COLUMNS)} FROM feed_health")
+        rows = cursor.fetchall()
+    except sqlite3.Error:
+        # Table not created yet (database predates feed health tracking)
+        rows = []
+    conn.close()
+    return {row[0]: dict(zip(FEED_HEALTH_COLUMNS, row)) for row in rows}
+
+def store_feed_health(health_rows):
+    """Persist feed health rows (same shape as get_feed_health() values)."""
+    if not health_rows:
+        return 0
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    stored_count = 0
+    placeholders = ', '.join('?' * len(FEED_HEALTH_COLUMNS))
+    for row in health_rows:
+        try:
+            cursor.execute(
+                f"INSERT OR REPLACE INTO feed_health ({', '.join(FEED_HEALTH_COLUMNS)}) VALUES ({placeholders})",
+                tuple(row.get(column) for column in FEED_HEALTH_COLUMNS),
+            )
+            stored_count += 1
+        except sqlite3.Error as e:
+            log_error(f"Error storing feed health for {row.get('feed_url')}: {e}")
+    conn.commit()
+    conn.close()
+    return stored_count
+
+def get_daemon_state(key, default=None):
+    """Return a stored daemon state value, or default if it was never set."""
+    if not os.path.exists(DATABASE_PATH):
+        return default
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT value FROM daemon_state WHERE key = ?", (key,))
+        row = cursor.fetchone()
+    except sqlite3.Error:
+        # Table not created yet (database predates daemon mode)
+        row = None
+    conn.close()
+    return row[0] if row else default
+
+def set_daemon_state(key, value):
+    """Persist a daemon state value."""
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "INSERT OR REPLACE INTO daemon_state (key, value, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)",
+            (key, value),
+        )
+        conn.commit()
+    except sqlite3.Error as e:
+        log_error(f"Error storing daemon state '{key}': {e}")
+    conn.close()
+
+LLM_OUTPUT_COUNTERS = ('calls', 'valid', 'invalid_json', 'schema_mismatch', 'errors', 'retries')
+
+def add_llm_output_stats(rows):
+    """Add per-run LLM JSON outcome counts (dicts with model, purpose, mode and LLM_OUTPUT_COUNTERS) to the totals."""
+    if not rows or not os.path.exists(DATABASE_PATH):
+        return
+    conn = sqlite3.connect(DATABASE_PATH, timeout=30)
+    cursor = conn.cursor()
+    updates = ', '.join(f"{column} = {column} + excluded.{column}" for column in LLM_OUTPUT_COUNTERS)
+    try:
+        for row in rows:
+            cursor.execute(
+                f"""
+                INSERT INTO llm_output_stats (model, purpose, mode, {', '.join(LLM_OUTPUT_COUNTERS)}, updated_at)
+                VALUES (?, ?, ?, {', '.join('?' * len(LLM_OUTPUT_COUNTERS))}, CURRENT_TIMESTAMP)
+                ON CONFLICT (model, purpose, mode) DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP
+                """,
+                (row['model'], row['purpose'], row['mode']) + tuple(row.get(column, 0) for column in LLM_OUTPUT_COUNTERS),
+            )
+        conn.commit()
+    except sqlite3.Error as e:
+        log_error(f"Error storing LLM output stats: {e}")
+    conn.close()
+
+def get_llm_output_stats():
+    """Return the per-model LLM JSON outcome totals as dicts, busiest first."""
+    if not os.path.exists(DATABASE_PATH):
+        return []
+    columns = ('model', 'purpose', 'mode') + LLM_OUTPUT_COUNTERS + ('updated_at',)
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT {', '.join(columns)} FROM llm_output_stats ORDER BY calls DESC")
+        rows = cursor.fetchall()
+    except sqlite3.Error:
+        # Table not created yet (database predates structured output tracking)
+        rows = []
+    conn.close()
+    return [dict(zip(columns, row)) for row in rows]
+
+def get_domain_selectors():
+    """Return learned content selectors keyed by domain.
+
+    Each value is a dict with 'selector', 'hits', 'misses',
+    'pages_since_validation' and 'validated_at'.
+    """
+    if not os.path.exists(DATABASE_PATH):
+        return {}
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT domain, selector, hits, misses, pages_since_validation, validated_at
+            FROM domain_selectors
+        """)
+        rows = cursor.fetchall()
+    except sqlite3.Error:
+        # Table not created yet (database predates the selector cache)
+        rows = []
+    conn.close()
+    return {
+        domain: {
+            'selector': selector,
+            'hits': hits or 0,
+            'misses': misses or 0,
+            'pages_since_validation': pages_since_validation or 0,
+            'validated_at': validated_at,
+        }
+        for domain, selector, hits, misses, pages_since_validation, validated_at in rows
+    }
+
+def store_domain_selectors(selectors):
+    """Persist learned content selectors (same shape as get_domain_selectors())."""
+    if not selectors:
+        return 0
+    conn = sqlite3.connect(DATABASE_PATH, timeout=30)
+    cursor = conn.cursor()
+    stored_count = 0
+    try:
+        for domain, state in selectors.items():
+            cursor.execute("""
+                INSERT OR REPLACE INTO domain_selectors
+                (domain, selector, hits, misses, pages_since_validation, validated_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """, (
+                domain,
+                state['selector'],
+                state.get('hits', 0),
+                state.get('misses', 0),
+                state.get('pages_since_validation', 0),
+                state.get('validated_at'),
+            ))
+            stored_count += 1
+        conn.commit()
+    except sqlite3.Error as e:
+        log_error(f"Error storing domain selectors: {e}")
+    conn.close()
+    return stored_count
+
+# threat_risk values of articles the LLM actually analyzed (UNANALYZED rows are only fetched)
+ANALYZED_RISK_LEVELS = ('HIGH', 'MEDIUM', 'LOW', 'INFORMATIONAL')
+
+def get_recent_article_fingerprints(since_date):
+    """Return analyzed articles published since since_date with their SimHash and analysis.
+
+    Only rows with a real LLM analysis are returned (not UNANALYZED or
+    NOT_RELEVANT), since copies matched to them reuse that analysis.
+    content is only loaded for rows that have no fingerprint yet.
+    """
+    if not os.path.exists(DATABASE_PATH):
+        return []
+    conn = sqlite3.connect(DATABASE_PATH)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute(f"""
+            SELECT id, title, simhash, duplicate_of, summary, threat_risk, category, recommendations,
+                   CASE WHEN simhash IS NULL THEN content END AS content
+            FROM articles WHERE published_date >= ? AND content IS NOT NULL
+              AND threat_risk IN ({', '.join('?' * len(ANALYZED_RISK_LEVELS))})
+        """, (since_date.isoformat(), *ANALYZED_RISK_LEVELS)).fetchall()
+    except sqlite3.Error:
+        rows = []
+    conn.close()
+    return [dict(row) for row in rows]
+
+def get_relevance_training_examples():
+    """Return (title, content, label) for judged articles: label 0 for NOT_RELEVANT, 1 for analyzed.
+
+    Unanalyzed rows, near-duplicate copies and articles skipped for missing
+    content are left out.
+    """
+    if not os.path.exists(DATABASE_PATH):
+        return []
+    conn = sqlite3.connect(DATABASE_PATH)
+    analyzed = ', '.join('?' * len(ANALYZED_RISK_LEVELS))
+    try:
+        rows = conn.execute(f"""
+            SELECT title, content, CASE WHEN threat_risk IN ({analyzed}) THEN 1 ELSE 0 END
+            FROM articles
+            WHERE threat_risk IN ({analyzed}, 'NOT_RELEVANT')
+              AND duplicate_of IS NULL
+              AND content IS NOT NULL AND TRIM(content) != ''
+              AND COALESCE(summary, '') NOT LIKE '%Skipped: no content available%'
+        """, ANALYZED_RISK_LEVELS * 2).fetchall()
+    except sqlite3.Error as e:
+        log_error(f"Error loading relevance training examples: {e}")
+        rows = []
+    conn.close()
+    return rows
+
+def store_article_fingerprints(fingerprints):
+    """Store SimHash fingerprints given as (simhash, article_id) pairs."""
+    if not fingerprints:
+        return
+    conn = sqlite3.connect(DATABASE_PATH)
+    try:
+        conn.executemany("UPDATE articles SET simhash = ? WHERE id = ?", fingerprints)
+        conn.commit()
+    except sqlite3.Error as e:
+        log_error(f"Error storing article fingerprints: {e}")
     conn.close()
-    return urls
 
 def store_analyzed_data(analyzed_data_list):
     conn = sqlite3.connect(DATABASE_PATH)
@@ -93,12 +583,13 @@ def store_analyzed_data(analyzed_data_list):
             recommendations_json = json.dumps(data.get('recommendations', []))
             cursor.execute("""
                 INSERT OR IGNORE INTO articles
-                (title, url, published_date, content, summary, threat_risk, category, recommendations)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                (title, url, canonical_url, published_date, content, summary, threat_risk, category, recommendations,
+                 simhash, duplicate_of)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
-                data['title'], data['url'], data['published_date'], data.get('content'),
+                data['title'], data['url'], canonicalize_url(data['url']), data['published_date'], data.get('content'),
                 summary_text, data.get('threat_risk'), data.get('category'),
-                recommendations_json
+                recommendations_json, data.get('simhash'), data.get('duplicate_of')
             ))
             if cursor.rowcount > 0:
                 stored_count += 1
@@ -112,6 +603,69 @@ def store_analyzed_data(analyzed_data_list):
     return article_ids
 
 
+def store_raw_articles(articles):
+    """Store fetched but unanalyzed articles in one transaction; returns how many were new."""
+    rows = [(
+        article['title'],
+        article['url'],
+        canonicalize_url(article['url']),
+        article.get('published_date', datetime.date.today().isoformat()),
+        article.get('content', ''),
+        'Not analyzed - fetched only',
+        'UNANALYZED',
+        'Pending Analysis',
+        '[]'
+    ) for article in articles]
+    conn = sqlite3.connect(DATABASE_PATH)
+    stored_count = 0
+    try:
+        with conn:
+            before = conn.total_changes
+            # Duplicates (same url or canonical_url) are skipped
+            conn.executemany("""
+                INSERT OR IGNORE INTO articles
+                (title, url, canonical_url, published_date, content, summary, threat_risk, category, recommendations)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            stored_count = conn.total_changes - before
+    except sqlite3.Error as e:
+        log_error(f"Error storing raw articles: {e}")
+    conn.close()
+    return stored_count
+
+
+class RawArticleBatchWriter:
+    """Stores fetched articles in batched transactions as they arrive.
+
+    add() can be passed as a fetcher's on_article callback (it is thread-safe);
+    at most batch_size articles are held in memory. Call close() at the end
+    to store the last partial batch.
+    """
+
+    def __init__(self, batch_size=None):
+        self.batch_size = batch_size or FETCH_ONLY_BATCH_SIZE
+        self.received = 0
+        self.stored = 0
+        self._batch = []
+        self._lock = threading.Lock()
+
+    def add(self, article):
+        with self._lock:
+            self.received += 1
+            self._batch.append(article)
+            if len(self._batch) >= self.batch_size:
+                # Written under the lock: SQLite allows one writer, and other workers wait instead of buffering more
+                self.stored += store_raw_articles(self._batch)
+                self._batch = []
+
+    def close(self):
+        with self._lock:
+            if self._batch:
+                self.stored += store_raw_articles(self._batch)
+                self._batch = []
+        return self.stored
+
+
 def store_iocs(article_id, iocs_dict):
     """Store extracted IOCs for an article"""
     conn = sqlite3.connect(DATABASE_PATH)
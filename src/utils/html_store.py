@@ -0,0 +1,152 @@
+# html_store.py
+"""
+Content-addressed on-disk store for raw article HTML.
+
+Pages are gzip-compressed and written once per unique body under
+HTML_STORE_DIR/<sha256[:2]>/<sha256>.html.gz, so identical pages (syndicated
+copies, unchanged refetches) share one blob. The html_store table maps each
+article URL to its blob hash and tracks size and last access for eviction.
+Re-extraction (new extractor, new IOC regexes, reprocessing) can then read
+pages offline instead of recrawling.
+"""
+
+import gzip
+import hashlib
+import os
+import sqlite3
+import tempfile
+
+from src.config import DATABASE_PATH, HTML_STORE_DIR, HTML_STORE_ENABLED, HTML_STORE_MAX_MB
+from src.utils.logging_utils import log_info, log_warn
+from src.utils.url_utils import canonicalize_url
+
+
+def _store_key(url):
+    """Store key for a URL: its canonical form, shared with articles.canonical_url."""
+    return canonicalize_url(url)
+
+
+def _blob_path(content_hash):
+    return os.path.join(HTML_STORE_DIR, content_hash[:2], f"{content_hash}.html.gz")
+
+
+def _connect():
+    # Fetch threads write concurrently; wait for the lock instead of failing
+    return sqlite3.connect(DATABASE_PATH, timeout=30)
+
+
+def store_html(url, html_bytes, content_type=None):
+    """Store a page body for url. Returns the content hash, or None if disabled/failed."""
+    if not HTML_STORE_ENABLED or not html_bytes:
+        return None
+    content_hash = hashlib.sha256(html_bytes).hexdigest()
+    path = _blob_path(content_hash)
+    try:
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file and rename so readers never see a partial blob
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(gzip.compress(html_bytes, compresslevel=6))
+            os.replace(tmp_path, path)
+        conn = _connect()
+        conn.execute("""
+            INSERT OR REPLACE INTO html_store (url, content_hash, size_bytes, content_type, fetched_at, last_accessed)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+        """, (_store_key(url), content_hash, os.path.getsize(path), content_type))
+        conn.commit()
+        conn.close()
+        return content_hash
+    except (OSError, sqlite3.Error) as e:
+        log_warn(f"Could not store HTML for {url}: {e}")
+        return None
+
+
+def load_html(url, conn=None, touch=True):
+    """Return the stored page body for url as bytes, or None if it is not in the store.
+
+    Pass an open connection when loading many pages to avoid reconnecting per call.
+    With touch=False the page's last_accessed time is left as it is (read-only use).
+    """
+    own_conn = conn is None
+    if own_conn:
+        if not os.path.exists(DATABASE_PATH):
+            return None
+        conn = _connect()
+    try:
+        key = _store_key(url)
+        row = conn.execute("SELECT content_hash FROM html_store WHERE url = ?", (key,)).fetchone()
+        if not row:
+            return None
+        try:
+            with open(_blob_path(row[0]), 'rb') as f:
+                html_bytes = gzip.decompress(f.read())
+        except OSError:
+            return None
+        if touch:
+            conn.execute("UPDATE html_store SET last_accessed = CURRENT_TIMESTAMP WHERE url = ?", (key,))
+            if own_conn:
+                conn.commit()
+        return html_bytes
+    except sqlite3.Error:
+        # Table not created yet (database predates the HTML store)
+        return None
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def html_store_stats():
+    """Return (url_count, blob_count, total_bytes) for the store."""
+    if not os.path.exists(DATABASE_PATH):
+        return 0, 0, 0
+    conn = _connect()
+    try:
+        url_count = conn.execute("SELECT COUNT(*) FROM html_store").fetchone()[0]
+        blob_count, total_bytes = conn.execute("""
+            SELECT COUNT(*), COALESCE(SUM(size_bytes), 0)
+            FROM (SELECT content_hash, MAX(size_bytes) AS size_bytes FROM html_store GROUP BY content_hash)
+        """).fetchone()
+    except sqlite3.Error:
+        url_count, blob_count, total_bytes = 0, 0, 0
+    conn.close()
+    return url_count, blob_count, total_bytes
+
+
+def evict_html_store(max_bytes=None):
+    """Evict least-recently-accessed pages until the store fits in max_bytes.
+
+    Defaults to HTML_STORE_MAX_MB. A blob is deleted only once no URL refers
+    to it any more. Returns the number of URLs evicted.
+    """
+    if not HTML_STORE_ENABLED or not os.path.exists(DATABASE_PATH):
+        return 0
+    limit = max_bytes if max_bytes is not None else HTML_STORE_MAX_MB * 1024 * 1024
+    _, _, total_bytes = html_store_stats()
+    if total_bytes <= limit:
+        return 0
+
+    conn = _connect()
+    cursor = conn.cursor()
+    # Blobs ordered by the most recent access of any URL that references them
+    cursor.execute("""
+        SELECT content_hash, MAX(size_bytes), MAX(last_accessed) AS accessed
+        FROM html_store
+        GROUP BY content_hash
+        ORDER BY accessed ASC
+    """)
+    evicted_urls = 0
+    for content_hash, size_bytes, _ in cursor.fetchall():
+        if total_bytes <= limit:
+            break
+        evicted_urls += conn.execute("DELETE FROM html_store WHERE content_hash = ?", (content_hash,)).rowcount
+        try:
+            os.remove(_blob_path(content_hash))
+        except OSError:
+            pass
+        total_bytes -= size_bytes or 0
+    conn.commit()
+    conn.close()
+    if evicted_urls:
+        log_info(f"Evicted {evicted_urls} pages from the HTML store (now {total_bytes / (1024 * 1024):.1f} MB)")
+    return evicted_urls
@@ -0,0 +1,271 @@
+# json_repair.py
+"""
+Tolerant JSON repair for LLM answers, in one linear pass.
+
+LLM answers that are meant to be JSON come back with prose around them,
+markdown fences, raw newlines and unescaped quotes inside strings, missing
+or trailing commas, Python literals (True/None) and, when the answer hits
+num_predict, cut off in the middle. repair_json() scans the text once,
+starting at the first '{' (or '['). It writes the repaired JSON into a list of
+chunks; runs of ordinary characters are copied as one slice. It tracks the
+open objects/arrays and what each expects next (key, colon, value, comma).
+
+Truncated output is salvaged without inventing data. An unfinished element
+of an array is dropped whole; half an IOC entry would be a wrong IOC. An
+unfinished string member of an object (a cut-off summary) is closed. An
+unfinished key, number or literal is dropped back to the last complete
+value. Every object and array still open is then closed. Text after the
+first complete top-level value is ignored.
+"""
+
+import json
+import re
+
+# Characters that end a run of ordinary string / structural text
+_STRING_SPECIAL = re.compile(r'["\\\x00-\x1f]')
+_WHITESPACE = re.compile(r'[ \t\r\n]*')
+_NUMBER_TOKEN = re.compile(r'[-+0-9.eE]+')
+_VALID_NUMBER = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?')
+_WORD = re.compile(r'[A-Za-z_]+')
+_HEX4 = re.compile(r'[0-9a-fA-F]{4}')
+_LITERALS = {
+    'true': 'true', 'false': 'false', 'null': 'null',
+    'True': 'true', 'False': 'false', 'None': 'null',
+}
+_CONTROL_ESCAPES = {'\n': '\\n', '\t': '\\t', '\r': '', '\b': '\\b', '\f': '\\f'}
+_CLOSERS = {'{': '}', '[': ']'}
+
+
+def _closes_string(text, index, is_key, container):
+    """Whether the quote just before index ends the string rather than being an unescaped quote inside it."""
+    gap = _WHITESPACE.match(text, index).end()
+    if gap >= len(text) or '\n' in text[index:gap]:
+        return True  # End of text, or a line break before the next member (missing comma)
+    follower = text[gap]
+    if is_key:
+        return follower in ':}'
+    if follower in '}]':
+        return True
+    if follower == '"':
+        # '"a" "b": 1' is a missing comma when the next quoted text is a key (or, in an array, an element)
+        end = text.find('"', gap + 1)
+        if end == -1:
+            return False
+        after = _WHITESPACE.match(text, end + 1).end()
+        return after < len(text) and (text[after] == ':' or (container == '[' and text[after] in ',]'))
+    if follower != ',':
+        return False
+    # 'a "quoted", word' inside prose: after a real comma comes the next key or element
+    after = _WHITESPACE.match(text, gap + 1).end()
+    if after >= len(text) or '\n' in text[gap + 1:after]:
+        return True
+    return text[after] in '"{[]}-0123456789' or (container == '[' and text[after] in 'tfnTFN')
+
+
+def repair_json(text, opener='{'):
+    """Repaired JSON text of the value starting at the first opener ('{' or '[') in text, or None when there is none."""
+    start = text.find(opener)
+    if start == -1:
+        return None
+    out = []
+    stack = []    # Open containers: '{' or '['
+    starts = []   # Per container: len(out) before it (and its comma) began
+    states = []   # Per container: 'key', 'colon', 'value' or 'next' (a value ended; ',' or closer expected)
+    safe = 0      # len(out) at the last complete value or container start
+    comma = None  # Index in out of a comma not yet followed by a member/element
+    length = len(text)
+    i = start
+
+    def mark_safe():
+        nonlocal safe
+        safe = len(out)
+
+    def begin_value():
+        """Prepare the top container for a value; returns False where no value may go."""
+        nonlocal comma
+        comma = None
+        state = states[-1]
+        if stack[-1] == '[':
+            if state == 'next':
+                out.append(',')  # Missing comma between elements
+            return True
+        if state == 'colon':
+            out.append(':')  # Missing colon after a key
+            return True
+        return state == 'value'
+
+    def end_value():
+        states[-1] = 'next'
+        mark_safe()
+
+    while i < length:
+        char = text[i]
+
+        if char in '{[':
+            if stack and not begin_value():
+                i += 1
+                continue
+            starts.append(safe)
+            out.append(char)
+            stack.append(char)
+            states.append('key' if char == '{' else 'value')
+            mark_safe()
+            i += 1
+
+        elif char in '}]':
+            if states[-1] == 'colon':
+                out.append(':null')
+            elif stack[-1] == '{' and states[-1] == 'value':
+                out.append('null')
+            elif comma is not None:
+                out[comma] = ''  # Trailing comma
+            comma = None
+            out.append(_CLOSERS[stack.pop()])
+            states.pop()
+            starts.pop()
+            i += 1
+            if not stack:
+                return ''.join(out)  # Ignore anything after the top-level value
+            end_value()
+
+        elif char == ',':
+            if stack[-1] == '{' and states[-1] in ('value', 'colon'):
+                out.append(':null' if states[-1] == 'colon' else 'null')
+                states[-1] = 'next'
+            if states[-1] == 'next':
+                comma = len(out)
+                out.append(',')
+                states[-1] = 'key' if stack[-1] == '{' else 'value'
+            i += 1  # Leading or doubled commas are dropped
+
+        elif char == ':':
+            if states[-1] == 'colon':
+                out.append(':')
+                states[-1] = 'value'
+            i += 1
+
+        elif char == '"':
+            if stack[-1] == '{' and states[-1] in ('key', 'next'):
+                if states[-1] == 'next':
+                    out.append(',')  # Missing comma between members
+                comma = None
+                is_key = True
+            elif begin_value():
+                is_key = False
+            else:
+                i += 1
+                continue
+            out.append('"')
+            i += 1
+            closed = False
+            while i < length:
+                match = _STRING_SPECIAL.search(text, i)
+                if match is None:
+                    out.append(text[i:])
+                    i = length
+                    break
+                special = match.start()
+                if special > i:
+                    out.append(text[i:special])
+                i = special
+                char = text[i]
+                if char == '"':
+                    # A quote ends the string only when structure follows; otherwise it is an unescaped inner quote
+                    if _closes_string(text, i + 1, is_key, stack[-1]):
+                        out.append('"')
+                        i += 1
+                        closed = True
+                        break
+                    out.append('\\"')
+                    i += 1
+                elif char == '\\':
+                    if i + 1 >= length:
+                        i = length  # Dangling backslash of a truncated escape
+                    elif text[i + 1] in '"\\/bfnrt':
+                        out.append(text[i:i + 2])
+                        i += 2
+                    elif text[i + 1] == 'u' and _HEX4.match(text, i + 2):
+                        out.append(text[i:i + 6])
+                        i += 6
+                    elif text[i + 1] == 'u' and i + 6 > length:
+                        i = length  # Truncated \u escape
+                    else:
+                        out.append('\\\\')  # Invalid escape: keep the backslash literally
+                        i += 1
+                else:
+                    out.append(_CONTROL_ESCAPES.get(char, f'\\u{ord(char):04x}'))
+                    i += 1
+            if is_key:
+                if not closed:
+                    break  # Truncated key: dropped below
+                states[-1] = 'colon'
+            elif closed:
+                end_value()
+            elif stack[-1] == '{':
+                out.append('"')  # Salvage the truncated member value
+                end_value()
+
+        elif char == '-' or char.isdigit():
+            end = _NUMBER_TOKEN.match(text, i).end()
+            token = text[i:end]
+            if end >= length and not _VALID_NUMBER.fullmatch(token):
+                break  # Truncated number: dropped below
+            if begin_value():
+                if _VALID_NUMBER.fullmatch(token):
+                    out.append(token)
+                else:
+                    try:
+                        out.append(json.dumps(float(token)))
+                    except ValueError:
+                        out.append('null')
+                end_value()
+            i = end
+
+        elif char.isalpha() or char == '_':
+            end = _WORD.match(text, i).end()
+            word = text[i:end]
+            if end >= length and word not in _LITERALS and any(literal.startswith(word) for literal in _LITERALS):
+                break  # Truncated literal: dropped below
+            value_expected = (stack[-1] == '[' and states[-1] in ('value', 'next')) or states[-1] in ('value', 'colon')
+            if value_expected and begin_value():
+                # Unknown bare words in value position (undefined, NaN) become null
+                out.append(_LITERALS.get(word, 'null'))
+                end_value()
+            i = end  # Elsewhere bare words (prose, a fence's language tag) are skipped
+
+        elif char in ' \t\r\n':
+            end = _WHITESPACE.match(text, i).end()
+            out.append(text[i:end])
+            i = end
+
+        else:
+            i += 1  # Stray characters such as markdown backticks
+
+    # Truncated: drop the outermost unfinished array element, or go back to the last complete value
+    for depth in range(1, len(stack)):
+        if stack[depth - 1] == '[':
+            del out[starts[depth]:]
+            del stack[depth:]
+            break
+    else:
+        del out[safe:]
+    while stack:
+        out.append(_CLOSERS[stack.pop()])
+    return ''.join(out)
+
+
+def loads_tolerant(text, opener='{'):
+    """Parse the JSON object (or array, with opener='[') in an LLM answer, repairing it if needed; None when that fails."""
+    candidate = text.strip()
+    if candidate[:1] == opener:
+        try:
+            return json.loads(candidate)
+        except ValueError:
+            pass
+    repaired = repair_json(text, opener)
+    if repaired is None:
+        return None
+    try:
+        return json.loads(repaired)
+    except ValueError:
+        return None
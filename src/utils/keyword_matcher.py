@@ -0,0 +1,93 @@
+# keyword_matcher.py
+"""
+One-pass multi-keyword matching.
+
+KeywordMatcher compiles named groups of keywords once into an automaton. A
+text is then scanned once, instead of once per keyword with
+`keyword in text`. Every occurrence is reported, overlapping ones included
+('data breach' and 'breach', 'hack' and 'hacked'), so group verdicts are
+exactly what separate `in` checks give.
+
+With the optional pyahocorasick package the automaton is a C Aho-Corasick
+automaton. Without it, the keyword trie is compiled into one regular
+expression executed by the re engine. A pure-Python automaton loop would be
+slower than the C substring scans it replaces. The regex is a zero-width
+lookahead, so every start position is tried. At one position the trie
+returns the longest keyword. The shorter keywords that are prefixes of it
+come from a table built at compile time.
+"""
+
+import re
+
+try:
+    import ahocorasick
+except ImportError:  # Optional dependency; the regex automaton is used instead
+    ahocorasick = None
+
+
+def _trie_pattern(keywords):
+    """Regex source matching the longest of keywords that starts at the current position."""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[None] = True  # Terminal marker
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(
+            (item for item in node.items() if item[0] is not None), key=lambda item: item[0]
+        )]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if None in node:
+            # Keyword ends here; the greedy ? still prefers a longer keyword
+            pattern = f"(?:{pattern})?"
+        return pattern
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Keyword automaton over named keyword groups, compiled once and reusable across threads.
+
+    Keywords are matched literally (case-sensitive; callers lowercase both
+    sides). A keyword may belong to several groups.
+    """
+
+    def __init__(self, groups):
+        self._groups = {}
+        for group, keywords in groups.items():
+            for keyword in keywords:
+                if keyword:
+                    self._groups.setdefault(keyword, []).append(group)
+        keywords = sorted(self._groups)
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+        else:
+            self._automaton = None
+            self._prefixes = {
+                keyword: [other for other in keywords if keyword.startswith(other)]
+                for keyword in keywords
+            }
+            self._regex = re.compile(f"(?=({_trie_pattern(keywords)}))")
+
+    def find(self, text):
+        """Yield (start, end, keyword) for every keyword occurrence in text, overlapping ones included."""
+        if self._automaton is not None:
+            if self._groups:
+                for last, keyword in self._automaton.iter(text):
+                    yield last + 1 - len(keyword), last + 1, keyword
+            return
+        for match in self._regex.finditer(text):
+            start = match.start()
+            for keyword in self._prefixes[match.group(1)]:
+                yield start, start + len(keyword), keyword
+
+    def groups_of(self, keyword):
+        """Names of the groups a keyword belongs to."""
+        return self._groups[keyword]
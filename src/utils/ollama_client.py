@@ -0,0 +1,173 @@
+# ollama_client.py
+"""
+Shared client for the Ollama generate API.
+
+Relevance filtering, analysis and IOC/KQL generation all talk to Ollama
+through generate(). Every request goes through one pooled requests.Session.
+A process-wide semaphore caps concurrent requests at
+OLLAMA_MAX_CONCURRENT_REQUESTS across all phases and thread pools. Requests
+beyond what the server runs in parallel would only queue inside Ollama,
+holding a connection and eating into their own timeout.
+
+Connection errors (including connect timeouts) and 5xx/429 responses are
+retried up to OLLAMA_RETRIES times with jittered exponential backoff; a read
+timeout is final. When Ollama cannot be reached at all, further calls fail
+immediately for OLLAMA_UNAVAILABLE_COOLDOWN seconds so callers fall back
+quickly. Every request sends keep_alive, and warm_up() loads the model in the background
+while feeds are fetched, so the first real call does not pay the load time.
+Per-purpose timings are logged by log_ollama_summary().
+"""
+
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.config import (
+    OLLAMA_HOST, OLLAMA_MODEL, OLLAMA_MAX_CONCURRENT_REQUESTS, OLLAMA_RETRIES,
+    OLLAMA_RETRY_BACKOFF_SECONDS, OLLAMA_UNAVAILABLE_COOLDOWN, OLLAMA_KEEP_ALIVE,
+)
+from src.utils.logging_utils import log_info, log_warn, log_debug
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_session = requests.Session()
+# One pooled connection per concurrent request slot (plus one for a warm-up running alongside)
+_session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=OLLAMA_MAX_CONCURRENT_REQUESTS + 1))
+_session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=OLLAMA_MAX_CONCURRENT_REQUESTS + 1))
+_slots = threading.BoundedSemaphore(OLLAMA_MAX_CONCURRENT_REQUESTS)
+_keep_alive = OLLAMA_KEEP_ALIVE
+_unavailable_until = 0.0
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _record(purpose, seconds, waited, retries, failed, tokens=0, generation_seconds=0.0):
+    with _stats_lock:
+        stats = _stats.setdefault(purpose, {
+            'calls': 0, 'failed': 0, 'retries': 0, 'seconds': 0.0, 'max_seconds': 0.0,
+            'waited': 0.0, 'tokens': 0, 'generation_seconds': 0.0,
+        })
+        stats['calls'] += 1
+        stats['failed'] += 1 if failed else 0
+        stats['retries'] += retries
+        stats['seconds'] += seconds
+        stats['max_seconds'] = max(stats['max_seconds'], seconds)
+        stats['waited'] += waited
+        stats['tokens'] += tokens
+        stats['generation_seconds'] += generation_seconds
+
+
+def _backoff(attempt):
+    """Full-jitter exponential backoff, so threads that failed together do not retry together."""
+    return random.uniform(0, OLLAMA_RETRY_BACKOFF_SECONDS * (2 ** attempt))
+
+
+def _retryable(error):
+    # ConnectionError includes ConnectTimeout; a ReadTimeout means the model was already
+    # generating, so retrying would only queue the same long request again
+    if isinstance(error, requests.ConnectionError):
+        return True
+    return (isinstance(error, requests.HTTPError) and error.response is not None
+            and error.response.status_code in _RETRY_STATUSES)
+
+
+def _post(payload, timeout):
+    """One generate request, holding a concurrency slot. Returns (response JSON, seconds queued)."""
+    queued = time.monotonic()
+    with _slots:
+        waited = time.monotonic() - queued
+        response = _session.post(f"{OLLAMA_HOST}/api/generate", json=payload, timeout=timeout)
+        response.raise_for_status()
+        try:
+            data = response.json()
+        except ValueError as e:
+            raise requests.RequestException(f"Malformed Ollama response: {e}") from e
+    if 'response' not in data:
+        raise requests.RequestException(f"Ollama response has no text: {str(data)[:200]}")
+    return data, waited
+
+
+def generate(prompt, purpose='generate', options=None, timeout=120, format=None, model=None, retries=None):
+    """Run one non-streaming generate request and return the response text.
+
+    purpose labels the call in the timing summary. Raises
+    requests.RequestException once the retries are exhausted, or at once
+    while Ollama is marked unavailable.
+    """
+    global _unavailable_until
+    payload = {"model": model or OLLAMA_MODEL, "prompt": prompt, "stream": False, "keep_alive": _keep_alive}
+    if options:
+        payload["options"] = options
+    if format is not None:
+        payload["format"] = format
+    retries = OLLAMA_RETRIES if retries is None else retries
+
+    started = time.monotonic()
+    waited = 0.0
+    attempt = 0
+    while True:
+        try:
+            if time.monotonic() < _unavailable_until:
+                raise requests.ConnectionError(f"Ollama at {OLLAMA_HOST} is unavailable; skipping until the cooldown ends")
+            data, queued = _post(payload, timeout)
+            waited += queued
+            break
+        except requests.RequestException as e:
+            if _retryable(e) and attempt < retries and time.monotonic() >= _unavailable_until:
+                log_debug(f"Ollama {purpose} request failed ({e}); retry {attempt + 1}/{retries}")
+                time.sleep(_backoff(attempt))
+                attempt += 1
+                continue
+            if isinstance(e, requests.ConnectionError) and time.monotonic() >= _unavailable_until:
+                _unavailable_until = time.monotonic() + OLLAMA_UNAVAILABLE_COOLDOWN
+                log_warn(f"Ollama at {OLLAMA_HOST} is unreachable; LLM calls fall back for {OLLAMA_UNAVAILABLE_COOLDOWN}s")
+            _record(purpose, time.monotonic() - started, waited, attempt, failed=True)
+            raise
+
+    elapsed = time.monotonic() - started
+    tokens = data.get('eval_count', 0)
+    _record(purpose, elapsed, waited, attempt, failed=False, tokens=tokens,
+            generation_seconds=data.get('eval_duration', 0) / 1e9)
+    log_debug(f"Ollama {purpose}: {elapsed:.1f}s ({waited:.1f}s queued, {tokens} tokens)")
+    return data['response']
+
+
+def warm_up(keep_alive=None):
+    """Load the model in the background; keep_alive (e.g. "20m") then applies to every later request."""
+    global _keep_alive
+    if keep_alive:
+        _keep_alive = keep_alive
+
+    def warm():
+        started = time.monotonic()
+        try:
+            # A generate request without a prompt only loads the model
+            response = _session.post(
+                f"{OLLAMA_HOST}/api/generate",
+                json={"model": OLLAMA_MODEL, "keep_alive": _keep_alive},
+                timeout=300,
+            )
+            response.raise_for_status()
+            log_debug(f"Ollama model {OLLAMA_MODEL} loaded in {time.monotonic() - started:.1f}s")
+        except requests.RequestException as e:
+            log_warn(f"Could not warm up Ollama model {OLLAMA_MODEL}: {e}")
+
+    threading.Thread(target=warm, name="ollama-warmup", daemon=True).start()
+
+
+def log_ollama_summary():
+    """Log and reset per-purpose call counts and timings."""
+    with _stats_lock:
+        stats = dict(_stats)
+        _stats.clear()
+    for purpose, s in sorted(stats.items()):
+        message = (f"Ollama {purpose}: {s['calls']} calls, avg {s['seconds'] / s['calls']:.1f}s, "
+                   f"max {s['max_seconds']:.1f}s, {s['waited']:.0f}s queued for a slot")
+        if s['generation_seconds']:
+            message += f", {s['tokens'] / s['generation_seconds']:.1f} tokens/s"
+        if s['retries'] or s['failed']:
+            message += f", {s['retries']} retries, {s['failed']} failed"
+        log_info(message)
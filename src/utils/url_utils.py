@@ -0,0 +1,93 @@
+# url_utils.py
+"""
+URL canonicalization for article deduplication.
+
+The same article reaches us under many URLs: with utm_* and other tracking
+parameters, with or without a trailing slash or www., over http and https,
+as an AMP variant, or through the Google AMP cache. canonicalize_url() maps
+all of these to one key. It is only used for identity (the articles
+canonical_url column and the HTML store key); pages are still fetched from
+their original URL.
+"""
+
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that only track the click and never change the page
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+    '_hsenc', '_hsmi', 'mkt_tok', 'ref', 'ref_src', 'ncid', 'cmpid', 'cmp', 'sr_share',
+    'spm', '_ga', 'guccounter', 'guce_referrer', 'guce_referrer_sig', 'amp',
+}
+TRACKING_PREFIXES = ('utm_',)
+
+_DEFAULT_PORTS = {'http': '80', 'https': '443'}
+_AMP_CACHE_SUFFIX = '.cdn.ampproject.org'
+
+
+def _from_amp_cache(parts):
+    """Unwrap https://example-com.cdn.ampproject.org/c/s/example.com/path to the publisher URL."""
+    path = parts.path
+    for prefix, scheme in (('/c/s/', 'https'), ('/v/s/', 'https'), ('/c/', 'http'), ('/v/', 'http')):
+        if path.startswith(prefix):
+            return urlsplit(f"{scheme}://{path[len(prefix):]}" + (f"?{parts.query}" if parts.query else ''))
+    return parts
+
+
+def canonicalize_url(url):
+    """Return the canonical form of an article URL (used as its dedup key).
+
+    - scheme is normalized to https, host lowercased, www./amp. and default ports dropped
+    - tracking parameters (utm_*, fbclid, ...) removed and the rest sorted
+    - AMP variants (/amp, .amp.html, ?amp=1, ?outputType=amp, AMP cache) folded into the article
+    - fragment and trailing slash removed
+    """
+    if not url:
+        return url
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    if not parts.netloc:
+        return url
+
+    host = parts.hostname or ''
+    if host.endswith(_AMP_CACHE_SUFFIX):
+        parts = _from_amp_cache(parts)
+        host = parts.hostname or ''
+
+    scheme = parts.scheme.lower()
+    port = None
+    try:
+        port = parts.port
+    except ValueError:
+        pass
+    for prefix in ('www.', 'amp.'):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    netloc = host
+    if port and str(port) != _DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{port}"
+
+    path = parts.path or '/'
+    if path.endswith('/amp') or path.endswith('/amp/'):
+        path = path[:path.rindex('/amp')] or '/'
+    elif path.endswith('.amp.html'):
+        path = path[:-len('.amp.html')] + '.html'
+    if len(path) > 1:
+        path = path.rstrip('/') or '/'
+
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS
+        and not key.lower().startswith(TRACKING_PREFIXES)
+        and not (key == 'outputType' and value == 'amp')
+    ]
+    query.sort()
+
+    return urlunsplit(('https' if scheme in ('http', 'https') else scheme, netloc, path, urlencode(query), ''))
+
+
+def entry_article_url(entry):
+    """Article URL of an RSS entry, preferring the original link over a FeedBurner redirect."""
+    return entry.get('feedburner_origlink') or entry.get('link')
@@ -0,0 +1,117 @@
+# verdict_cache.py
+"""
+Persistent cache of LLM relevance verdicts.
+
+Re-running the filter (--analyze over a backlog, repeated runs over the same
+fetch window) would otherwise ask Ollama the same YES/NO question again for
+the same article. Verdicts are stored in the relevance_verdicts table under
+a hash of the model, the prompt version, the title and the excerpt the LLM
+saw. Changing any of them is a cache miss. Batched questions have their own
+prompt version and shorter excerpt, so their verdicts get their own keys. Entries expire after
+RELEVANCE_CACHE_TTL_DAYS. Beyond RELEVANCE_CACHE_MAX_ENTRIES, the least
+recently used entries are evicted.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+
+from src.config import (
+    DATABASE_PATH, RELEVANCE_CACHE_ENABLED, RELEVANCE_CACHE_TTL_DAYS, RELEVANCE_CACHE_MAX_ENTRIES,
+)
+from src.utils.logging_utils import log_info, log_warn
+
+_stats = {'hits': 0, 'misses': 0}
+_stats_lock = threading.Lock()
+
+
+def _connect():
+    # Filter threads read and write concurrently; wait for the lock instead of failing
+    return sqlite3.connect(DATABASE_PATH, timeout=30)
+
+
+def verdict_key(model, prompt_version, title, excerpt):
+    """Cache key for one relevance question."""
+    digest = hashlib.sha256()
+    for part in (model, prompt_version, title or '', excerpt or ''):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def get_cached_verdict(*keys):
+    """Return the cached verdict (True/False) for the first of keys that has one, or None when absent or expired.
+
+    Several keys count as one lookup in the hit/miss summary.
+    """
+    if not RELEVANCE_CACHE_ENABLED or not os.path.exists(DATABASE_PATH):
+        return None
+    conn = _connect()
+    row = None
+    try:
+        rows = dict(conn.execute(
+            f"SELECT key, verdict FROM relevance_verdicts WHERE key IN ({', '.join('?' * len(keys))}) "
+            "AND created_at >= datetime('now', ?)",
+            (*keys, f"-{RELEVANCE_CACHE_TTL_DAYS} days"),
+        ).fetchall())
+        key = next((key for key in keys if key in rows), None)
+        if key is not None:
+            row = (rows[key],)
+            conn.execute("UPDATE relevance_verdicts SET last_used_at = CURRENT_TIMESTAMP WHERE key = ?", (key,))
+            conn.commit()
+    except sqlite3.Error:
+        # Table not created yet (database predates the verdict cache)
+        row = None
+    conn.close()
+    with _stats_lock:
+        _stats['hits' if row else 'misses'] += 1
+    return bool(row[0]) if row else None
+
+
+def store_verdict(key, verdict, model):
+    """Cache an LLM verdict."""
+    if not RELEVANCE_CACHE_ENABLED:
+        return
+    conn = _connect()
+    try:
+        conn.execute("""
+            INSERT OR REPLACE INTO relevance_verdicts (key, verdict, model, created_at, last_used_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+        """, (key, 1 if verdict else 0, model))
+        conn.commit()
+    except sqlite3.Error as e:
+        log_warn(f"Could not cache relevance verdict: {e}")
+    conn.close()
+
+
+def evict_verdict_cache(max_entries=None):
+    """Drop expired verdicts, then the least recently used beyond max_entries. Returns the number removed."""
+    if not RELEVANCE_CACHE_ENABLED or not os.path.exists(DATABASE_PATH):
+        return 0
+    limit = RELEVANCE_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+    conn = _connect()
+    try:
+        removed = conn.execute(
+            "DELETE FROM relevance_verdicts WHERE created_at < datetime('now', ?)",
+            (f"-{RELEVANCE_CACHE_TTL_DAYS} days",),
+        ).rowcount
+        removed += conn.execute("""
+            DELETE FROM relevance_verdicts WHERE key IN (
+                SELECT key FROM relevance_verdicts ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+            )
+        """, (limit,)).rowcount
+        conn.commit()
+    except sqlite3.Error:
+        removed = 0
+    conn.close()
+    return removed
+
+
+def log_verdict_cache_summary():
+    """Log and reset this run's cache hit/miss counts."""
+    with _stats_lock:
+        hits, misses = _stats['hits'], _stats['misses']
+        _stats['hits'] = _stats['misses'] = 0
+    if hits:
+        log_info(f"Relevance verdict cache: {hits} of {hits + misses} LLM questions answered from cache")
@@ -0,0 +1,57 @@
+import sys
+import os
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.filtering import prescreen_entry
+
+# Security headlines that contain shopping/business words; the pre-screen must never drop them
+SECURITY_TITLES = [
+    "Google confirms Salesforce database stolen by ShinyHunters",
+    "Workday discloses Salesforce-related data theft",
+    "Qualys, Tenable hit by Salesloft Drift supply-chain incident",
+    "Scammers impersonate Prime Day deals to steal credentials",
+    "Fake Black Friday deals push infostealers to shoppers",
+    "Cyber Monday scams: what SOC teams should watch for",
+    "Hackers abuse YouTube trailer links to spread Lumma",
+    "iPad Pro owners targeted by iCloud phishing texts",
+    "Windows update causes PC crash on machines running CrowdStrike sensor",
+    "Retailer misses quarterly results after ransomware attack",
+    "Scammers push fake gift guide sites to harvest card data",
+    "Sales team credentials leaked in Salesforce OAuth token theft",
+]
+
+# Clearly off-topic titles the pre-screen may drop without fetching the page
+OFF_TOPIC_TITLES = [
+    "The best 2025 holiday gift guide for gamers",
+    "Unboxing the new Pixel 10",
+    "Apple posts record quarterly results on iPhone demand",
+    "Weekend box office: sequel tops the charts",
+]
+
+
+def test_security_titles_are_not_dropped():
+    for title in SECURITY_TITLES:
+        assert prescreen_entry(title) is not False, title
+
+
+def test_off_topic_titles_are_dropped():
+    for title in OFF_TOPIC_TITLES:
+        assert prescreen_entry(title) is False, title
+
+
+def test_security_summary_keeps_off_topic_title():
+    summary = "Attackers compromised the retailer's checkout page and stole card data."
+    assert prescreen_entry("Unboxing the new Pixel 10", summary) is not False
+
+
+if __name__ == '__main__':
+    print("Testing RSS pre-screen on real titles:\n")
+    for title in SECURITY_TITLES + OFF_TOPIC_TITLES:
+        verdict = prescreen_entry(title)
+        status = {True: "✓ RELEVANT", False: "✗ DROPPED", None: "? FILTER"}[verdict]
+        print(f"{status} {title[:80]}")
+    test_security_titles_are_not_dropped()
+    test_off_topic_titles_are_dropped()
+    test_security_summary_keeps_off_topic_title()
+    print("\nAll pre-screen checks passed")